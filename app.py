@@ -1,5 +1,14 @@
-from flask import Flask
-from src.models import Base, engine, session
+from flask import Flask, request
+from src.models import Base, engine, session, usar_solo_lectura
+from src.models.migraciones import aplicar_migraciones
+from src.models.versiones import instalar_versiones
+from src.models.busqueda import instalar_busqueda
+from src.models.estadisticas import instalar_estadisticas
+from src.models.cambios import instalar_cambios, iniciar_truncado_cambios
+from src.models.trabajos import iniciar_trabajos
+from src.models.escritura import GROUP_COMMIT, iniciar_group_commit, group_commit_activo
+from src.controller.json_rapido import registrar_json_rapido
+from src.controller.formato_msgpack import registrar_msgpack
 from flask_controller import FlaskControllerRegister
 from flask_cors import CORS
 from flask_restx import Api
@@ -23,21 +32,30 @@ api = Api(
     }
 )
 
+# JSON con orjson para la Api y para jsonify (si está instalado)
+registrar_json_rapido(app, api)
+registrar_msgpack(app, api)
+
 # Importar y registrar namespaces
 # from src.controller.tareas_restx import api as tareas_ns
 from src.controller.tareas_restx import tareas_ns
 from src.controller.tablero_restx import tablero_ns
 from src.controller.fase_restx import fase_ns  
 from src.controller.persona_restx import persona_ns
+from src.controller.trabajos_restx import trabajos_ns
+from src.controller.cambios_restx import cambios_ns
 
 # Registrar namespaces con rutas específicas
 api.add_namespace(tareas_ns, path='/api/v1/tareas')
 api.add_namespace(tablero_ns, path='/api/v1/tableros')
 api.add_namespace(fase_ns, path='/api/v1/fases')
 api.add_namespace(persona_ns, path='/api/v1/personas')
+api.add_namespace(trabajos_ns, path='/api/v1/jobs')
+api.add_namespace(cambios_ns, path='/api/v1/cambios')
 
 #se agrega el cors a la app y se configura para que solo acepte peticiones con el header Content-Type
-cors = CORS(app)
+#se exponen las cabeceras de paginación, el ETag y la Location de los trabajos para que el frontend pueda leerlos
+cors = CORS(app, expose_headers=['X-Next-Cursor', 'Link', 'ETag', 'Location'])
 app.config['CORS_HEADERS'] = 'Content-Type'
 
 #se crea la llave para la sesion
@@ -49,6 +67,29 @@ register = FlaskControllerRegister(app)
 register.register_package("src.controller")
 
 Base.metadata.create_all(engine)
+aplicar_migraciones(engine, Base.metadata)
+instalar_versiones(engine)
+instalar_busqueda(engine)
+instalar_estadisticas(engine)
+instalar_cambios(engine)
+
+# Escrituras agrupadas en un hilo escritor (opcional, GROUP_COMMIT=1)
+if GROUP_COMMIT:
+    iniciar_group_commit()
+
+# Retoma los trabajos en segundo plano que quedaron pendientes
+iniciar_trabajos(engine)
+
+# Borra periódicamente los cambios viejos del registro de sincronización
+iniciar_truncado_cambios(engine)
+
+# Las peticiones de lectura usan el engine de solo lectura; así nunca esperan al escritor.
+# Con group commit las escrituras ocurren en el hilo escritor, así que el hilo de la
+# petición solo lee, sea cual sea el método.
+@app.before_request
+def enrutar_lecturas():
+    if request.method in ('GET', 'HEAD') or group_commit_activo():
+        usar_solo_lectura()
 
 # Cierra la sesión de SQLAlchemy al final de cada petición
 @app.teardown_appcontext
@@ -0,0 +1,66 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from src.models import Base, engine
+from src.models.asincrono import engine_async, engine_async_lectura
+from src.models.migraciones import aplicar_migraciones
+from src.models.versiones import instalar_versiones
+from src.models.busqueda import instalar_busqueda
+from src.models.estadisticas import instalar_estadisticas
+from src.models.cambios import instalar_cambios, iniciar_truncado_cambios
+from src.asgi import tareas_api, tablero_api, fase_api, persona_api
+
+# orjson si está instalado: fechas nativas y bytes directos en cada respuesta
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as RespuestaJSON
+except ImportError:
+    RespuestaJSON = JSONResponse
+
+# Punto de entrada ASGI: los mismos recursos /api/v1 que app.py, servidos con
+# FastAPI sobre el engine asíncrono (aiosqlite). Se ejecuta con:
+#   uvicorn app_asgi:app --workers 1
+
+
+@asynccontextmanager
+async def ciclo_de_vida(app):
+    # El esquema se prepara una sola vez al arrancar, con el engine síncrono de siempre
+    Base.metadata.create_all(engine)
+    aplicar_migraciones(engine, Base.metadata)
+    instalar_versiones(engine)
+    instalar_busqueda(engine)
+    instalar_estadisticas(engine)
+    # Las escrituras de esta API también quedan en el registro de cambios
+    instalar_cambios(engine)
+    iniciar_truncado_cambios(engine)
+    yield
+    await engine_async.dispose()
+    if engine_async_lectura is not engine_async:
+        await engine_async_lectura.dispose()
+
+
+app = FastAPI(
+    title='Gestor de Tareas API (ASGI)',
+    version='1.0',
+    description='API REST para gestión de tareas, proyectos y fases',
+    docs_url='/docs/',
+    default_response_class=RespuestaJSON,
+    lifespan=ciclo_de_vida,
+)
+
+app.include_router(tareas_api.router)
+app.include_router(tablero_api.router)
+app.include_router(fase_api.router)
+app.include_router(persona_api.router)
+
+# Mismo CORS que app.py: se exponen las cabeceras de paginación y el ETag
+app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'],
+                   expose_headers=['X-Next-Cursor', 'Link', 'ETag'])
+
+
+@app.exception_handler(IntegrityError)
+async def error_de_integridad(request: Request, exc: IntegrityError):
+    # Correo o nombre de fase repetido, referencia inexistente, campo obligatorio en null
+    return JSONResponse(status_code=400, content={'detail': f'Datos inválidos: {exc.orig}'})
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de codificación JSON: listas de 10.000 tareas con el encoder estándar
+(json de Python, lo que usan Flask y flask_restx por defecto) contra orjson.
+Ambos producen el mismo documento (src/controller/json_rapido.py).
+
+Mide la construcción completa de la respuesta (cuerpo + objeto Response),
+tanto por jsonify como por la representación de la Api de flask_restx.
+Compara además el tamaño y el tiempo de decodificación en el cliente de la
+misma lista en JSON y en MessagePack (src/controller/formato_msgpack.py).
+
+Uso:
+    python benchmark_json.py [--tareas 10000] [--repeticiones 20]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from flask import Flask
+from src.models.tarea_m import serializar_tarea
+from src.controller.json_rapido import ProveedorJSON, ProveedorJSONRapido, output_json_rapido, orjson
+from src.controller.formato_msgpack import empaquetar, msgpack
+
+
+def generar_tareas(cantidad):
+    base = datetime(2025, 1, 1, 9, 30, 15, 123456)
+    estados = ("pendiente", "en_progreso", "completada")
+    # Filas con los mismos atributos que devuelve la consulta del listado
+    return [
+        SimpleNamespace(id=i, nombre=f"Tarea {i}", descripcion=f"Descripción de la tarea número {i} — ñandú",
+                        fecha_creacion=base + timedelta(minutes=i), fecha_inicio=base + timedelta(days=i % 90),
+                        fecha_fin=base + timedelta(days=i % 90 + 7) if i % 3 else None,
+                        estado=estados[i % 3], fase_id=i % 5 + 1, persona_id=i % 40 or None,
+                        tablero_id=i % 12 + 1)
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def medir(funcion, repeticiones):
+    funcion()  # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tareas", type=int, default=10000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    if orjson is None:
+        raise SystemExit("orjson no está instalado: pip install orjson")
+
+    tareas = list(map(serializar_tarea, generar_tareas(args.tareas)))
+
+    app = Flask(__name__)
+    estandar = ProveedorJSON(app)
+    rapido = ProveedorJSONRapido(app)
+
+    def restx(proveedor):
+        # La representación de la Api usa el proveedor instalado en la app
+        def responder():
+            app.json = proveedor
+            return output_json_rapido(tareas, 200)
+        return responder
+
+    casos = [
+        ("jsonify", lambda: estandar.response(tareas), lambda: rapido.response(tareas)),
+        ("restx Api", restx(estandar), restx(rapido)),
+    ]
+
+    print(f"{args.tareas} tareas, mediana de {args.repeticiones} repeticiones\n")
+    print(f"{'caso':<12} {'json (ms)':>10} {'orjson (ms)':>12} {'MB/s json':>10} {'MB/s orjson':>12} {'x':>6}")
+    with app.app_context():
+        for nombre, antes, despues in casos:
+            # Los dos encoders deben producir el mismo documento
+            assert rapido.loads(antes().get_data()) == rapido.loads(despues().get_data())
+            mb_antes = len(antes().get_data()) / 1e6
+            mb_despues = len(despues().get_data()) / 1e6
+            t_antes = medir(antes, args.repeticiones)
+            t_despues = medir(despues, args.repeticiones)
+            print(f"{nombre:<12} {t_antes * 1000:>10.1f} {t_despues * 1000:>12.1f} "
+                  f"{mb_antes / t_antes:>10.1f} {mb_despues / t_despues:>12.1f} {t_antes / t_despues:>6.1f}")
+
+        if msgpack is None:
+            return
+        cuerpo_json = rapido.dumps_bytes(tareas)
+        cuerpo_msgpack = empaquetar(tareas)
+        # Decodificación como la haría el cliente: timestamps a datetime, JSON a texto ISO
+        print(f"\n{'formato':<12} {'KB':>8} {'codificar (ms)':>15} {'decodificar (ms)':>17}")
+        formatos = [
+            ("json", cuerpo_json, lambda: rapido.dumps_bytes(tareas), lambda: json.loads(cuerpo_json)),
+            ("json orjson", cuerpo_json, lambda: rapido.dumps_bytes(tareas), lambda: orjson.loads(cuerpo_json)),
+            ("msgpack", cuerpo_msgpack, lambda: empaquetar(tareas), 
+             lambda: msgpack.unpackb(cuerpo_msgpack, timestamp=3)),
+        ]
+        for nombre, cuerpo, codificar, decodificar in formatos:
+            print(f"{nombre:<12} {len(cuerpo) / 1024:>8.0f} {medir(codificar, args.repeticiones) * 1000:>15.1f} "
+                  f"{medir(decodificar, args.repeticiones) * 1000:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
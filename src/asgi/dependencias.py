@@ -0,0 +1,66 @@
+from urllib.parse import urlencode
+from fastapi import Depends, HTTPException, Query, Request, Response
+from src.models.asincrono import SesionAsyncLectura, SesionAsyncEscritura
+from src.models.paginacion import leer_parametros, LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+from src.models.versiones import consulta_versiones, completar_versiones, etag_versiones
+
+
+async def sesion_lectura():
+    async with SesionAsyncLectura() as sesion:
+        yield sesion
+
+
+async def sesion_escritura():
+    async with SesionAsyncEscritura() as sesion:
+        yield sesion
+
+
+def paginacion(
+    limit: int | None = Query(None, description=f'Cantidad máxima de elementos por página '
+                                                f'(por defecto {LIMITE_POR_DEFECTO}, máximo {LIMITE_MAXIMO})'),
+    after: str | None = Query(None, description='Cursor opaco devuelto en X-Next-Cursor por la página anterior'),
+):
+    """Retorna (limit, after) validados, igual que los listados de la API Flask."""
+    try:
+        return leer_parametros({'limit': limit, 'after': after})
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+def cabeceras_paginacion(request: Request, response: Response, siguiente):
+    """Agrega X-Next-Cursor y Link (rel="next") a la respuesta si hay otra página."""
+    if not siguiente:
+        return
+    args = dict(request.query_params)
+    args['after'] = siguiente
+    url = f"{request.url.replace(query='')}?{urlencode(args)}"
+    response.headers['X-Next-Cursor'] = siguiente
+    response.headers['Link'] = f'<{url}>; rel="next"'
+
+
+def _coincide(if_none_match, etag):
+    for valor in if_none_match.split(','):
+        valor = valor.strip()
+        if valor.startswith('W/'):
+            valor = valor[2:]
+        if valor == '*' or valor == etag:
+            return True
+    return False
+
+
+def etag_condicional(*tablas):
+    """
+    GET condicional con el mismo ETag que la API Flask (ver src/controller/etag.py).
+
+    Se usa en `dependencies=[...]`. La versión se lee con la misma sesión que
+    luego consulta los datos, antes que ellos; si el If-None-Match coincide
+    se responde 304 sin ejecutar el endpoint.
+    """
+    async def dependencia(request: Request, response: Response, sesion=Depends(sesion_lectura)):
+        filas = (await sesion.execute(consulta_versiones(*tablas))).all()
+        etag = f'"{etag_versiones(completar_versiones(filas, tablas))}"'
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and _coincide(if_none_match, etag):
+            raise HTTPException(304, headers={'ETag': etag})
+        response.headers['ETag'] = etag
+    return Depends(dependencia)
@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+# Esquemas de entrada y salida de la API ASGI; equivalen a los modelos de
+# Swagger declarados en los namespaces de flask_restx.
+
+EstadoTarea = Literal['pendiente', 'en_progreso', 'completada']
+
+
+class Tarea(BaseModel):
+    id: int
+    nombre: str
+    descripcion: Optional[str] = None
+    fecha_creacion: datetime
+    fecha_inicio: datetime
+    fecha_fin: Optional[datetime] = None
+    estado: EstadoTarea
+    fase_id: int
+    persona_id: Optional[int] = None
+    tablero_id: int
+
+
+class TareaEntrada(BaseModel):
+    nombre: str = Field(min_length=1, examples=['Completar proyecto'])
+    descripcion: str = ''
+    fecha_inicio: datetime
+    fecha_fin: Optional[datetime] = None
+    estado: EstadoTarea = 'pendiente'
+    fase_id: int = 1
+    persona_id: Optional[int] = None
+    tablero_id: int = 1
+
+
+class TareaCambios(BaseModel):
+    """PUT de tarea: solo se modifican los campos enviados (null incluido)."""
+    nombre: Optional[str] = None
+    descripcion: Optional[str] = None
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
+    estado: Optional[EstadoTarea] = None
+    fase_id: Optional[int] = None
+    persona_id: Optional[int] = None
+    tablero_id: Optional[int] = None
+
+
+class TareaRespuesta(BaseModel):
+    mensaje: str
+    tarea: Tarea
+
+
+class Tablero(BaseModel):
+    id: int
+    nombre: str
+    descripcion: Optional[str] = None
+    fecha_creacion: datetime
+    fecha_entrega: Optional[datetime] = None
+    estado: str
+
+
+class TableroEntrada(BaseModel):
+    nombre: str = Field(min_length=1)
+    descripcion: Optional[str] = None
+    fecha_entrega: Optional[datetime] = None
+    estado: str = 'activo'
+
+
+class TableroCambios(BaseModel):
+    nombre: Optional[str] = None
+    descripcion: Optional[str] = None
+    fecha_entrega: Optional[datetime] = None
+    estado: Optional[str] = None
+
+
+class TableroRespuesta(BaseModel):
+    mensaje: str
+    tablero: Tablero
+
+
+class TareaTablero(Tarea):
+    persona_nombre: Optional[str] = None
+
+
+class FaseTablero(BaseModel):
+    id: int
+    nombre: str
+    tareas: list[TareaTablero]
+
+
+class TableroBoard(BaseModel):
+    tablero: Tablero
+    fases: list[FaseTablero]
+
+
+class Fase(BaseModel):
+    id: int
+    nombre: str
+
+
+class FaseEntrada(BaseModel):
+    nombre: str = Field(min_length=1)
+
+
+class FaseRespuesta(BaseModel):
+    mensaje: str
+    fase: Fase
+
+
+class Persona(BaseModel):
+    id: int
+    nombre: str
+    correo: str
+
+
+class PersonaEntrada(BaseModel):
+    nombre: str
+    correo: str
+    password: str
+
+
+class PersonaCambios(BaseModel):
+    nombre: Optional[str] = None
+    correo: Optional[str] = None
+    password: Optional[str] = None
+
+
+class PersonaRespuesta(BaseModel):
+    mensaje: str
+    persona: Persona
+
+
+class Mensaje(BaseModel):
+    mensaje: str
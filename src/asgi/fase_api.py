@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from src.models.fase_m import Fase, serializar_fase
+from src.models.paginacion import preparar_pagina, cortar_pagina
+from src.asgi import esquemas
+from src.asgi.dependencias import (sesion_lectura, sesion_escritura, paginacion,
+                                   cabeceras_paginacion, etag_condicional)
+
+router = APIRouter(prefix='/api/v1/fases', tags=['fases'])
+
+
+@router.get('/', response_model=list[esquemas.Fase], dependencies=[etag_condicional('fase')])
+async def listar_fases(request: Request, response: Response, pagina=Depends(paginacion),
+                       sesion=Depends(sesion_lectura)):
+    limit, after = pagina
+    orden = [(Fase.id, False)]
+    try:
+        consulta = preparar_pagina(select(*serializar_fase.columnas), orden, limit, after)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    fases, siguiente = cortar_pagina((await sesion.execute(consulta)).all(), orden, limit)
+    cabeceras_paginacion(request, response, siguiente)
+    return list(map(serializar_fase, fases))
+
+
+@router.post('/', response_model=esquemas.FaseRespuesta, status_code=201)
+async def crear_fase(datos: esquemas.FaseEntrada, sesion=Depends(sesion_escritura)):
+    fase = Fase(nombre=datos.nombre)
+    sesion.add(fase)
+    await sesion.commit()
+    return {'mensaje': 'Fase creada exitosamente', 'fase': fase.to_dict()}
+
+
+@router.get('/{id}', response_model=esquemas.Fase, dependencies=[etag_condicional('fase')])
+async def obtener_fase(id: int, sesion=Depends(sesion_lectura)):
+    fase = await sesion.get(Fase, id)
+    if not fase:
+        raise HTTPException(404, 'Fase no encontrada')
+    return fase.to_dict()
+
+
+@router.put('/{id}', response_model=esquemas.FaseRespuesta)
+async def actualizar_fase(id: int, datos: esquemas.FaseEntrada, sesion=Depends(sesion_escritura)):
+    fase = await sesion.get(Fase, id)
+    if not fase:
+        raise HTTPException(404, 'Fase no encontrada')
+    fase.nombre = datos.nombre
+    await sesion.commit()
+    return {'mensaje': 'Fase actualizada exitosamente', 'fase': fase.to_dict()}
+
+
+@router.delete('/{id}', response_model=esquemas.Mensaje)
+async def eliminar_fase(id: int, sesion=Depends(sesion_escritura)):
+    fase = await sesion.get(Fase, id)
+    if not fase:
+        raise HTTPException(404, 'Fase no encontrada')
+    await sesion.delete(fase)
+    await sesion.commit()
+    return {'mensaje': 'Fase eliminada exitosamente'}
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from src.models.persona_m import Persona, serializar_persona
+from src.models.paginacion import preparar_pagina, cortar_pagina
+from src.asgi import esquemas
+from src.asgi.dependencias import (sesion_lectura, sesion_escritura, paginacion,
+                                   cabeceras_paginacion, etag_condicional)
+
+router = APIRouter(prefix='/api/v1/personas', tags=['personas'])
+
+
+@router.get('/', response_model=list[esquemas.Persona], dependencies=[etag_condicional('persona')])
+async def listar_personas(request: Request, response: Response, pagina=Depends(paginacion),
+                          sesion=Depends(sesion_lectura)):
+    limit, after = pagina
+    orden = [(Persona.id, False)]
+    try:
+        consulta = preparar_pagina(select(*serializar_persona.columnas), orden, limit, after)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    personas, siguiente = cortar_pagina((await sesion.execute(consulta)).all(), orden, limit)
+    cabeceras_paginacion(request, response, siguiente)
+    return list(map(serializar_persona, personas))
+
+
+@router.post('/', response_model=esquemas.PersonaRespuesta, status_code=201)
+async def crear_persona(datos: esquemas.PersonaEntrada, sesion=Depends(sesion_escritura)):
+    persona = Persona(**datos.model_dump())
+    sesion.add(persona)
+    await sesion.commit()
+    return {'mensaje': 'Persona creada exitosamente', 'persona': persona.to_dict()}
+
+
+@router.get('/{id}', response_model=esquemas.Persona, dependencies=[etag_condicional('persona')])
+async def obtener_persona(id: int, sesion=Depends(sesion_lectura)):
+    persona = await sesion.get(Persona, id)
+    if not persona:
+        raise HTTPException(404, 'Persona no encontrada')
+    return persona.to_dict()
+
+
+@router.put('/{id}', response_model=esquemas.PersonaRespuesta)
+async def actualizar_persona(id: int, datos: esquemas.PersonaCambios, sesion=Depends(sesion_escritura)):
+    persona = await sesion.get(Persona, id)
+    if not persona:
+        raise HTTPException(404, 'Persona no encontrada')
+    for campo, valor in datos.model_dump(exclude_unset=True).items():
+        setattr(persona, campo, valor)
+    await sesion.commit()
+    return {'mensaje': 'Persona actualizada exitosamente', 'persona': persona.to_dict()}
+
+
+@router.delete('/{id}', response_model=esquemas.Mensaje)
+async def eliminar_persona(id: int, sesion=Depends(sesion_escritura)):
+    persona = await sesion.get(Persona, id)
+    if not persona:
+        raise HTTPException(404, 'Persona no encontrada')
+    await sesion.delete(persona)
+    await sesion.commit()
+    return {'mensaje': 'Persona eliminada exitosamente'}
@@ -0,0 +1,95 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from src.models.tablero_m import Tablero, serializar_tablero
+from src.models.fase_m import Fase
+from src.models.eventos import bus_eventos, stream_eventos_async
+from src.models.asincrono import SesionAsyncLectura
+from src.models.paginacion import preparar_pagina, cortar_pagina
+from src.asgi import esquemas
+from src.asgi.dependencias import (sesion_lectura, sesion_escritura, paginacion,
+                                   cabeceras_paginacion, etag_condicional)
+
+router = APIRouter(prefix='/api/v1/tableros', tags=['tableros'])
+
+
+@router.get('/', response_model=list[esquemas.Tablero], dependencies=[etag_condicional('tablero')])
+async def listar_tableros(request: Request, response: Response, pagina=Depends(paginacion),
+                          sesion=Depends(sesion_lectura)):
+    limit, after = pagina
+    orden = [(Tablero.id, False)]
+    try:
+        consulta = preparar_pagina(select(*serializar_tablero.columnas), orden, limit, after)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    tableros, siguiente = cortar_pagina((await sesion.execute(consulta)).all(), orden, limit)
+    cabeceras_paginacion(request, response, siguiente)
+    return list(map(serializar_tablero, tableros))
+
+
+@router.post('/', response_model=esquemas.TableroRespuesta, status_code=201)
+async def crear_tablero(datos: esquemas.TableroEntrada, sesion=Depends(sesion_escritura)):
+    tablero = Tablero(**datos.model_dump())
+    sesion.add(tablero)
+    await sesion.commit()
+    return {'mensaje': 'Tablero creada exitosamente', 'tablero': tablero.to_dict()}
+
+
+@router.get('/{id}', response_model=esquemas.Tablero, dependencies=[etag_condicional('tablero')])
+async def obtener_tablero(id: int, sesion=Depends(sesion_lectura)):
+    tablero = await sesion.get(Tablero, id)
+    if not tablero:
+        raise HTTPException(404, 'Tablero no encontrada')
+    return tablero.to_dict()
+
+
+@router.put('/{id}', response_model=esquemas.TableroRespuesta)
+async def actualizar_tablero(id: int, datos: esquemas.TableroCambios, sesion=Depends(sesion_escritura)):
+    tablero = await sesion.get(Tablero, id)
+    if not tablero:
+        raise HTTPException(404, 'Tablero no encontrada')
+    for campo, valor in datos.model_dump(exclude_unset=True).items():
+        setattr(tablero, campo, valor)
+    await sesion.commit()
+    return {'mensaje': 'Tablero actualizada exitosamente', 'tablero': tablero.to_dict()}
+
+
+@router.delete('/{id}', response_model=esquemas.Mensaje)
+async def eliminar_tablero(id: int, sesion=Depends(sesion_escritura)):
+    tablero = await sesion.get(Tablero, id)
+    if not tablero:
+        raise HTTPException(404, 'Tablero no encontrada')
+    await sesion.delete(tablero)
+    await sesion.commit()
+    bus_eventos.publicar(id, 'tablero_eliminado', {'id': id})
+    return {'mensaje': 'Tablero eliminada exitosamente'}
+
+
+@router.get('/{id}/board', response_model=esquemas.TableroBoard,
+            dependencies=[etag_condicional('tablero', 'fase', 'tarea', 'persona')])
+async def obtener_tablero_board(id: int, sesion=Depends(sesion_lectura)):
+    """Tablero con sus fases y las tareas de cada fase (tres consultas, como en Flask)."""
+    tablero = (await sesion.scalars(Tablero.consulta_tablero_completo(id))).first()
+    if not tablero:
+        raise HTTPException(404, 'Tablero no encontrado')
+    fases = (await sesion.scalars(select(Fase).order_by(Fase.id))).all()
+    return Tablero.armar_tablero_completo(tablero, fases)
+
+
+@router.get('/{id}/eventos', response_class=StreamingResponse)
+async def eventos_tablero(id: int):
+    """
+    Cambios en vivo de las tareas del tablero (Server-Sent Events).
+
+    Cada suscriptor espera en el event loop, sin ocupar un hilo. Publican las
+    escrituras de este proceso (ver src/models/eventos.py).
+    """
+    # Sesión propia y no la dependencia: no debe quedar abierta mientras dure el stream
+    async with SesionAsyncLectura() as sesion:
+        existe = await sesion.get(Tablero, id)
+    if not existe:
+        raise HTTPException(404, 'Tablero no encontrado')
+    suscripcion = bus_eventos.suscribir(id, loop=asyncio.get_running_loop())
+    return StreamingResponse(stream_eventos_async(suscripcion), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,88 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from src.models.tarea_m import Tarea, COLUMNAS_ORDENABLES, serializar_tarea
+from src.models.paginacion import preparar_pagina, cortar_pagina
+from src.models.eventos import bus_eventos, eventos_cambio_tarea
+from src.asgi import esquemas
+from src.asgi.dependencias import (sesion_lectura, sesion_escritura, paginacion,
+                                   cabeceras_paginacion, etag_condicional)
+
+router = APIRouter(prefix='/api/v1/tareas', tags=['tareas'])
+
+
+@router.get('/', response_model=list[esquemas.Tarea], dependencies=[etag_condicional('tarea')])
+async def listar_tareas(
+    request: Request,
+    response: Response,
+    pagina=Depends(paginacion),
+    tablero_id: int | None = Query(None, description='Filtrar por tablero'),
+    fase_id: int | None = Query(None, description='Filtrar por fase'),
+    persona_id: int | None = Query(None, description='Filtrar por persona asignada'),
+    estado: esquemas.EstadoTarea | None = Query(None, description='Filtrar por estado'),
+    fecha_inicio_desde: datetime | None = Query(None, description='fecha_inicio mayor o igual (ISO 8601)'),
+    fecha_inicio_hasta: datetime | None = Query(None, description='fecha_inicio menor o igual (ISO 8601)'),
+    fecha_fin_desde: datetime | None = Query(None, description='fecha_fin mayor o igual (ISO 8601)'),
+    fecha_fin_hasta: datetime | None = Query(None, description='fecha_fin menor o igual (ISO 8601)'),
+    sort: str | None = Query(None, description=f'Campos de orden separados por coma, con "-" para '
+                                                f'descendente. Válidos: {", ".join(COLUMNAS_ORDENABLES)}'),
+    sesion=Depends(sesion_lectura),
+):
+    """Tareas paginadas, con los mismos filtros y orden que GET /api/v1/tareas/ de Flask."""
+    limit, after = pagina
+    consulta = Tarea.filtrar(select(*serializar_tarea.columnas), tablero_id=tablero_id, fase_id=fase_id,
+                             persona_id=persona_id, estado=estado,
+                             fecha_inicio_desde=fecha_inicio_desde, fecha_inicio_hasta=fecha_inicio_hasta,
+                             fecha_fin_desde=fecha_fin_desde, fecha_fin_hasta=fecha_fin_hasta)
+    try:
+        orden = Tarea.ordenamiento(sort)
+        consulta = preparar_pagina(consulta, orden, limit, after)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    tareas, siguiente = cortar_pagina((await sesion.execute(consulta)).all(), orden, limit)
+    cabeceras_paginacion(request, response, siguiente)
+    return list(map(serializar_tarea, tareas))
+
+
+@router.post('/', response_model=esquemas.TareaRespuesta, status_code=201)
+async def crear_tarea(datos: esquemas.TareaEntrada, sesion=Depends(sesion_escritura)):
+    tarea = Tarea(**datos.model_dump())
+    sesion.add(tarea)
+    await sesion.commit()
+    creada = tarea.to_dict()
+    bus_eventos.publicar(creada['tablero_id'], 'tarea_creada', creada)
+    return {'mensaje': 'Tarea creada exitosamente', 'tarea': creada}
+
+
+@router.get('/{tarea_id}', response_model=esquemas.Tarea, dependencies=[etag_condicional('tarea')])
+async def obtener_tarea(tarea_id: int, sesion=Depends(sesion_lectura)):
+    tarea = await sesion.get(Tarea, tarea_id)
+    if not tarea:
+        raise HTTPException(404, f'Tarea con ID {tarea_id} no encontrada')
+    return tarea.to_dict()
+
+
+@router.put('/{tarea_id}', response_model=esquemas.TareaRespuesta)
+async def actualizar_tarea(tarea_id: int, datos: esquemas.TareaCambios, sesion=Depends(sesion_escritura)):
+    tarea = await sesion.get(Tarea, tarea_id)
+    if not tarea:
+        raise HTTPException(404, f'Tarea con ID {tarea_id} no encontrada')
+    anterior = (tarea.tablero_id, tarea.fase_id)
+    for campo, valor in datos.model_dump(exclude_unset=True).items():
+        setattr(tarea, campo, valor)
+    await sesion.commit()
+    actualizada = tarea.to_dict()
+    for evento in eventos_cambio_tarea(anterior, actualizada):
+        bus_eventos.publicar(*evento)
+    return {'mensaje': 'Tarea actualizada exitosamente', 'tarea': actualizada}
+
+
+@router.delete('/{tarea_id}', response_model=esquemas.Mensaje)
+async def eliminar_tarea(tarea_id: int, sesion=Depends(sesion_escritura)):
+    tarea = await sesion.get(Tarea, tarea_id)
+    if not tarea:
+        raise HTTPException(404, f'Tarea con ID {tarea_id} no encontrada')
+    await sesion.delete(tarea)
+    await sesion.commit()
+    bus_eventos.publicar(tarea.tablero_id, 'tarea_eliminada', {'id': tarea_id})
+    return {'mensaje': f'Tarea {tarea_id} eliminada exitosamente'}
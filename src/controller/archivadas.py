@@ -0,0 +1,14 @@
+from flask import request
+from flask_restx import inputs, reqparse
+
+# ?incluir_archivadas=true: las lecturas también buscan en el archivo de
+# tareas y tableros terminados (ver src/models/archivo.py)
+archivadas_parser = reqparse.RequestParser()
+archivadas_parser.add_argument('incluir_archivadas', type=inputs.boolean, location='args', default=False,
+                               help='Incluir también las filas archivadas')
+
+
+def leer_incluir_archivadas():
+    """True si la petición pide incluir el archivo (lanza ValueError si el valor es inválido)."""
+    valor = request.args.get('incluir_archivadas')
+    return inputs.boolean(valor) if valor else False
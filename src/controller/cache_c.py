@@ -0,0 +1,10 @@
+from app import app
+from flask import jsonify
+from flask_controller import FlaskController
+from src.models.cache import estadisticas_caches
+
+class CacheController(FlaskController):
+    @app.route("/cache/estadisticas", methods=['GET'])
+    def estadisticas_cache():
+        # Aciertos, fallos e invalidaciones de cada cache del proceso
+        return jsonify(estadisticas_caches()), 200
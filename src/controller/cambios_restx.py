@@ -0,0 +1,76 @@
+from flask import request
+from flask_restx import Namespace, Resource, fields, reqparse
+from src.models.cambios import obtener_cambios, CambiosTruncados, TABLAS_CAMBIOS
+from src.models.paginacion import leer_parametros, LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+
+# Namespace para la sincronización incremental
+cambios_ns = Namespace(
+    'cambios',
+    description='Registro de cambios para sincronizar clientes'
+)
+
+# Modelos para Swagger
+cambio_model = cambios_ns.model('Cambio', {
+    'seq': fields.Integer(description='Secuencia del último cambio del registro'),
+    'tabla': fields.String(description='Tabla del registro', enum=list(TABLAS_CAMBIOS)),
+    'id': fields.Integer(description='ID del registro'),
+    'operacion': fields.String(description='Cambio acumulado desde `desde`',
+                               enum=['creado', 'actualizado', 'eliminado']),
+    'datos': fields.Raw(description='Estado actual del registro (null si fue eliminado)')
+})
+
+cambios_response = cambios_ns.model('CambiosResponse', {
+    'cambios': fields.List(fields.Nested(cambio_model)),
+    'siguiente': fields.Integer(description='Valor de `desde` para la próxima consulta'),
+    'hay_mas': fields.Boolean(description='Hay más cambios: consultar de nuevo con `siguiente` enseguida')
+})
+
+cambios_parser = reqparse.RequestParser()
+cambios_parser.add_argument('desde', type=int, location='args',
+                            help='Secuencia devuelta en `siguiente` por la consulta anterior. '
+                                 'Sin él solo se devuelve la secuencia actual')
+cambios_parser.add_argument('limit', type=int, location='args',
+                            help=f'Cantidad máxima de registros (por defecto {LIMITE_POR_DEFECTO}, '
+                                 f'máximo {LIMITE_MAXIMO})')
+
+
+def leer_desde():
+    """Retorna `desde` de la petición actual (o None). Lanza ValueError si es inválido."""
+    valor = request.args.get('desde')
+    if valor in (None, ''):
+        return None
+    try:
+        desde = int(valor)
+    except ValueError:
+        raise ValueError("El parámetro 'desde' debe ser un entero")
+    if desde < 0:
+        raise ValueError("El parámetro 'desde' no puede ser negativo")
+    return desde
+
+
+@cambios_ns.route('')
+class CambiosResource(Resource):
+    @cambios_ns.doc('obtener_cambios')
+    @cambios_ns.expect(cambios_parser)
+    @cambios_ns.response(200, 'Cambios desde la secuencia pedida', cambios_response)
+    @cambios_ns.response(400, 'Parámetros inválidos')
+    @cambios_ns.response(410, 'El registro ya no tiene esos cambios: hay que sincronizar todo')
+    def get(self):
+        """
+        Obtener lo que cambió desde la última sincronización
+
+        Cada registro (tarea, tablero, fase o persona) aparece una sola vez, con
+        su estado actual. Para empezar: pedir sin `desde`, descargar los listados
+        y luego consultar con `desde` igual a la `siguiente` recibida.
+        """
+        try:
+            desde = leer_desde()
+            limit, _ = leer_parametros(request.args)
+            resultado = obtener_cambios(desde=desde, limit=limit)
+        except CambiosTruncados as e:
+            cambios_ns.abort(410, str(e))
+        except ValueError as e:
+            cambios_ns.abort(400, str(e))
+        except Exception as e:
+            cambios_ns.abort(500, f"Error interno: {str(e)}")
+        return resultado, 200
@@ -0,0 +1,22 @@
+from flask import request
+from flask_restx import reqparse
+
+# Sparse fieldsets: ?fields=id,nombre limita las columnas consultadas y las
+# claves de cada elemento de la respuesta (documentado en Swagger)
+campos_parser = reqparse.RequestParser()
+campos_parser.add_argument('fields', type=str, location='args',
+                           help='Campos a devolver separados por coma (ej: id,nombre). Por defecto, todos')
+
+
+def leer_lista(parametro):
+    """Valores separados por coma del query param, o None si no viene o está vacío."""
+    valor = request.args.get(parametro)
+    if not valor:
+        return None
+    valores = [elemento.strip() for elemento in valor.split(',') if elemento.strip()]
+    return valores or None
+
+
+def leer_campos():
+    """Lista de campos pedidos en ?fields=, o None si se piden todos."""
+    return leer_lista('fields')
@@ -0,0 +1,16 @@
+from app import app
+from flask import jsonify
+from flask_controller import FlaskController
+from src.models.pools import estadisticas_pools
+from src.models.escritura import estadisticas_group_commit
+
+class DBController(FlaskController):
+    @app.route("/db/pools", methods=['GET'])
+    def estadisticas_pools_db():
+        # Uso y saturación de los pools de lectura y escritura
+        return jsonify(estadisticas_pools()), 200
+
+    @app.route("/db/group-commit", methods=['GET'])
+    def group_commit_estadisticas():
+        # Lotes confirmados y tamaño promedio cuando GROUP_COMMIT=1
+        return jsonify(estadisticas_group_commit()), 200
@@ -0,0 +1,53 @@
+from functools import wraps
+from flask import request, Response
+from flask_restx.utils import unpack
+from werkzeug.http import quote_etag
+from src.models.versiones import obtener_versiones, recordar_versiones, etag_versiones
+from src.controller.formato_msgpack import prefiere_msgpack
+from src.controller.campos import leer_lista
+
+
+def calcular_etag(tablas):
+    versiones = obtener_versiones(*tablas)
+    recordar_versiones(versiones)
+    etag = etag_versiones(versiones)
+    # El mismo recurso en otra representación es otro cuerpo: necesita otro ETag
+    if prefiere_msgpack():
+        etag += '-msgpack'
+    return etag
+
+
+def etag_condicional(*tablas, inclusiones=None):
+    """
+    GET condicional con ETag fuerte basado en la versión de las tablas indicadas.
+
+    Debe ir por encima de los demás decoradores del recurso: si el If-None-Match
+    coincide se responde 304 sin consultar ni serializar los datos. La versión
+    se lee antes que los datos, así un cambio concurrente nunca queda oculto
+    detrás de un ETag nuevo. Vale también para los recursos que salen de un
+    cache en memoria (fases, tableros): sus entradas se validan contra la
+    misma versión del ETag (ver recordar_versiones), así que el cuerpo nunca
+    es más viejo que el ETag, aunque otro proceso haya escrito.
+
+    `inclusiones` ({valor de ?include=: tabla}) agrega al ETag las tablas de
+    las relaciones embebidas en la respuesta.
+    """
+    def decorador(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            involucradas = tablas
+            if inclusiones:
+                involucradas += tuple(inclusiones[nombre] for nombre in leer_lista('include') or ()
+                                      if nombre in inclusiones)
+            etag = calcular_etag(involucradas)
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers={'ETag': quote_etag(etag), 'Vary': 'Accept'})
+
+            data, code, headers = unpack(func(*args, **kwargs))
+            if code == 200:
+                headers = dict(headers or {})
+                headers['ETag'] = quote_etag(etag)
+                headers['Vary'] = 'Accept'
+            return data, code, headers
+        return wrapper
+    return decorador
@@ -0,0 +1,10 @@
+from app import app
+from flask import jsonify
+from flask_controller import FlaskController
+from src.models.eventos import bus_eventos
+
+class EventosController(FlaskController):
+    @app.route("/eventos/estadisticas", methods=['GET'])
+    def estadisticas_eventos():
+        # Suscripciones abiertas, eventos publicados y suscriptores descartados por lentos
+        return jsonify(bus_eventos.estadisticas()), 200
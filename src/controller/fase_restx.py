@@ -1,6 +1,9 @@
 from flask_restx import Namespace, Resource, fields
 from flask import request
 from src.models.fase_m import Fase
+from src.controller.etag import etag_condicional
+from src.controller.paginacion import paginacion_parser, leer_paginacion, cabeceras_paginacion
+from src.controller.campos import campos_parser, leer_campos
 from src.models import session
 
 # Namespace para Fase
@@ -27,18 +30,23 @@ fase_response = fase_ns.model('FaseResponse', {
 @fase_ns.route('/')
 class FaseList(Resource):
     @fase_ns.doc('listar_fases')
-    @fase_ns.marshal_list_with(fase_model)
+    @fase_ns.expect(paginacion_parser, campos_parser)
+    @etag_condicional('fase')
+    @fase_ns.response(200, 'Lista de fases', [fase_model])
     def get(self):
-        """Obtener todas las fases"""
+        """Obtener las fases paginadas (cursor en X-Next-Cursor)"""
         try:
-            fases = Fase.obtener_fases()
-            return fases, 200
+            limit, after = leer_paginacion()
+            fases, siguiente = Fase.obtener_fases(limit=limit, after=after, campos=leer_campos())
+            return fases, 200, cabeceras_paginacion(siguiente)
+        except ValueError as e:
+            fase_ns.abort(400, str(e))
         except Exception as e:
             fase_ns.abort(500, f"Error interno: {str(e)}")
 
     @fase_ns.doc('crear_fase')
     @fase_ns.expect(fase_input)
-    @fase_ns.marshal_with(fase_response, code=201)
+    @fase_ns.response(201, 'Fase creada', fase_response)
     def post(self):
         """Crear una nueva fase"""
         try:
@@ -56,21 +64,25 @@ class FaseList(Resource):
 @fase_ns.param('id', 'ID de la fase')
 class FaseResource(Resource):
     @fase_ns.doc('obtener_fase')
-    @fase_ns.marshal_with(fase_model)
+    @fase_ns.expect(campos_parser)
+    @etag_condicional('fase')
+    @fase_ns.response(200, 'Fase', fase_model)
     def get(self, id):
         """Obtener una fase específica"""
         try:
-            fase = Fase.obtener_fase_por_id(id)
+            fase = Fase.obtener_fase_por_id(id, campos=leer_campos())
             if fase:
                 return fase, 200
             else:
                 fase_ns.abort(404, "Fase no encontrada")
+        except ValueError as e:
+            fase_ns.abort(400, str(e))
         except Exception as e:
             fase_ns.abort(500, f"Error interno: {str(e)}")
 
     @fase_ns.doc('actualizar_fase')
     @fase_ns.expect(fase_input)
-    @fase_ns.marshal_with(fase_response)
+    @fase_ns.response(200, 'Fase actualizada', fase_response)
     def put(self, id):
         """Actualizar una fase"""
         try:
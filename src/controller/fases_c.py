@@ -2,6 +2,7 @@ from app import app
 from flask import render_template, request, redirect, url_for, jsonify, flash
 from flask_controller import FlaskController
 from src.models.fase_m import Fase
+from src.controller.paginacion import leer_paginacion, cabeceras_paginacion
 from src.models import session
 
 class FasesController(FlaskController):
@@ -14,15 +15,20 @@ class FasesController(FlaskController):
         nombre = data['nombre']
         try:
             nueva_fase = Fase.crear_fase(nombre=nombre) # Llama al método de clase
-            return jsonify(nueva_fase.to_dict()), 201 # 201 Created
+            return jsonify(nueva_fase), 201 # 201 Created
         except Exception as e:
             session.rollback() # Importante hacer rollback en caso de error
             return jsonify({"error": f"Error al crear la fase: {str(e)}"}), 500
 
     @app.route("/fases", methods=['GET']) # Nueva ruta para listar fases
     def listar_fases_api():
-        fases = Fase.obtener_fases()
-        return jsonify(fases), 200
+        # Se mantiene la lista plana por compatibilidad; el cursor va en X-Next-Cursor
+        try:
+            limit, after = leer_paginacion()
+            fases, siguiente = Fase.obtener_fases(limit=limit, after=after)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(fases), 200, cabeceras_paginacion(siguiente)
     
     @app.route("/fases/<int:id>", methods=['GET'])
     def obtener_fase(id):
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from flask import Request, make_response, request
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Representación MessagePack para clientes con poco ancho de banda. Con
+# `Accept: application/msgpack` los namespaces de flask_restx responden los
+# mismos recursos en binario, con las fechas como timestamp de MessagePack
+# (extensión -1). Las fechas de la base no tienen zona horaria y se
+# interpretan como UTC. JSON sigue siendo el formato por defecto.
+MIMETYPE_MSGPACK = "application/msgpack"
+MIMETYPES_MSGPACK = (MIMETYPE_MSGPACK, "application/x-msgpack")
+
+
+_EPOCA = datetime(1970, 1, 1)
+_EPOCA_UTC = _EPOCA.replace(tzinfo=timezone.utc)
+
+
+def _a_timestamp(obj):
+    if isinstance(obj, datetime):
+        # Resta directa en lugar de Timestamp.from_datetime: es el default de cada
+        # fecha de la respuesta y from_datetime pasa por timestamp() y round()
+        delta = obj - (_EPOCA if obj.tzinfo is None else _EPOCA_UTC)
+        return msgpack.Timestamp(delta.days * 86400 + delta.seconds, delta.microseconds * 1000)
+    raise TypeError(f"No se puede codificar {type(obj).__name__} en MessagePack")
+
+
+def _desde_timestamp(mapa):
+    # Los timestamps del cliente llegan como texto ISO 8601 (sin zona, en UTC), igual que
+    # en JSON, para que la validación de los modelos y los controladores no cambien
+    for clave, valor in mapa.items():
+        if isinstance(valor, msgpack.Timestamp):
+            mapa[clave] = valor.to_datetime().replace(tzinfo=None).isoformat()
+    return mapa
+
+
+def empaquetar(data):
+    return msgpack.packb(data, default=_a_timestamp, use_bin_type=True)
+
+
+def desempaquetar(cuerpo):
+    return msgpack.unpackb(cuerpo, raw=False, timestamp=0, object_hook=_desde_timestamp)
+
+
+def output_msgpack(data, code, headers=None):
+    """Representación application/msgpack para flask_restx."""
+    respuesta = make_response(empaquetar(data), code)
+    respuesta.headers.extend(headers or {})
+    respuesta.headers["Content-Type"] = MIMETYPE_MSGPACK
+    return respuesta
+
+
+def prefiere_msgpack():
+    """True si la petición actual negocia MessagePack en lugar de JSON."""
+    if msgpack is None:
+        return False
+    mejor = request.accept_mimetypes.best_match(("application/json",) + MIMETYPES_MSGPACK)
+    return mejor in MIMETYPES_MSGPACK
+
+
+class PeticionMsgpack(Request):
+    """
+    Request que además acepta cuerpos MessagePack.
+
+    get_json() (y por lo tanto request.json y el payload de flask_restx)
+    decodifica el cuerpo si el Content-Type es application/msgpack, así los
+    POST/PUT existentes aceptan ambos formatos sin cambios.
+    """
+
+    def get_json(self, force=False, silent=False, cache=True):
+        if msgpack is None or self.mimetype not in MIMETYPES_MSGPACK:
+            return super().get_json(force=force, silent=silent, cache=cache)
+        if cache and self._cached_json[silent] is not Ellipsis:
+            return self._cached_json[silent]
+        try:
+            datos = desempaquetar(self.get_data(cache=cache))
+        except (ValueError, msgpack.UnpackException) as e:
+            # Como en werkzeug: un fallo silencioso no se cachea para get_json() normal
+            if not silent:
+                return self.on_json_loading_failed(e)
+            if cache:
+                self._cached_json = (self._cached_json[False], None)
+            return None
+        if cache:
+            self._cached_json = (datos, datos)
+        return datos
+
+
+def registrar_msgpack(app, api):
+    """Agrega la representación MessagePack a la Api y acepta cuerpos MessagePack."""
+    if msgpack is None:
+        return False
+    app.request_class = PeticionMsgpack
+    for mimetype in MIMETYPES_MSGPACK:
+        api.representations[mimetype] = output_msgpack
+    return True
@@ -0,0 +1,86 @@
+from datetime import date
+from flask import current_app, make_response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Codificación JSON con orjson para jsonify (rutas Flask) y para la Api de
+# flask_restx. orjson serializa datetime/date/UUID/dataclass de forma nativa
+# y produce bytes directamente, que se usan como cuerpo de la respuesta sin
+# pasar por str. Si orjson no está instalado se usa el json estándar con el
+# mismo formato de salida (fechas en ISO 8601).
+
+
+def _fecha_iso(obj):
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class ProveedorJSON(DefaultJSONProvider):
+    """JSONProvider de Flask con fechas en ISO 8601 (Flask usa RFC 822 por defecto)."""
+
+    default = staticmethod(_fecha_iso)
+    # Ordenar claves no aporta nada a los clientes y cuesta en cada respuesta
+    sort_keys = False
+    # UTF-8 sin escapar, como orjson: la misma respuesta con o sin él
+    ensure_ascii = False
+
+    def dumps_bytes(self, obj, indentar=False):
+        if indentar:
+            return self.dumps(obj, indent=2).encode("utf-8")
+        return self.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indentar = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indentar) + b"\n", mimetype=self.mimetype)
+
+
+class ProveedorJSONRapido(ProveedorJSON):
+    """ProveedorJSON respaldado por orjson."""
+
+    def _opciones(self, indentar=False):
+        opciones = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opciones |= orjson.OPT_SORT_KEYS
+        if indentar:
+            opciones |= orjson.OPT_INDENT_2
+        return opciones
+
+    def dumps_bytes(self, obj, indentar=False):
+        # Los tipos que orjson no conoce (Decimal, Markup, ...) van al default de Flask
+        return orjson.dumps(obj, default=self.default, option=self._opciones(indentar))
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # indent/separators u otras opciones de json.dumps: se respeta el comportamiento estándar
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def output_json_rapido(data, code, headers=None):
+    """Representación application/json de flask_restx usando el proveedor de la app."""
+    respuesta = make_response(current_app.json.dumps_bytes(data, current_app.debug) + b"\n", code)
+    respuesta.headers.extend(headers or {})
+    return respuesta
+
+
+def registrar_json_rapido(app, api=None):
+    """
+    Instala el proveedor JSON en `app` (jsonify) y, si se pasa, en la Api de flask_restx.
+
+    Usa orjson si está instalado; retorna True en ese caso.
+    """
+    app.json = ProveedorJSONRapido(app) if orjson is not None else ProveedorJSON(app)
+    if api is not None:
+        api.representations["application/json"] = output_json_rapido
+    return orjson is not None
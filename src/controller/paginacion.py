@@ -0,0 +1,30 @@
+from urllib.parse import urlencode
+from flask import request
+from flask_restx import reqparse
+from src.models.paginacion import leer_parametros, LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+
+# Parámetros de paginación compartidos por los listados (documentados en Swagger)
+paginacion_parser = reqparse.RequestParser()
+paginacion_parser.add_argument('limit', type=int, location='args',
+                               help=f'Cantidad máxima de elementos por página '
+                                    f'(por defecto {LIMITE_POR_DEFECTO}, máximo {LIMITE_MAXIMO})')
+paginacion_parser.add_argument('after', type=str, location='args',
+                               help='Cursor opaco devuelto en X-Next-Cursor por la página anterior')
+
+
+def leer_paginacion():
+    """Retorna (limit, after) de la petición actual. Lanza ValueError si son inválidos."""
+    return leer_parametros(request.args)
+
+
+def cabeceras_paginacion(siguiente):
+    """Cabeceras X-Next-Cursor y Link (rel="next") para la página actual."""
+    if not siguiente:
+        return {}
+    args = request.args.to_dict()
+    args['after'] = siguiente
+    url = f"{request.base_url}?{urlencode(args)}"
+    return {
+        'X-Next-Cursor': siguiente,
+        'Link': f'<{url}>; rel="next"'
+    }
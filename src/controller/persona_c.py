@@ -2,6 +2,7 @@ from app import app
 from flask import render_template, request, redirect, url_for, jsonify, flash
 from flask_controller import FlaskController
 from src.models.persona_m import Persona
+from src.controller.paginacion import leer_paginacion, cabeceras_paginacion
 from src.models import session
 from sqlalchemy.exc import IntegrityError
 
@@ -23,8 +24,12 @@ class PersonaController(FlaskController):
 
     @app.route("/personas", methods = ['GET'])
     def listar_personas():
-        personas = Persona.obtener_personas()
-        return jsonify({"personas": personas, "total": len(personas)}), 200        
+        try:
+            limit, after = leer_paginacion()
+            personas, siguiente = Persona.obtener_personas(limit=limit, after=after)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"personas": personas, "total": len(personas), "next": siguiente}), 200, cabeceras_paginacion(siguiente)
     
     @app.route("/personas/<int:id>g", methods = ['GET'])
     def obtener_persona(id):
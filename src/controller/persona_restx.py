@@ -1,6 +1,10 @@
 from flask_restx import Namespace, Resource, fields
 from flask import request
 from src.models.persona_m import Persona
+from src.controller.etag import etag_condicional
+from src.controller.paginacion import paginacion_parser, leer_paginacion, cabeceras_paginacion
+from src.controller.campos import campos_parser, leer_campos
+from src.controller.segundo_plano import segundo_plano_parser, leer_en_segundo_plano, respuesta_trabajo
 from src.models import session
 
 # Namespace para Persona
@@ -13,7 +17,6 @@ persona_ns = Namespace(
 persona_model = persona_ns.model('Persona', {
     'nombre': fields.String(required=True, description="Nombre"),
     'correo': fields.String(required=True, description="Correo"),
-    'password': fields.String(required=True, description="Password"),
     'id': fields.Integer(description='ID único')
 })
 
@@ -31,18 +34,23 @@ persona_response = persona_ns.model('PersonaResponse', {
 @persona_ns.route('/')
 class PersonaList(Resource):
     @persona_ns.doc('listar_personas')
-    @persona_ns.marshal_list_with(persona_model)
+    @persona_ns.expect(paginacion_parser, campos_parser)
+    @etag_condicional('persona')
+    @persona_ns.response(200, 'Lista de personas', [persona_model])
     def get(self):
-        """Obtener todas las personas"""
+        """Obtener las personas paginadas (cursor en X-Next-Cursor)"""
         try:
-            personas = Persona.obtener_personas()
-            return personas, 200
+            limit, after = leer_paginacion()
+            personas, siguiente = Persona.obtener_personas(limit=limit, after=after, campos=leer_campos())
+            return personas, 200, cabeceras_paginacion(siguiente)
+        except ValueError as e:
+            persona_ns.abort(400, str(e))
         except Exception as e:
             persona_ns.abort(500, f"Error interno: {str(e)}")
 
     @persona_ns.doc('crear_persona')
     @persona_ns.expect(persona_input)
-    @persona_ns.marshal_with(persona_response, code=201)
+    @persona_ns.response(201, 'Persona creada', persona_response)
     def post(self):
         """Crear una nueva persona"""
         try:
@@ -56,25 +64,53 @@ class PersonaList(Resource):
             session.rollback()
             persona_ns.abort(500, f"Error al crear persona: {str(e)}")
 
+carga_model = persona_ns.model('CargaPersona', {
+    'persona_id': fields.Integer(description='ID de la persona'),
+    'nombre': fields.String(description='Nombre de la persona'),
+    'total': fields.Integer(description='Tareas asignadas'),
+    'abiertas': fields.Integer(description='Tareas asignadas no completadas'),
+    'vencidas': fields.Integer(description='Tareas abiertas con fecha_fin ya pasada')
+})
+
+@persona_ns.route('/carga')
+class PersonaCarga(Resource):
+    @persona_ns.doc('obtener_carga_personas')
+    @persona_ns.response(200, 'Carga de trabajo de cada persona', [carga_model])
+    def get(self):
+        """
+        Obtener la carga de trabajo de cada persona
+
+        Conteos mantenidos con cada escritura de tareas; no se recorren las
+        tareas. Sin ETag: las vencidas cambian con la hora.
+        """
+        try:
+            return Persona.obtener_carga(), 200
+        except Exception as e:
+            persona_ns.abort(500, f"Error interno: {str(e)}")
+
 @persona_ns.route('/<int:id>')
 @persona_ns.param('id', 'ID de la persona')
 class PersonaResource(Resource):
     @persona_ns.doc('obtener_persona')
-    @persona_ns.marshal_with(persona_model)
+    @persona_ns.expect(campos_parser)
+    @etag_condicional('persona')
+    @persona_ns.response(200, 'Persona', persona_model)
     def get(self, id):
         """Obtener una persona específica"""
         try:
-            persona = Persona.obtener_persona_por_id(id)
+            persona = Persona.obtener_persona_por_id(id, campos=leer_campos())
             if persona:
                 return persona, 200
             else:
                 persona_ns.abort(404, "Persona no encontrada")
+        except ValueError as e:
+            persona_ns.abort(400, str(e))
         except Exception as e:
             persona_ns.abort(500, f"Error interno: {str(e)}")
 
     @persona_ns.doc('actualizar_persona')
     @persona_ns.expect(persona_input)
-    @persona_ns.marshal_with(persona_response)
+    @persona_ns.response(200, 'Persona actualizada', persona_response)
     def put(self, id):
         """Actualizar una persona"""
         try:
@@ -92,13 +128,21 @@ class PersonaResource(Resource):
             persona_ns.abort(500, f"Error al actualizar persona: {str(e)}")
 
     @persona_ns.doc('eliminar_persona')
+    @persona_ns.expect(segundo_plano_parser)
     def delete(self, id):
-        """Eliminar una persona"""
+        """Eliminar una persona (con ?en_segundo_plano=true, como trabajo: sus tareas se purgan por lotes)"""
         try:
+            if leer_en_segundo_plano():
+                trabajo = Persona.purgar_persona(id)
+                if trabajo:
+                    return respuesta_trabajo(trabajo)
+                persona_ns.abort(404, "Persona no encontrada")
             if Persona.eliminar_persona(id):
                 return {'mensaje': 'Persona eliminada exitosamente'}, 200
             else:
                 persona_ns.abort(404, "Persona no encontrada")
+        except ValueError as e:
+            persona_ns.abort(400, str(e))
         except Exception as e:
             session.rollback()
             persona_ns.abort(500, f"Error al eliminar persona: {str(e)}")
@@ -0,0 +1,22 @@
+from flask import request
+from flask_restx import inputs, reqparse
+
+# ?en_segundo_plano=true: la operación se registra como trabajo (ver
+# src/models/trabajos.py) y la petición responde 202 con su id de inmediato
+segundo_plano_parser = reqparse.RequestParser()
+segundo_plano_parser.add_argument('en_segundo_plano', type=inputs.boolean, location='args', default=False,
+                                  help='Ejecutar como trabajo en segundo plano y responder 202 (ver /api/v1/jobs)')
+
+
+def leer_en_segundo_plano():
+    """True si la petición pide ejecutarse en segundo plano (lanza ValueError si el valor es inválido)."""
+    valor = request.args.get('en_segundo_plano')
+    return inputs.boolean(valor) if valor else False
+
+
+def respuesta_trabajo(trabajo):
+    """202 Accepted con el trabajo creado y su URL en Location."""
+    return {
+        'mensaje': 'Trabajo en curso',
+        'trabajo': trabajo
+    }, 202, {'Location': f"{request.script_root}/api/v1/jobs/{trabajo['id']}"}
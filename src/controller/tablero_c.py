@@ -3,6 +3,7 @@ from flask import render_template, request, redirect, url_for, jsonify, flash
 from flask_controller import FlaskController
 from datetime import datetime
 from src.models.tablero_m import Tablero
+from src.controller.paginacion import leer_paginacion, cabeceras_paginacion
 from src.models import session
 
 class TableroController(FlaskController):
@@ -39,8 +40,12 @@ class TableroController(FlaskController):
 
     @app.route("/tablero", methods=['GET'])
     def obtener_tableros():
-        tableros = Tablero.obtener_tableros()
-        return jsonify({"tableros": tableros, "total": len(tableros)}), 200
+        try:
+            limit, after = leer_paginacion()
+            tableros, siguiente = Tablero.obtener_tableros(limit=limit, after=after)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"tableros": tableros, "total": len(tableros), "next": siguiente}), 200, cabeceras_paginacion(siguiente)
     
     @app.route("/tablero/<int:id>g", methods=['GET'])
     def obtener_tablero(id):
@@ -1,6 +1,13 @@
 from flask_restx import Namespace, Resource, fields
-from flask import request
+from flask import request, Response
 from src.models.tablero_m import Tablero
+from src.models.eventos import (bus_eventos, stream_eventos, DemasiadasSuscripciones, TIPOS_EVENTO,
+                                EVENTOS_MAX_SUSCRIPTORES, EVENTOS_DURACION_MAX_S)
+from src.controller.etag import etag_condicional
+from src.controller.paginacion import paginacion_parser, leer_paginacion, cabeceras_paginacion
+from src.controller.campos import campos_parser, leer_campos
+from src.controller.segundo_plano import segundo_plano_parser, leer_en_segundo_plano, respuesta_trabajo
+from src.controller.archivadas import archivadas_parser, leer_incluir_archivadas
 from src.models import session
 
 # Namespace para Tablero
@@ -32,21 +39,96 @@ tablero_response = tablero_ns.model('TableroResponse', {
     'tablero': fields.Nested(tablero_model)
 })
 
+tarea_tablero_model = tablero_ns.model('TareaTablero', {
+    'id': fields.Integer(description='ID único'),
+    'nombre': fields.String(description="Nombre"),
+    'descripcion': fields.String(description="Descripcion"),
+    'fecha_creacion': fields.DateTime(description="Fecha Creacion"),
+    'fecha_inicio': fields.DateTime(description="Fecha Inicio"),
+    'fecha_fin': fields.DateTime(description="Fecha Fin"),
+    'estado': fields.String(description="Estado"),
+    'fase_id': fields.Integer(description='ID de la fase'),
+    'persona_id': fields.Integer(description='ID de la persona asignada'),
+    'persona_nombre': fields.String(description='Nombre de la persona asignada'),
+    'tablero_id': fields.Integer(description='ID del tablero')
+})
+
+fase_tablero_model = tablero_ns.model('FaseTablero', {
+    'id': fields.Integer(description='ID único'),
+    'nombre': fields.String(description="Nombre"),
+    'tareas': fields.List(fields.Nested(tarea_tablero_model))
+})
+
+conteo_fase_model = tablero_ns.model('ConteoFase', {
+    'fase_id': fields.Integer(description='ID de la fase'),
+    'nombre': fields.String(description='Nombre de la fase'),
+    'cantidad': fields.Integer(description='Tareas del tablero en la fase')
+})
+
+conteo_persona_model = tablero_ns.model('ConteoPersona', {
+    'persona_id': fields.Integer(description='ID de la persona (null = sin asignar)'),
+    'nombre': fields.String(description='Nombre de la persona'),
+    'cantidad': fields.Integer(description='Tareas del tablero asignadas a la persona')
+})
+
+estadisticas_model = tablero_ns.model('EstadisticasTablero', {
+    'tablero_id': fields.Integer(description='ID del tablero'),
+    'total': fields.Integer(description='Cantidad de tareas del tablero'),
+    'por_fase': fields.List(fields.Nested(conteo_fase_model)),
+    'por_persona': fields.List(fields.Nested(conteo_persona_model)),
+    'vencidas': fields.Integer(description='Tareas no completadas con fecha_fin ya pasada')
+})
+
+clonar_input = tablero_ns.model('ClonarTableroInput', {
+    'nombre': fields.String(description='Nombre de la copia (por defecto, "<nombre> (copia)")'),
+    'descripcion': fields.String(description='Descripción de la copia (por defecto, la del original)'),
+    'fecha_entrega': fields.DateTime(description='Entrega de la copia (por defecto, la del original desplazada)'),
+    'estado': fields.String(description='Estado de la copia (por defecto, el del original)'),
+    'desplazar_dias': fields.Integer(description='Días a correr las fechas de las tareas', example=14),
+    'fases': fields.List(fields.Integer, description='Copiar solo las tareas de estas fases (por defecto, todas)'),
+    'sin_personas': fields.Boolean(description='Dejar las tareas copiadas sin asignar', default=False),
+    'reiniciar_estado': fields.Boolean(description='Dejar las tareas copiadas como pendientes', default=False)
+})
+
+clonar_response = tablero_ns.model('ClonarTableroResponse', {
+    'mensaje': fields.String(description='Mensaje de respuesta'),
+    'tablero': fields.Nested(tablero_model),
+    'tareas': fields.Integer(description='Cantidad de tareas copiadas')
+})
+
+restaurar_response = tablero_ns.model('RestaurarTableroResponse', {
+    'mensaje': fields.String(description='Mensaje de respuesta'),
+    'tablero': fields.Nested(tablero_model),
+    'tareas': fields.Integer(description='Cantidad de tareas restauradas'),
+    'pendientes': fields.Integer(description='Tareas que siguen archivadas porque su fase ya no existe')
+})
+
+tablero_board_model = tablero_ns.model('TableroBoard', {
+    'tablero': fields.Nested(tablero_model),
+    'fases': fields.List(fields.Nested(fase_tablero_model))
+})
+
 @tablero_ns.route('/')
 class TableroList(Resource):
     @tablero_ns.doc('listar_tableros')
-    @tablero_ns.marshal_list_with(tablero_model)
+    @tablero_ns.expect(paginacion_parser, campos_parser, archivadas_parser)
+    @etag_condicional('tablero')
+    @tablero_ns.response(200, 'Lista de tableros', [tablero_model])
     def get(self):
-        """Obtener todas las tableros"""
+        """Obtener los tableros paginados (cursor en X-Next-Cursor)"""
         try:
-            tableros = Tablero.obtener_tableros()
-            return tableros, 200
+            limit, after = leer_paginacion()
+            tableros, siguiente = Tablero.obtener_tableros(limit=limit, after=after, campos=leer_campos(),
+                                                           incluir_archivadas=leer_incluir_archivadas())
+            return tableros, 200, cabeceras_paginacion(siguiente)
+        except ValueError as e:
+            tablero_ns.abort(400, str(e))
         except Exception as e:
             tablero_ns.abort(500, f"Error interno: {str(e)}")
 
     @tablero_ns.doc('crear_tablero')
     @tablero_ns.expect(tablero_input)
-    @tablero_ns.marshal_with(tablero_response, code=201)
+    @tablero_ns.response(201, 'Tablero creada', tablero_response)
     def post(self):
         """Crear una nueva tablero"""
         try:
@@ -64,21 +146,26 @@ class TableroList(Resource):
 @tablero_ns.param('id', 'ID de la tablero')
 class TableroResource(Resource):
     @tablero_ns.doc('obtener_tablero')
-    @tablero_ns.marshal_with(tablero_model)
+    @tablero_ns.expect(campos_parser, archivadas_parser)
+    @etag_condicional('tablero')
+    @tablero_ns.response(200, 'Tablero', tablero_model)
     def get(self, id):
         """Obtener una tablero específica"""
         try:
-            tablero = Tablero.obtener_tablero_por_id(id)
+            tablero = Tablero.obtener_tablero_por_id(id, campos=leer_campos(),
+                                                     incluir_archivadas=leer_incluir_archivadas())
             if tablero:
                 return tablero, 200
             else:
                 tablero_ns.abort(404, "Tablero no encontrada")
+        except ValueError as e:
+            tablero_ns.abort(400, str(e))
         except Exception as e:
             tablero_ns.abort(500, f"Error interno: {str(e)}")
 
     @tablero_ns.doc('actualizar_tablero')
     @tablero_ns.expect(tablero_input)
-    @tablero_ns.marshal_with(tablero_response)
+    @tablero_ns.response(200, 'Tablero actualizada', tablero_response)
     def put(self, id):
         """Actualizar una tablero"""
         try:
@@ -96,13 +183,145 @@ class TableroResource(Resource):
             tablero_ns.abort(500, f"Error al actualizar tablero: {str(e)}")
 
     @tablero_ns.doc('eliminar_tablero')
+    @tablero_ns.expect(segundo_plano_parser)
     def delete(self, id):
-        """Eliminar una tablero"""
+        """Eliminar una tablero (con ?en_segundo_plano=true, como trabajo: sus tareas se purgan por lotes)"""
         try:
+            if leer_en_segundo_plano():
+                trabajo = Tablero.purgar_tablero(id)
+                if trabajo:
+                    return respuesta_trabajo(trabajo)
+                tablero_ns.abort(404, "Tablero no encontrada")
             if Tablero.eliminar_tablero(id):
                 return {'mensaje': 'Tablero eliminada exitosamente'}, 200
             else:
                 tablero_ns.abort(404, "Tablero no encontrada")
+        except ValueError as e:
+            tablero_ns.abort(400, str(e))
         except Exception as e:
             session.rollback()
             tablero_ns.abort(500, f"Error al eliminar tablero: {str(e)}")
+
+@tablero_ns.route('/<int:id>/board')
+@tablero_ns.param('id', 'ID del tablero')
+class TableroBoard(Resource):
+    @tablero_ns.doc('obtener_tablero_board')
+    @tablero_ns.expect(campos_parser)
+    @etag_condicional('tablero', 'fase', 'tarea', 'persona')
+    @tablero_ns.response(200, 'Tablero con sus fases y tareas', tablero_board_model)
+    def get(self, id):
+        """
+        Obtener el tablero con sus fases y las tareas de cada fase
+
+        `fields` limita los campos de cada tarea (columnas de la tarea y persona_nombre).
+        """
+        try:
+            board = Tablero.obtener_tablero_completo(id, campos=leer_campos())
+        except ValueError as e:
+            tablero_ns.abort(400, str(e))
+        except Exception as e:
+            tablero_ns.abort(500, f"Error interno: {str(e)}")
+        if not board:
+            tablero_ns.abort(404, "Tablero no encontrado")
+        return board, 200
+
+@tablero_ns.route('/<int:id>/clonar')
+@tablero_ns.param('id', 'ID del tablero a copiar')
+class TableroClonar(Resource):
+    @tablero_ns.doc('clonar_tablero')
+    @tablero_ns.expect(clonar_input)
+    @tablero_ns.response(201, 'Tablero copiado', clonar_response)
+    @tablero_ns.response(400, 'Opciones inválidas')
+    @tablero_ns.response(404, 'Tablero no encontrado')
+    def post(self, id):
+        """
+        Copiar un tablero con sus tareas (p. ej. una plantilla de sprint)
+
+        El tablero y sus tareas se duplican en una sola transacción; las tareas
+        con un único INSERT ... SELECT, sin importar cuántas sean.
+        """
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            tablero_ns.abort(400, 'Se espera un objeto con las opciones de la copia')
+        opciones = {campo: data[campo] for campo in clonar_input if campo in data}
+        try:
+            copia = Tablero.clonar_tablero(id, **opciones)
+        except ValueError as e:
+            session.rollback()
+            tablero_ns.abort(400, str(e))
+        except Exception as e:
+            session.rollback()
+            tablero_ns.abort(500, f"Error al copiar el tablero: {str(e)}")
+        if not copia:
+            tablero_ns.abort(404, "Tablero no encontrado")
+        return {'mensaje': 'Tablero copiado exitosamente', **copia}, 201
+
+@tablero_ns.route('/<int:id>/restaurar')
+@tablero_ns.param('id', 'ID del tablero archivado')
+class TableroRestaurar(Resource):
+    @tablero_ns.doc('restaurar_tablero')
+    @tablero_ns.response(200, 'Tablero restaurado', restaurar_response)
+    @tablero_ns.response(404, 'El tablero no está archivado')
+    def post(self, id):
+        """
+        Devolver un tablero archivado, con sus tareas, a los activos
+
+        El tablero vuelve como 'activo' y sus tareas se restauran por lotes.
+        Las tareas cuya fase ya no existe siguen archivadas (ver `pendientes`).
+        """
+        try:
+            restaurado = Tablero.restaurar_tablero(id)
+        except Exception as e:
+            tablero_ns.abort(500, f"Error al restaurar el tablero: {str(e)}")
+        if not restaurado:
+            tablero_ns.abort(404, "El tablero no está archivado")
+        return {'mensaje': 'Tablero restaurado exitosamente', **restaurado}, 200
+
+@tablero_ns.route('/<int:id>/eventos')
+@tablero_ns.param('id', 'ID del tablero')
+class TableroEventos(Resource):
+    @tablero_ns.doc('eventos_tablero', produces=['text/event-stream'])
+    @tablero_ns.response(200, f"Stream SSE con los eventos {', '.join(TIPOS_EVENTO)}")
+    @tablero_ns.response(404, 'Tablero no encontrado')
+    @tablero_ns.response(503, 'Demasiados streams abiertos en este proceso (ver Retry-After)')
+    def get(self, id):
+        """
+        Recibir en vivo los cambios de las tareas del tablero (Server-Sent Events)
+
+        Cada evento trae la tarea (o su id, si se eliminó). Si el cliente no
+        consume a tiempo recibe `descartado` y el stream se cierra: al
+        reconectarse debe ponerse al día con /api/v1/cambios. En esta API el
+        stream dura hasta EVENTOS_DURACION_MAX_S segundos y EventSource se
+        reconecta solo.
+        """
+        if not Tablero.obtener_tablero_por_id(id):
+            tablero_ns.abort(404, "Tablero no encontrado")
+        # El stream no usa la base: se libera la conexión antes de empezar
+        session.remove()
+        try:
+            suscripcion = bus_eventos.suscribir(id, maximo=EVENTOS_MAX_SUSCRIPTORES)
+        except DemasiadasSuscripciones as e:
+            return {'message': str(e)}, 503, {'Retry-After': str(int(EVENTOS_DURACION_MAX_S))}
+        return Response(stream_eventos(suscripcion), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@tablero_ns.route('/<int:id>/estadisticas')
+@tablero_ns.param('id', 'ID del tablero')
+class TableroEstadisticas(Resource):
+    @tablero_ns.doc('obtener_estadisticas_tablero')
+    @tablero_ns.response(200, 'Conteos de tareas por fase, por persona y vencidas', estadisticas_model)
+    @tablero_ns.response(404, 'Tablero no encontrado')
+    def get(self, id):
+        """
+        Obtener las estadísticas de tareas del tablero
+
+        Se leen de un resumen que se mantiene con cada escritura de tareas,
+        sin recorrer las tareas. Sin ETag: las vencidas cambian con la hora.
+        """
+        try:
+            estadisticas = Tablero.obtener_estadisticas(id)
+        except Exception as e:
+            tablero_ns.abort(500, f"Error interno: {str(e)}")
+        if not estadisticas:
+            tablero_ns.abort(404, "Tablero no encontrado")
+        return estadisticas, 200
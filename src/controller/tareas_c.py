@@ -3,6 +3,7 @@ from flask import render_template, request, redirect, url_for, jsonify, flash
 from flask_controller import FlaskController
 from datetime import datetime
 from src.models.tarea_m import Tarea
+from src.controller.paginacion import leer_paginacion, cabeceras_paginacion
 from src.models import session
 
 @app.route('/')
@@ -55,11 +56,15 @@ class ClientesController(FlaskController):
                     return jsonify({"error": f"Error al crear la tarea: {str(e)}"}), 500
             
         elif request.method == 'GET':
-            tareas = Tarea.listar_tareas()
+            try:
+                limit, after = leer_paginacion()
+                tareas, siguiente = Tarea.listar_tareas(limit=limit, after=after)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
             return jsonify({ 
                 'mensaje': 'Tareas obtenidas exitosamente',
-                'tareas': tareas, 'total': len(tareas)
-            }), 200
+                'tareas': tareas, 'total': len(tareas), 'next': siguiente
+            }), 200, cabeceras_paginacion(siguiente)
 
     @app.route("/tareas/<int:id>g", methods=['GET'])
     def obtener_tarea(id):
@@ -1,8 +1,16 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, inputs, reqparse
 from flask import request
 from datetime import datetime
 from src.models import session
-from src.models.tarea_m import Tarea
+from src.models.tarea_m import (Tarea, ESTADOS_TAREA, COLUMNAS_ORDENABLES, MAX_TAREAS_BULK,
+                                MAX_TAREAS_BULK_EN_SEGUNDO_PLANO, INCLUSIONES_TAREA)
+from src.models.trabajos import Trabajo
+from src.models.busqueda import buscar_tareas
+from src.controller.etag import etag_condicional
+from src.controller.paginacion import paginacion_parser, leer_paginacion, cabeceras_paginacion
+from src.controller.campos import campos_parser, leer_campos, leer_lista
+from src.controller.segundo_plano import segundo_plano_parser, leer_en_segundo_plano, respuesta_trabajo
+from src.controller.archivadas import archivadas_parser, leer_incluir_archivadas
 
 # Crear namespace para organizar los endpoints de tareas
 tareas_ns = Namespace('tareas', description='Operaciones CRUD para gestión de tareas')
@@ -51,29 +59,112 @@ success_model = tareas_ns.model('Success', {
     'tarea': fields.Nested(tarea_model, description='Datos de la tarea')
 })
 
+# Filtros y orden del listado de tareas (además de limit/after)
+filtros_parser = paginacion_parser.copy()
+filtros_parser.add_argument('tablero_id', type=int, location='args', help='Filtrar por tablero')
+filtros_parser.add_argument('fase_id', type=int, location='args', help='Filtrar por fase')
+filtros_parser.add_argument('persona_id', type=int, location='args', help='Filtrar por persona asignada')
+filtros_parser.add_argument('estado', type=str, choices=ESTADOS_TAREA, location='args',
+                            help='Filtrar por estado')
+filtros_parser.add_argument('fecha_inicio_desde', type=inputs.datetime_from_iso8601, location='args',
+                            help='fecha_inicio mayor o igual (ISO 8601)')
+filtros_parser.add_argument('fecha_inicio_hasta', type=inputs.datetime_from_iso8601, location='args',
+                            help='fecha_inicio menor o igual (ISO 8601)')
+filtros_parser.add_argument('fecha_fin_desde', type=inputs.datetime_from_iso8601, location='args',
+                            help='fecha_fin mayor o igual (ISO 8601)')
+filtros_parser.add_argument('fecha_fin_hasta', type=inputs.datetime_from_iso8601, location='args',
+                            help='fecha_fin menor o igual (ISO 8601)')
+filtros_parser.add_argument('sort', type=str, location='args',
+                            help=f'Campos de orden separados por coma, con "-" para descendente '
+                                 f'(ej: -fecha_fin). Válidos: {", ".join(COLUMNAS_ORDENABLES)}')
+
+# Relaciones a embeber en cada tarea (?include=persona,fase)
+inclusion_parser = reqparse.RequestParser()
+inclusion_parser.add_argument('include', type=str, location='args',
+                              help=f'Relaciones a incluir separadas por coma. '
+                                   f'Válidas: {", ".join(INCLUSIONES_TAREA)}')
+# Tabla de cada relación incluible, para que el ETag cambie también con ellas
+TABLAS_INCLUSION = {'persona': 'persona', 'fase': 'fase', 'tablero': 'tablero'}
+
+# Búsqueda de texto completo (además de limit/after y fields)
+busqueda_parser = paginacion_parser.copy()
+busqueda_parser.add_argument('q', type=str, required=True, location='args',
+                             help='Texto a buscar en el nombre y la descripción (la última palabra también como prefijo)')
+
+resaltado_model = tareas_ns.model('Resaltado', {
+    'nombre': fields.String(description='Nombre con los términos encontrados entre <mark></mark>'),
+    'descripcion': fields.String(description='Fragmento de la descripción con los términos entre <mark></mark>')
+})
+
+resultado_busqueda_model = tareas_ns.clone('ResultadoBusqueda', tarea_model, {
+    'relevancia': fields.Float(description='Puntaje BM25; más negativo es más relevante'),
+    'resaltado': fields.Nested(resaltado_model)
+})
+
+# Modelos para la carga masiva
+bulk_resultado_model = tareas_ns.model('BulkResultado', {
+    'indice': fields.Integer(description='Posición del elemento en el arreglo enviado'),
+    'id': fields.Integer(description='ID asignado si la tarea fue creada'),
+    'error': fields.String(description='Motivo por el que la tarea no fue creada')
+})
+
+bulk_response_model = tareas_ns.model('BulkResponse', {
+    'mensaje': fields.String(description='Mensaje de respuesta'),
+    'creadas': fields.Integer(description='Cantidad de tareas creadas'),
+    'errores': fields.Integer(description='Cantidad de elementos rechazados'),
+    'resultados': fields.List(fields.Nested(bulk_resultado_model, skip_none=True))
+})
+
+# Modelos para mover tareas en lote
+movimiento_model = tareas_ns.model('Movimiento', {
+    'id': fields.Integer(required=True, description='ID de la tarea', example=1),
+    'fase_id': fields.Integer(required=True, description='Fase destino', example=2),
+    'persona_id': fields.Integer(description='Persona asignada (opcional; null para desasignar)', example=1)
+})
+
+mover_response_model = tareas_ns.model('MoverResponse', {
+    'mensaje': fields.String(description='Mensaje de respuesta'),
+    'movidas': fields.Integer(description='Cantidad de tareas movidas'),
+    'ids': fields.List(fields.Integer, description='IDs de las tareas movidas')
+})
+
 @tareas_ns.route('/')
 class TareaList(Resource):
     @tareas_ns.doc('listar_tareas')
-    @tareas_ns.marshal_list_with(tarea_model)
-    @tareas_ns.response(200, 'Lista de tareas obtenida exitosamente')
+    @tareas_ns.expect(filtros_parser, campos_parser, inclusion_parser, archivadas_parser)
+    @etag_condicional('tarea', inclusiones=TABLAS_INCLUSION)
+    @tareas_ns.response(200, 'Lista de tareas obtenida exitosamente', [tarea_model])
+    @tareas_ns.response(400, 'Parámetros de filtro, orden, campos, inclusiones o paginación inválidos', error_model)
     @tareas_ns.response(500, 'Error interno del servidor')
     def get(self):
         """
-        Obtener todas las tareas
+        Obtener las tareas paginadas
         
-        Retorna una lista completa de todas las tareas registradas en el sistema,
-        incluyendo información de fechas, estados y asignaciones.
+        Retorna una página de tareas, opcionalmente filtradas por tablero, fase,
+        persona, estado y rangos de fechas, ordenadas según `sort` (por defecto ID).
+        Si hay más resultados, la cabecera X-Next-Cursor trae el valor a enviar
+        en `after` para obtener la siguiente página. Con `fields` se devuelven
+        solo esos campos de cada tarea; `include` agrega la persona, la fase
+        o el tablero de cada una. Con `incluir_archivadas` también se buscan
+        las tareas archivadas.
         """
+        args = filtros_parser.parse_args()
+        filtros = {campo: valor for campo, valor in args.items()
+                   if campo not in ('limit', 'after') and valor is not None}
         try:
-            tareas = session.query(Tarea).all()
-            return [tarea.to_dict() for tarea in tareas], 200
+            limit, after = leer_paginacion()
+            tareas, siguiente = Tarea.listar_tareas(limit=limit, after=after, campos=leer_campos(),
+                                                    include=leer_lista('include'),
+                                                    incluir_archivadas=leer_incluir_archivadas(), **filtros)
+            return tareas, 200, cabeceras_paginacion(siguiente)
+        except ValueError as e:
+            tareas_ns.abort(400, str(e))
         except Exception as e:
             tareas_ns.abort(500, f'Error al obtener tareas: {str(e)}')
 
     @tareas_ns.doc('crear_tarea')
     @tareas_ns.expect(tarea_input, validate=True)
-    @tareas_ns.marshal_with(success_model, code=201)
-    @tareas_ns.response(201, 'Tarea creada exitosamente')
+    @tareas_ns.response(201, 'Tarea creada exitosamente', success_model)
     @tareas_ns.response(400, 'Datos de entrada inválidos', error_model)
     @tareas_ns.response(500, 'Error interno del servidor', error_model)
     def post(self):
@@ -109,40 +200,153 @@ class TareaList(Resource):
                 except ValueError:
                     tareas_ns.abort(400, 'Formato de fecha_fin inválido. Use formato ISO 8601')
             
-            # Crear nueva tarea
-            nueva_tarea = Tarea(
+            # Crear y guardar la nueva tarea
+            nueva_tarea = Tarea.crear_tarea(
                 nombre=data['nombre'],
                 descripcion=data.get('descripcion', ''),
                 fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin,
+                fase_id=data.get('fase_id', 1),
+                persona_id=data.get('persona_id'),
+                tablero_id=data.get('tablero_id', 1),
                 estado=data.get('estado', 'pendiente')
             )
             
-            # Asignar campos requeridos
-            nueva_tarea.fase_id = data.get('fase_id', 1)
-            nueva_tarea.tablero_id = data.get('tablero_id', 1)
-            nueva_tarea.persona_id = data.get('persona_id')
-            nueva_tarea.fecha_fin = fecha_fin
-            
-            # Guardar en base de datos
-            session.add(nueva_tarea)
-            session.commit()
-            session.refresh(nueva_tarea)
-            
             return {
                 'mensaje': 'Tarea creada exitosamente',
-                'tarea': nueva_tarea.to_dict()
+                'tarea': nueva_tarea
             }, 201
             
         except Exception as e:
             session.rollback()
             tareas_ns.abort(500, f'Error al crear la tarea: {str(e)}')
 
+@tareas_ns.route('/bulk')
+class TareaBulk(Resource):
+    @tareas_ns.doc('crear_tareas_bulk')
+    @tareas_ns.expect([tarea_input], segundo_plano_parser)
+    @tareas_ns.response(201, 'Todas las tareas fueron creadas', bulk_response_model)
+    @tareas_ns.response(202, 'Carga registrada como trabajo (ver /api/v1/jobs/<id>)')
+    @tareas_ns.response(207, 'Algunas tareas fueron rechazadas (ver resultados)', bulk_response_model)
+    @tareas_ns.response(400, 'Ninguna tarea es válida o el cuerpo no es un arreglo', error_model)
+    @tareas_ns.response(500, 'Error interno del servidor', error_model)
+    def post(self):
+        """
+        Crear muchas tareas en una sola petición
+        
+        Recibe un arreglo de tareas (máximo 10000). Todas se validan antes de
+        escribir y las válidas se insertan en una única transacción con un
+        INSERT de múltiples filas. La respuesta trae, por cada elemento, el ID
+        asignado o el error encontrado.
+
+        Con ?en_segundo_plano=true acepta hasta 100000 tareas, responde 202 y
+        las inserta como trabajo en lotes de 1000, cada uno en su transacción.
+        Los resultados quedan en el trabajo.
+        """
+        data = tareas_ns.payload
+        if not isinstance(data, list) or not data:
+            tareas_ns.abort(400, 'Se espera un arreglo no vacío de tareas')
+        try:
+            en_segundo_plano = leer_en_segundo_plano()
+        except ValueError as e:
+            tareas_ns.abort(400, str(e))
+        maximo = MAX_TAREAS_BULK_EN_SEGUNDO_PLANO if en_segundo_plano else MAX_TAREAS_BULK
+        if len(data) > maximo:
+            tareas_ns.abort(400, f'Máximo {maximo} tareas por petición')
+
+        try:
+            if en_segundo_plano:
+                return respuesta_trabajo(Trabajo.crear_trabajo('crear_tareas_bulk', items=data))
+            resultados = Tarea.crear_tareas_bulk(data)
+        except Exception as e:
+            session.rollback()
+            tareas_ns.abort(500, f'Error al crear las tareas: {str(e)}')
+
+        creadas = sum(1 for r in resultados if 'id' in r)
+        respuesta = {
+            'mensaje': f'{creadas} de {len(resultados)} tareas creadas',
+            'creadas': creadas,
+            'errores': len(resultados) - creadas,
+            'resultados': resultados
+        }
+        if creadas == len(resultados):
+            return respuesta, 201
+        return respuesta, 207 if creadas else 400
+
+@tareas_ns.route('/mover')
+class TareasMover(Resource):
+    @tareas_ns.doc('mover_tareas')
+    @tareas_ns.expect([movimiento_model], segundo_plano_parser)
+    @tareas_ns.response(200, 'Tareas movidas exitosamente', mover_response_model)
+    @tareas_ns.response(202, 'Movimiento registrado como trabajo (ver /api/v1/jobs/<id>)')
+    @tareas_ns.response(400, 'Movimientos inválidos; no se modificó ninguna tarea', error_model)
+    @tareas_ns.response(500, 'Error interno del servidor', error_model)
+    def patch(self):
+        """
+        Mover varias tareas de fase en una sola operación
+        
+        Recibe un arreglo de {id, fase_id, persona_id?}. Los cambios se aplican
+        con un UPDATE por cada fase destino dentro de una única transacción:
+        si algún movimiento es inválido no se aplica ninguno.
+
+        Con ?en_segundo_plano=true responde 202 y lo ejecuta como trabajo; un
+        movimiento inválido deja el trabajo fallido con el motivo.
+        """
+        data = tareas_ns.payload
+        if not isinstance(data, list) or not data:
+            tareas_ns.abort(400, 'Se espera un arreglo no vacío de movimientos')
+
+        try:
+            if leer_en_segundo_plano():
+                return respuesta_trabajo(Trabajo.crear_trabajo('mover_tareas', movimientos=data))
+            ids = Tarea.mover_tareas(data)
+        except ValueError as e:
+            session.rollback()
+            tareas_ns.abort(400, str(e))
+        except Exception as e:
+            session.rollback()
+            tareas_ns.abort(500, f'Error al mover las tareas: {str(e)}')
+
+        return {
+            'mensaje': 'Tareas movidas exitosamente',
+            'movidas': len(ids),
+            'ids': ids
+        }, 200
+
+@tareas_ns.route('/buscar')
+class TareasBuscar(Resource):
+    @tareas_ns.doc('buscar_tareas')
+    @tareas_ns.expect(busqueda_parser, campos_parser)
+    @etag_condicional('tarea')
+    @tareas_ns.response(200, 'Tareas encontradas, de la más a la menos relevante', [resultado_busqueda_model])
+    @tareas_ns.response(400, 'Búsqueda, campos o parámetros de paginación inválidos', error_model)
+    @tareas_ns.response(500, 'Error interno del servidor')
+    def get(self):
+        """
+        Buscar tareas por texto en el nombre y la descripción
+        
+        Usa el índice de texto completo (FTS5) y ordena por relevancia (BM25),
+        con más peso para el nombre. Cada resultado trae el texto resaltado.
+        Se pagina igual que el listado, con el cursor de X-Next-Cursor.
+        """
+        args = busqueda_parser.parse_args()
+        try:
+            limit, after = leer_paginacion()
+            tareas, siguiente = buscar_tareas(args['q'], limit=limit, after=after, campos=leer_campos())
+            return tareas, 200, cabeceras_paginacion(siguiente)
+        except ValueError as e:
+            tareas_ns.abort(400, str(e))
+        except Exception as e:
+            tareas_ns.abort(500, f'Error al buscar tareas: {str(e)}')
+
 @tareas_ns.route('/<int:tarea_id>')
 @tareas_ns.param('tarea_id', 'ID único de la tarea')
 class TareaResource(Resource):
     @tareas_ns.doc('obtener_tarea')
-    @tareas_ns.marshal_with(tarea_model)
-    @tareas_ns.response(200, 'Tarea obtenida exitosamente')
+    @tareas_ns.expect(campos_parser, inclusion_parser, archivadas_parser)
+    @etag_condicional('tarea', inclusiones=TABLAS_INCLUSION)
+    @tareas_ns.response(200, 'Tarea obtenida exitosamente', tarea_model)
+    @tareas_ns.response(400, 'Valores inválidos en fields o include', error_model)
     @tareas_ns.response(404, 'Tarea no encontrada', error_model)
     @tareas_ns.response(500, 'Error interno del servidor', error_model)
     def get(self, tarea_id):
@@ -153,19 +357,21 @@ class TareaResource(Resource):
         identificada por su ID único.
         """
         try:
-            tarea = session.query(Tarea).filter_by(id=tarea_id).first()
+            tarea = Tarea.obtener_tarea_por_id(tarea_id, campos=leer_campos(), include=leer_lista('include'),
+                                               incluir_archivadas=leer_incluir_archivadas())
             if not tarea:
                 tareas_ns.abort(404, f'Tarea con ID {tarea_id} no encontrada')
             
-            return tarea.to_dict(), 200
+            return tarea, 200
             
+        except ValueError as e:
+            tareas_ns.abort(400, str(e))
         except Exception as e:
             tareas_ns.abort(500, f'Error al obtener la tarea: {str(e)}')
 
     @tareas_ns.doc('actualizar_tarea')
     @tareas_ns.expect(tarea_input, validate=True)
-    @tareas_ns.marshal_with(success_model)
-    @tareas_ns.response(200, 'Tarea actualizada exitosamente')
+    @tareas_ns.response(200, 'Tarea actualizada exitosamente', success_model)
     @tareas_ns.response(404, 'Tarea no encontrada', error_model)
     @tareas_ns.response(400, 'Datos de entrada inválidos', error_model)
     @tareas_ns.response(500, 'Error interno del servidor', error_model)
@@ -177,45 +383,33 @@ class TareaResource(Resource):
         Todos los campos en el payload reemplazarán los valores actuales.
         """
         try:
-            tarea = session.query(Tarea).filter_by(id=tarea_id).first()
-            if not tarea:
-                tareas_ns.abort(404, f'Tarea con ID {tarea_id} no encontrada')
-            
             data = tareas_ns.payload
             
-            # Actualizar campos
-            if 'nombre' in data:
-                tarea.nombre = data['nombre']
-            if 'descripcion' in data:
-                tarea.descripcion = data['descripcion']
-            if 'estado' in data:
-                tarea.estado = data['estado']
-            if 'fase_id' in data:
-                tarea.fase_id = data['fase_id']
-            if 'tablero_id' in data:
-                tarea.tablero_id = data['tablero_id']
-            if 'persona_id' in data:
-                tarea.persona_id = data['persona_id']
+            # Campos a actualizar (solo los presentes en el payload)
+            cambios = {campo: data[campo] for campo in
+                       ('nombre', 'descripcion', 'estado', 'fase_id', 'tablero_id', 'persona_id')
+                       if campo in data}
             
             # Actualizar fechas si se proporcionan
             if 'fecha_inicio' in data:
                 fecha_inicio = data['fecha_inicio']
                 if isinstance(fecha_inicio, str):
                     fecha_inicio = datetime.fromisoformat(fecha_inicio.replace('Z', '+00:00'))
-                tarea.fecha_inicio = fecha_inicio
+                cambios['fecha_inicio'] = fecha_inicio
             
             if 'fecha_fin' in data:
                 fecha_fin = data['fecha_fin']
                 if fecha_fin and isinstance(fecha_fin, str):
                     fecha_fin = datetime.fromisoformat(fecha_fin.replace('Z', '+00:00'))
-                tarea.fecha_fin = fecha_fin
+                cambios['fecha_fin'] = fecha_fin
             
-            session.commit()
-            session.refresh(tarea)
+            tarea = Tarea.modificar_tarea(tarea_id, **cambios)
+            if not tarea:
+                tareas_ns.abort(404, f'Tarea con ID {tarea_id} no encontrada')
             
             return {
                 'mensaje': 'Tarea actualizada exitosamente',
-                'tarea': tarea.to_dict()
+                'tarea': tarea
             }, 200
             
         except Exception as e:
@@ -234,35 +428,65 @@ class TareaResource(Resource):
         Esta acción no se puede deshacer.
         """
         try:
-            tarea = session.query(Tarea).filter_by(id=tarea_id).first()
-            if not tarea:
+            if not Tarea.eliminar_tarea(tarea_id):
                 tareas_ns.abort(404, f'Tarea con ID {tarea_id} no encontrada')
             
-            session.delete(tarea)
-            session.commit()
-            
             return {'mensaje': f'Tarea {tarea_id} eliminada exitosamente'}, 200
             
         except Exception as e:
             session.rollback()
             tareas_ns.abort(500, f'Error al eliminar la tarea: {str(e)}')
 
+@tareas_ns.route('/<int:tarea_id>/restaurar')
+@tareas_ns.param('tarea_id', 'ID único de la tarea archivada')
+class TareaRestaurar(Resource):
+    @tareas_ns.doc('restaurar_tarea')
+    @tareas_ns.response(200, 'Tarea restaurada exitosamente', success_model)
+    @tareas_ns.response(400, 'La tarea no se puede restaurar (tablero archivado o fase inexistente)', error_model)
+    @tareas_ns.response(404, 'La tarea no está archivada', error_model)
+    @tareas_ns.response(500, 'Error interno del servidor', error_model)
+    def post(self, tarea_id):
+        """
+        Devolver una tarea archivada a las tareas activas
+
+        Conserva su ID y sus datos; si la persona asignada ya no existe queda
+        sin asignar. Si su tablero también está archivado, hay que restaurarlo primero.
+        """
+        try:
+            tarea = Tarea.restaurar_tarea(tarea_id)
+        except ValueError as e:
+            tareas_ns.abort(400, str(e))
+        except Exception as e:
+            tareas_ns.abort(500, f'Error al restaurar la tarea: {str(e)}')
+        if not tarea:
+            tareas_ns.abort(404, f'La tarea con ID {tarea_id} no está archivada')
+        return {'mensaje': 'Tarea restaurada exitosamente', 'tarea': tarea}, 200
+
 @tareas_ns.route('/estado/<string:estado>')
 @tareas_ns.param('estado', 'Estado de las tareas a filtrar (pendiente, en_progreso, completada)')
 class TareasPorEstado(Resource):
     @tareas_ns.doc('listar_tareas_por_estado')
-    @tareas_ns.marshal_list_with(tarea_model)
-    @tareas_ns.response(200, 'Tareas filtradas por estado')
+    @tareas_ns.expect(paginacion_parser, campos_parser, inclusion_parser, archivadas_parser)
+    @etag_condicional('tarea', inclusiones=TABLAS_INCLUSION)
+    @tareas_ns.response(200, 'Tareas filtradas por estado', [tarea_model])
+    @tareas_ns.response(400, 'Estado, campos, inclusiones o parámetros de paginación inválidos', error_model)
     @tareas_ns.response(500, 'Error interno del servidor')
     def get(self, estado):
         """
         Obtener tareas filtradas por estado
         
-        Retorna todas las tareas que coincidan con el estado especificado.
+        Retorna las tareas que coincidan con el estado especificado, paginadas.
         Estados válidos: pendiente, en_progreso, completada
         """
+        if estado not in ESTADOS_TAREA:
+            tareas_ns.abort(400, f'Estado inválido. Use: {", ".join(ESTADOS_TAREA)}')
         try:
-            tareas = session.query(Tarea).filter_by(estado=estado).all()
-            return [tarea.to_dict() for tarea in tareas], 200
+            limit, after = leer_paginacion()
+            tareas, siguiente = Tarea.listar_tareas(limit=limit, after=after, estado=estado, campos=leer_campos(),
+                                                    include=leer_lista('include'),
+                                                    incluir_archivadas=leer_incluir_archivadas())
+            return tareas, 200, cabeceras_paginacion(siguiente)
+        except ValueError as e:
+            tareas_ns.abort(400, str(e))
         except Exception as e:
             tareas_ns.abort(500, f'Error al filtrar tareas: {str(e)}')
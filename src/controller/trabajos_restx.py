@@ -0,0 +1,48 @@
+from flask_restx import Namespace, Resource, fields
+from src.models.trabajos import Trabajo, ESTADOS_TRABAJO
+
+# Namespace para los trabajos en segundo plano
+trabajos_ns = Namespace(
+    'jobs',
+    description='Estado de los trabajos en segundo plano'
+)
+
+# Modelos para Swagger
+trabajo_model = trabajos_ns.model('Trabajo', {
+    'id': fields.Integer(description='ID único'),
+    'tipo': fields.String(description='Operación (purgar_tablero, purgar_persona, crear_tareas_bulk, mover_tareas)'),
+    'estado': fields.String(description='Estado del trabajo', enum=list(ESTADOS_TRABAJO)),
+    'progreso': fields.Integer(description='Elementos procesados'),
+    'total': fields.Integer(description='Elementos a procesar (si se conoce)'),
+    'resultado': fields.Raw(description='Resultado de la operación, al completarse'),
+    'error': fields.String(description='Motivo, si el trabajo falló'),
+    'fecha_creacion': fields.DateTime(description='Fecha de creación'),
+    'fecha_inicio': fields.DateTime(description='Inicio de la ejecución'),
+    'fecha_fin': fields.DateTime(description='Fin de la ejecución')
+})
+
+trabajo_response = trabajos_ns.model('TrabajoResponse', {
+    'mensaje': fields.String(description='Mensaje de respuesta'),
+    'trabajo': fields.Nested(trabajo_model)
+})
+
+@trabajos_ns.route('/<int:id>')
+@trabajos_ns.param('id', 'ID del trabajo')
+class TrabajoResource(Resource):
+    @trabajos_ns.doc('obtener_trabajo')
+    @trabajos_ns.response(200, 'Trabajo', trabajo_model)
+    @trabajos_ns.response(404, 'Trabajo no encontrado')
+    def get(self, id):
+        """
+        Obtener el estado de un trabajo
+
+        Mientras está en curso reporta progreso y total; al completarse trae el
+        resultado y, si falló, el error. Sin ETag: cambia con cada lote.
+        """
+        try:
+            trabajo = Trabajo.obtener_trabajo(id)
+        except Exception as e:
+            trabajos_ns.abort(500, f"Error interno: {str(e)}")
+        if not trabajo:
+            trabajos_ns.abort(404, "Trabajo no encontrado")
+        return trabajo, 200
@@ -1,12 +1,129 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
+import os
+from functools import partial
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session, Session
+from .pools import instrumentar_pool
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///my_project.db")
+# Réplica o misma base para las lecturas; por defecto, la misma URL abierta en solo lectura
+DATABASE_URL_LECTURA = os.environ.get("DATABASE_URL_LECTURA")
+
+# Perfil de SQLite para producción (se puede ajustar por variables de entorno)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),  # lectores no bloquean al escritor
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),  # seguro con WAL, un fsync por checkpoint
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),  # espera en vez de "database is locked"
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -64000)),  # negativo = KiB (64 MB por conexión)
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 268435456)),  # 256 MB de lectura mapeada en memoria
+    "temp_store": os.environ.get("SQLITE_TEMP_STORE", "MEMORY"),
+    "foreign_keys": "ON",  # SQLite no aplica las claves foráneas (ni ON DELETE CASCADE) sin esto
+}
+
+
+def _configurar_sqlite(pragmas, dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma, valor in pragmas.items():
+        cursor.execute(f"PRAGMA {pragma}={valor}")
+    cursor.close()
+
+
+def _es_memoria(url):
+    return make_url(url).database in (None, "", ":memory:")
+
+
+def crear_engine(url=None, solo_lectura=False, asincrono=False, **opciones):
+    """
+    Crea un engine de la aplicación.
+
+    Para SQLite aplica los PRAGMA de SQLITE_PRAGMAS en cada conexión nueva y
+    dimensiona el pool según DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT.
+    Con `solo_lectura` la base se abre con mode=ro y PRAGMA query_only.
+    Con `asincrono` retorna un AsyncEngine sobre aiosqlite con el mismo perfil.
+    """
+    url = url or DATABASE_URL
+    opciones.setdefault("pool_size", int(os.environ.get("DB_POOL_SIZE", 10)))
+    opciones.setdefault("max_overflow", int(os.environ.get("DB_MAX_OVERFLOW", 20)))
+    opciones.setdefault("pool_timeout", int(os.environ.get("DB_POOL_TIMEOUT", 30)))
+
+    es_sqlite = url.startswith("sqlite")
+    pragmas = dict(SQLITE_PRAGMAS)
+    if es_sqlite:
+        # Las conexiones del pool se comparten entre los hilos de Flask
+        opciones.setdefault("connect_args", {}).setdefault("check_same_thread", False)
+        if _es_memoria(url):
+            # Una base en memoria existe solo dentro de su conexión: no hay pool que dimensionar
+            for opcion in ("pool_size", "max_overflow", "pool_timeout"):
+                opciones.pop(opcion)
+        elif solo_lectura:
+            url = f"sqlite:///file:{make_url(url).database}?mode=ro&uri=true"
+            # El modo de journal lo fija el escritor; un lector no puede cambiarlo
+            pragmas.pop("journal_mode")
+            pragmas["query_only"] = "ON"
+
+    if asincrono:
+        if es_sqlite:
+            url = make_url(url).set(drivername="sqlite+aiosqlite")
+        nuevo_engine = create_async_engine(url, **opciones)
+        motor_sync = nuevo_engine.sync_engine
+    else:
+        nuevo_engine = motor_sync = create_engine(url, **opciones)
+    if es_sqlite:
+        event.listen(motor_sync, "connect", partial(_configurar_sqlite, pragmas))
+    return nuevo_engine
+
+
+# Un solo escritor: SQLite serializa las escrituras de todos modos, así que en
+# lugar de competir por el lock las peticiones esperan su turno en el pool.
+engine = crear_engine(pool_size=int(os.environ.get("DB_WRITE_POOL_SIZE", 1)), max_overflow=0)
+
+# Lectores en paralelo: con WAL no esperan al escritor
+if _es_memoria(DATABASE_URL):
+    engine_lectura = engine
+else:
+    engine_lectura = crear_engine(DATABASE_URL_LECTURA, solo_lectura=True)
+
+instrumentar_pool(engine, "escritura")
+if engine_lectura is not engine:
+    instrumentar_pool(engine_lectura, "lectura")
+
+
+class SesionEnrutada(Session):
+    """
+    Sesión que usa el engine de solo lectura cuando se marcó con usar_solo_lectura().
+
+    Dentro de un lote de group commit (ver escritura.py) commit() solo hace
+    flush y rollback() deshace el SAVEPOINT de la operación: el COMMIT real
+    lo hace el hilo escritor al terminar el lote.
+    """
+
+    def get_bind(self, mapper=None, **kw):
+        if self.info.get("solo_lectura"):
+            return engine_lectura
+        return super().get_bind(mapper, **kw)
+
+    def commit(self):
+        if self.info.get("grupo"):
+            self.flush()
+        else:
+            super().commit()
+
+    def rollback(self):
+        anidada = self.get_nested_transaction() if self.info.get("grupo") else None
+        if anidada is not None:
+            anidada.rollback()
+        else:
+            super().rollback()
 
-DATABASE_URL = "sqlite:///my_project.db"
-engine = create_engine(DATABASE_URL)
-conexion = engine.connect()
 
 Base = declarative_base()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=SesionEnrutada, autocommit=False, autoflush=False, bind=engine)
+
+session = scoped_session(SessionLocal)
+
 
-session = scoped_session(SessionLocal)
\ No newline at end of file
+def usar_solo_lectura():
+    """Envía todas las consultas de la sesión del hilo actual al engine de lectura."""
+    session.info["solo_lectura"] = True
@@ -0,0 +1,188 @@
+import os
+import time
+from datetime import datetime, timedelta
+from . import Base, engine
+from .purga import PURGA_PAUSA_MS
+from sqlalchemy import (Column, DateTime, Table, and_, case, delete, exists, func, insert, literal, null, select,
+                        union_all)
+from sqlalchemy.orm import aliased
+
+# Archivo frío: las tareas completadas hace más de ARCHIVO_HORIZONTE_DIAS y los
+# tableros con estado 'completado' (con todas sus tareas) se mueven a tablas
+# de archivo (tarea_archivada, tablero_archivado) en lotes de
+# ARCHIVO_TAMANO_LOTE filas por transacción. Las tablas activas, sus índices,
+# el índice de búsqueda y los resúmenes quedan solo con lo que está en uso;
+# las lecturas incluyen el archivo únicamente con ?incluir_archivadas=true.
+ARCHIVO_HORIZONTE_DIAS = int(os.environ.get("ARCHIVO_HORIZONTE_DIAS", 365))
+ARCHIVO_TAMANO_LOTE = int(os.environ.get("ARCHIVO_TAMANO_LOTE", 1000))
+
+
+def tabla_archivo(tabla, nombre, *indices):
+    """
+    Tabla de archivo con las mismas columnas que `tabla` más fecha_archivado.
+
+    No tiene claves foráneas: una tarea archivada puede apuntar a un tablero
+    archivado o a una persona que ya no existe.
+    """
+    columnas = [Column(columna.name, columna.type, primary_key=columna.primary_key, nullable=columna.nullable)
+                for columna in tabla.columns]
+    return Table(nombre, Base.metadata, *columnas,
+                 Column("fecha_archivado", DateTime, nullable=False), *indices)
+
+
+def con_archivadas(modelo, archivo):
+    """
+    Entidad equivalente a `modelo` sobre UNION ALL de su tabla y su archivo.
+
+    Sus atributos se usan igual que los del modelo (filtros, orden, relaciones),
+    así que las consultas existentes solo cambian de origen. Los ids no se
+    repiten entre ambas tablas (AUTOINCREMENT), así que el cursor sigue siendo único.
+    """
+    tabla = modelo.__table__
+    union = union_all(select(*tabla.columns),
+                      select(*[archivo.c[columna.name] for columna in tabla.columns]))
+    return aliased(modelo, union.subquery(f"{tabla.name}_con_archivo"))
+
+
+def _mover(conn, origen, destino, condicion, reemplazos=None):
+    """Copia las filas de `origen` que cumplen `condicion` a `destino` y las borra de `origen`."""
+    nombres = [columna.name for columna in destino.columns if columna.name in origen.c]
+    valores = [(reemplazos or {}).get(nombre, origen.c[nombre]) for nombre in nombres]
+    if "fecha_archivado" in destino.c and "fecha_archivado" not in origen.c:
+        nombres.append("fecha_archivado")
+        valores.append(literal(datetime.now(), DateTime))
+    conn.execute(insert(destino).from_select(nombres, select(*valores).where(condicion)))
+    return conn.execute(delete(origen).where(condicion)).rowcount
+
+
+def _mover_por_lotes(origen, destino, condicion, tamano_lote, reemplazos=None):
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            ids = conn.execute(select(origen.c.id).where(condicion).limit(tamano_lote)).scalars().all()
+            if ids:
+                total += _mover(conn, origen, destino, origen.c.id.in_(ids), reemplazos)
+        if len(ids) < tamano_lote:
+            return total
+        time.sleep(PURGA_PAUSA_MS / 1000)
+
+
+def archivar(horizonte_dias=ARCHIVO_HORIZONTE_DIAS, tamano_lote=ARCHIVO_TAMANO_LOTE):
+    """
+    Mueve al archivo las tareas completadas con fecha_fin anterior al horizonte
+    y los tableros completados con todas sus tareas. Es idempotente; cada lote
+    es una transacción corta. Retorna {'tareas', 'tableros'} movidos.
+    """
+    from .tarea_m import Tarea, tarea_archivada
+    from .tablero_m import Tablero, tablero_archivado
+
+    tarea, tablero = Tarea.__table__, Tablero.__table__
+    limite = datetime.now() - timedelta(days=horizonte_dias)
+    movidas = {"tareas": 0, "tableros": 0}
+    movidas["tareas"] += _mover_por_lotes(
+        tarea, tarea_archivada, and_(tarea.c.estado == "completada", tarea.c.fecha_fin < limite), tamano_lote)
+
+    completado = tablero.c.estado == "completado"
+    with engine.connect() as conn:
+        tableros = conn.execute(select(tablero.c.id).where(completado).order_by(tablero.c.id)).scalars().all()
+    for tablero_id in tableros:
+        de_tablero = tarea.c.tablero_id == tablero_id
+        movidas["tareas"] += _mover_por_lotes(tarea, tarea_archivada, de_tablero, tamano_lote)
+        # El tablero se archiva junto con las tareas que se hayan creado mientras
+        with engine.begin() as conn:
+            if conn.execute(select(tablero.c.id).where(tablero.c.id == tablero_id, completado)).first():
+                movidas["tareas"] += _mover(conn, tarea, tarea_archivada, de_tablero)
+                movidas["tableros"] += _mover(conn, tablero, tablero_archivado, tablero.c.id == tablero_id)
+    # Sin invalidar caches: esto corre en otro proceso (la CLI). El servidor ve
+    # que la versión de `tablero` cambió y descarta sus entradas (ver CacheLRU)
+    return movidas
+
+
+def _reemplazos_tarea():
+    # La persona pudo haberse eliminado mientras la tarea estaba archivada
+    from .tarea_m import tarea_archivada
+    from .persona_m import Persona
+
+    persona_existe = exists().where(Persona.id == tarea_archivada.c.persona_id)
+    return {"persona_id": case((persona_existe, tarea_archivada.c.persona_id), else_=null())}
+
+
+def restaurar_tablero(tablero_id, tamano_lote=ARCHIVO_TAMANO_LOTE):
+    """
+    Devuelve un tablero archivado y sus tareas a las tablas activas.
+
+    El tablero vuelve como 'activo' (si no, el próximo archivado lo movería de
+    nuevo). Las tareas cuya fase ya no existe quedan en el archivo. Retorna
+    {'tablero_id', 'tareas', 'pendientes'} o None si no está archivado.
+    """
+    from .tarea_m import Tarea, tarea_archivada
+    from .tablero_m import Tablero, tablero_archivado
+    from .fase_m import Fase
+
+    with engine.begin() as conn:
+        restaurado = _mover(conn, tablero_archivado, Tablero.__table__, tablero_archivado.c.id == tablero_id,
+                            {"estado": literal("activo")})
+    if not restaurado:
+        return None
+
+    fase_existe = exists().where(Fase.id == tarea_archivada.c.fase_id)
+    tareas = _mover_por_lotes(tarea_archivada, Tarea.__table__,
+                              and_(tarea_archivada.c.tablero_id == tablero_id, fase_existe),
+                              tamano_lote, _reemplazos_tarea())
+    with engine.connect() as conn:
+        pendientes = conn.execute(select(func.count()).select_from(tarea_archivada)
+                                  .where(tarea_archivada.c.tablero_id == tablero_id)).scalar()
+    return {"tablero_id": tablero_id, "tareas": tareas, "pendientes": pendientes}
+
+
+def restaurar_tarea(tarea_id):
+    """
+    Devuelve una tarea archivada a la tabla activa. Retorna False si no está
+    archivada; ValueError si su tablero está archivado o su fase ya no existe.
+    """
+    from .tarea_m import Tarea, tarea_archivada
+    from .tablero_m import Tablero
+    from .fase_m import Fase
+
+    with engine.begin() as conn:
+        tarea = conn.execute(select(tarea_archivada).where(tarea_archivada.c.id == tarea_id)).first()
+        if not tarea:
+            return False
+        if not conn.execute(select(Tablero.id).where(Tablero.id == tarea.tablero_id)).first():
+            raise ValueError(f"El tablero {tarea.tablero_id} de la tarea no está activo; restaure primero el tablero")
+        if not conn.execute(select(Fase.id).where(Fase.id == tarea.fase_id)).first():
+            raise ValueError(f"La fase {tarea.fase_id} de la tarea ya no existe")
+        _mover(conn, tarea_archivada, Tarea.__table__, tarea_archivada.c.id == tarea_id, _reemplazos_tarea())
+    return True
+
+
+if __name__ == "__main__":
+    # Archivado y restauración en una base existente (p. ej. desde cron):
+    #   python -m src.models.archivo archivar [--dias 365]
+    #   python -m src.models.archivo restaurar --tablero 3
+    #   python -m src.models.archivo restaurar --tarea 120
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Archivo de tareas y tableros terminados")
+    parser.add_argument("accion", choices=("archivar", "restaurar"))
+    parser.add_argument("--dias", type=int, default=ARCHIVO_HORIZONTE_DIAS,
+                        help="Horizonte: se archivan las tareas completadas que terminaron hace más días")
+    parser.add_argument("--tablero", type=int, help="Tablero a restaurar")
+    parser.add_argument("--tarea", type=int, help="Tarea a restaurar")
+    args = parser.parse_args()
+
+    if args.accion == "archivar":
+        movidas = archivar(args.dias)
+        print(f"Archivadas: {movidas['tareas']} tareas y {movidas['tableros']} tableros")
+    elif args.tablero is not None:
+        resultado = restaurar_tablero(args.tablero)
+        if resultado is None:
+            parser.exit(1, f"El tablero {args.tablero} no está archivado\n")
+        print(f"Tablero {args.tablero} restaurado con {resultado['tareas']} tareas "
+              f"({resultado['pendientes']} siguen archivadas)")
+    elif args.tarea is not None:
+        if not restaurar_tarea(args.tarea):
+            parser.exit(1, f"La tarea {args.tarea} no está archivada\n")
+        print(f"Tarea {args.tarea} restaurada")
+    else:
+        parser.error("restaurar requiere --tablero o --tarea")
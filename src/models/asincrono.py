@@ -0,0 +1,21 @@
+import os
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from . import DATABASE_URL, DATABASE_URL_LECTURA, crear_engine, _es_memoria
+
+# Engines asíncronos (aiosqlite) para la API ASGI. Usan el mismo perfil de SQLite
+# y la misma separación que la app Flask: un único escritor y lectores en
+# paralelo sobre la base abierta en solo lectura. Una petición que espera a la
+# base no ocupa un hilo, así que miles de clientes haciendo polling caben en
+# un solo proceso.
+engine_async = crear_engine(asincrono=True,
+                            pool_size=int(os.environ.get("DB_WRITE_POOL_SIZE", 1)), max_overflow=0)
+
+if _es_memoria(DATABASE_URL):
+    engine_async_lectura = engine_async
+else:
+    engine_async_lectura = crear_engine(DATABASE_URL_LECTURA, solo_lectura=True, asincrono=True)
+
+# expire_on_commit=False: los objetos se siguen pudiendo serializar después del
+# commit sin volver a consultar (en async no hay carga perezosa implícita).
+SesionAsyncEscritura = async_sessionmaker(engine_async, autoflush=False, expire_on_commit=False)
+SesionAsyncLectura = async_sessionmaker(engine_async_lectura, autoflush=False, expire_on_commit=False)
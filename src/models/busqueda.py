@@ -0,0 +1,135 @@
+import re
+from . import session
+from .paginacion import preparar_pagina, cortar_pagina, columnas_con_orden, LIMITE_POR_DEFECTO
+from .serializacion import elegir_campos
+from sqlalchemy import Float, Integer, String, column, func, literal_column, select, table, text
+
+# Búsqueda de texto completo sobre tarea.nombre y tarea.descripcion con FTS5.
+# tarea_fts es una tabla de contenido externo: guarda solo el índice y lee el
+# texto de `tarea` por rowid (= tarea.id). Triggers de SQLite la mantienen al
+# día, así que cubre cualquier ruta de escritura (ORM, carga masiva, SQL directo).
+TABLA_FTS = "tarea_fts"
+
+# Marcas alrededor de los términos encontrados en el texto resaltado
+MARCA_INICIO, MARCA_FIN = "<mark>", "</mark>"
+# Cantidad de palabras del fragmento de la descripción
+PALABRAS_FRAGMENTO = 12
+# Pesos de BM25 por columna: una coincidencia en el nombre vale más que en la descripción
+PESO_NOMBRE, PESO_DESCRIPCION = 10.0, 1.0
+
+_fts = table(TABLA_FTS, column("rowid", Integer))
+
+_TRIGGERS = {
+    "ai": f"AFTER INSERT ON tarea BEGIN "
+          f"INSERT INTO {TABLA_FTS}(rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion); "
+          f"END",
+    "ad": f"AFTER DELETE ON tarea BEGIN "
+          f"INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, nombre, descripcion) "
+          f"VALUES ('delete', old.id, old.nombre, old.descripcion); "
+          f"END",
+    # Mover una tarea de fase o reasignarla no toca el índice
+    "au": f"AFTER UPDATE OF nombre, descripcion ON tarea BEGIN "
+          f"INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, nombre, descripcion) "
+          f"VALUES ('delete', old.id, old.nombre, old.descripcion); "
+          f"INSERT INTO {TABLA_FTS}(rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion); "
+          f"END",
+}
+
+
+def instalar_busqueda(engine):
+    """
+    Crea (si no existen) la tabla FTS5 y los triggers que la sincronizan.
+
+    Si la tabla es nueva se indexan las tareas que ya existan, así una base
+    anterior (p. ej. my_project.db) queda lista al primer arranque.
+    """
+    with engine.begin() as conn:
+        existe = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = :nombre"),
+                              {"nombre": TABLA_FTS}).first()
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_FTS} USING fts5("
+            f"nombre, descripcion, content='tarea', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        ))
+        for sufijo, cuerpo in _TRIGGERS.items():
+            conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS trg_{TABLA_FTS}_{sufijo} {cuerpo}"))
+        # `rank` queda configurado como BM25 con los pesos de cada columna. Solo se
+        # escribe si cambió: cambiar la configuración hace fallar la siguiente
+        # consulta de cada conexión ya abierta a la tabla ("SQL logic error")
+        rank = f"bm25({PESO_NOMBRE}, {PESO_DESCRIPCION})"
+        if conn.execute(text(f"SELECT v FROM {TABLA_FTS}_config WHERE k = 'rank'")).scalar() != rank:
+            conn.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}, rank) VALUES ('rank', :rank)"),
+                         {"rank": rank})
+        if not existe:
+            conn.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('rebuild')"))
+
+
+def reconstruir_busqueda(engine):
+    """Vuelve a indexar todas las tareas (reparación) y compacta el índice."""
+    instalar_busqueda(engine)
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('rebuild')"))
+        conn.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('optimize')"))
+        return conn.execute(text(f"SELECT count(*) FROM {TABLA_FTS}")).scalar()
+
+
+def consulta_fts(q):
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura.
+
+    Cada palabra se busca como término literal (sin operadores ni sintaxis de
+    FTS5) y la última también como prefijo, para buscar mientras se escribe.
+    Lanza ValueError si no queda ninguna palabra.
+    """
+    palabras = re.findall(r"\w+", q or "")
+    if not palabras:
+        raise ValueError("El parámetro 'q' debe contener al menos una palabra")
+    terminos = [f'"{palabra}"' for palabra in palabras]
+    terminos[-1] += "*"
+    return " ".join(terminos)
+
+
+def buscar_tareas(q, limit=None, after=None, campos=None):
+    """
+    Tareas que coinciden con `q`, de la más a la menos relevante (BM25).
+
+    Cada resultado trae los campos de la tarea, `relevancia` (puntaje BM25 de
+    FTS5: más negativo es más relevante) y `resaltado`, con el nombre completo
+    y un fragmento de la descripción con los términos entre <mark></mark>.
+    Pagina por cursor sobre (relevancia, id). Retorna (resultados, siguiente).
+    """
+    from .tarea_m import Tarea, serializar_tarea
+
+    serializar = elegir_campos(serializar_tarea, campos)
+    fts = literal_column(TABLA_FTS)
+    coincidencias = (
+        select(_fts.c.rowid.label("tarea_id"),
+               literal_column("rank", Float).label("relevancia"),
+               func.highlight(fts, 0, MARCA_INICIO, MARCA_FIN, type_=String).label("nombre_resaltado"),
+               func.snippet(fts, 1, MARCA_INICIO, MARCA_FIN, "…", PALABRAS_FRAGMENTO,
+                            type_=String).label("descripcion_resaltada"))
+        .where(fts.op("MATCH")(consulta_fts(q)))
+        .subquery("coincidencias")
+    )
+    orden = [(coincidencias.c.relevancia, False), (Tarea.id, False)]
+    consulta = (select(*columnas_con_orden(serializar.columnas, orden),
+                       coincidencias.c.nombre_resaltado, coincidencias.c.descripcion_resaltada)
+                .join(coincidencias, coincidencias.c.tarea_id == Tarea.id))
+    limit = limit or LIMITE_POR_DEFECTO
+    filas = session.execute(preparar_pagina(consulta, orden, limit, after)).all()
+    filas, siguiente = cortar_pagina(filas, orden, limit)
+
+    resultados = []
+    for fila in filas:
+        datos = serializar(fila)
+        datos["relevancia"] = fila.relevancia
+        datos["resaltado"] = {"nombre": fila.nombre_resaltado, "descripcion": fila.descripcion_resaltada}
+        resultados.append(datos)
+    return resultados, siguiente
+
+
+if __name__ == "__main__":
+    # Reconstrucción del índice para una base existente:
+    #   python -m src.models.busqueda
+    from . import engine
+    print(f"Índice de búsqueda reconstruido: {reconstruir_busqueda(engine)} tareas")
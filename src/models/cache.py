@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Registro de todos los caches creados, para exponer sus estadísticas
+CACHES = {}
+
+# Los caches con `tabla` consultan version_tabla a lo sumo una vez por este
+# intervalo, salvo que la petición ya haya leído la versión para su ETag
+CACHE_INTERVALO_VERSION_S = float(os.environ.get("CACHE_INTERVALO_VERSION_S", 1))
+
+_SIN_VALOR = object()
+
+
+class CacheLRU:
+    """
+    Cache en memoria del proceso con tamaño máximo (LRU) y tiempo de vida (TTL).
+
+    Pensado para datos de referencia que cambian poco (fases, tableros). Los
+    valores guardados se comparten entre peticiones, así que no deben modificarse.
+
+    Las escrituras del proceso invalidan lo afectado. Con `tabla`, además, cada
+    entrada guarda la versión de esa tabla en version_tabla (ver versiones.py)
+    leída antes de calcularla, y solo se usa mientras la versión no cambie: así
+    caducan también las escrituras de otros procesos (la API ASGI, la CLI del
+    archivo, SQL directo) y una entrada calculada mientras se confirmaba una
+    escritura. Un acierto no consulta la base: se usa la versión que ya leyó el
+    ETag de la petición o, si no hay, la última consultada, que se renueva cada
+    `intervalo_version` segundos y después de cada invalidación.
+    """
+
+    def __init__(self, nombre, max_elementos=256, ttl=300, tabla=None,
+                 intervalo_version=CACHE_INTERVALO_VERSION_S):
+        self.nombre = nombre
+        self.max_elementos = max_elementos
+        self.ttl = ttl
+        self.tabla = tabla
+        self.intervalo_version = intervalo_version
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_leida = None  # time.monotonic() de la última consulta
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        CACHES[nombre] = self
+
+    def obtener(self, clave, version=None):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                valor, expira, version_entrada = entrada
+                if expira > time.monotonic() and version_entrada == version:
+                    self._datos.move_to_end(clave)
+                    self.aciertos += 1
+                    return valor
+                del self._datos[clave]
+            self.fallos += 1
+            return _SIN_VALOR
+
+    def guardar(self, clave, valor, version=None):
+        with self._lock:
+            self._datos[clave] = (valor, time.monotonic() + self.ttl, version)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_elementos:
+                self._datos.popitem(last=False)
+
+    def obtener_o_calcular(self, clave, calcular):
+        """Retorna el valor en cache o lo calcula con `calcular()` y lo guarda."""
+        version = self.version_actual()
+        valor = self.obtener(clave, version)
+        if valor is _SIN_VALOR:
+            valor = calcular()
+            self.guardar(clave, valor, version)
+        return valor
+
+    def version_actual(self):
+        """Versión de `tabla` con que se validan las entradas (None si el cache no la sigue)."""
+        if self.tabla is None:
+            return None
+        from .versiones import obtener_versiones, versiones_leidas
+
+        version = versiones_leidas().get(self.tabla)
+        if version is not None:
+            return version
+        with self._lock:
+            if self._version_leida is not None and time.monotonic() - self._version_leida < self.intervalo_version:
+                return self._version
+        version = obtener_versiones(self.tabla)[self.tabla]
+        with self._lock:
+            self._version, self._version_leida = version, time.monotonic()
+        return version
+
+    def invalidar(self, *claves):
+        with self._lock:
+            self._version_leida = None
+            for clave in claves:
+                if self._datos.pop(clave, None) is not None:
+                    self.invalidaciones += 1
+
+    def invalidar_si(self, condicion):
+        """Elimina todas las entradas cuya clave cumpla `condicion(clave)`."""
+        with self._lock:
+            self._version_leida = None
+            for clave in [c for c in self._datos if condicion(c)]:
+                del self._datos[clave]
+                self.invalidaciones += 1
+
+    def limpiar(self):
+        with self._lock:
+            self._version_leida = None
+            self.invalidaciones += len(self._datos)
+            self._datos.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "nombre": self.nombre,
+                "elementos": len(self._datos),
+                "max_elementos": self.max_elementos,
+                "ttl": self.ttl,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "invalidaciones": self.invalidaciones,
+                "tasa_aciertos": round(self.aciertos / total, 4) if total else None,
+            }
+
+
+def estadisticas_caches():
+    return {nombre: cache.estadisticas() for nombre, cache in CACHES.items()}
@@ -0,0 +1,185 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from . import Base, session
+from .paginacion import LIMITE_POR_DEFECTO
+from sqlalchemy import Column, Integer, String, DateTime, case, delete, func, select, text
+from sqlalchemy.orm import aliased
+
+# Registro de cambios para la sincronización incremental de los clientes. Cada
+# INSERT/UPDATE/DELETE de tarea, tablero, fase y persona agrega una fila a
+# `cambio` con un número de secuencia creciente. Lo hacen triggers de SQLite,
+# igual que version_tabla y los resúmenes: la fila se escribe en la misma
+# transacción que el cambio y cubre todas las rutas de escritura (ORM, carga
+# masiva, cascadas, purgas, archivo). GET /api/v1/cambios?desde=<seq> devuelve
+# el último estado de cada registro que cambió después de `desde`, así que
+# sondear cuesta según lo que cambió y no según el tamaño de la base.
+TABLAS_CAMBIOS = ("tarea", "tablero", "fase", "persona")
+OPERACIONES = {"INSERT": "creado", "UPDATE": "actualizado", "DELETE": "eliminado"}
+# Los cambios más viejos que esto se borran; un cliente que pida desde antes
+# recibe 410 y debe volver a sincronizar todo
+CAMBIOS_RETENCION_DIAS = int(os.environ.get("CAMBIOS_RETENCION_DIAS", 7))
+CAMBIOS_INTERVALO_TRUNCADO_MIN = float(os.environ.get("CAMBIOS_INTERVALO_TRUNCADO_MIN", 60))
+CAMBIOS_TAMANO_LOTE = int(os.environ.get("CAMBIOS_TAMANO_LOTE", 5000))
+
+logger = logging.getLogger(__name__)
+
+
+class CambiosTruncados(Exception):
+    """El registro ya no tiene los cambios posteriores a `desde`."""
+
+
+class Cambio(Base):
+    __tablename__ = "cambio"
+    # AUTOINCREMENT: la secuencia nunca retrocede, ni siquiera al truncar
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = Column(Integer, primary_key=True)
+    tabla = Column(String, nullable=False)
+    registro_id = Column(Integer, nullable=False)
+    operacion = Column(String, nullable=False)
+    fecha = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<Cambio(seq={self.seq}, tabla='{self.tabla}', registro_id={self.registro_id}, operacion='{self.operacion}')>"
+
+
+def instalar_cambios(engine):
+    """Crea (si no existen) los triggers que alimentan el registro de cambios."""
+    with engine.begin() as conn:
+        for tabla in TABLAS_CAMBIOS:
+            for operacion, nombre in OPERACIONES.items():
+                fila = "old" if operacion == "DELETE" else "new"
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS trg_cambio_{tabla}_{operacion.lower()} "
+                    f"AFTER {operacion} ON {tabla} BEGIN "
+                    f"INSERT INTO cambio (tabla, registro_id, operacion, fecha) "
+                    f"VALUES ('{tabla}', {fila}.id, '{nombre}', datetime('now', 'localtime')); "
+                    f"END"
+                ))
+
+
+def _modelos():
+    from .tarea_m import Tarea, serializar_tarea
+    from .tablero_m import Tablero, serializar_tablero
+    from .fase_m import Fase, serializar_fase
+    from .persona_m import Persona, serializar_persona
+
+    return {"tarea": (Tarea, serializar_tarea), "tablero": (Tablero, serializar_tablero),
+            "fase": (Fase, serializar_fase), "persona": (Persona, serializar_persona)}
+
+
+def ultimo_seq():
+    """Secuencia del último cambio registrado (0 si no hubo ninguno)."""
+    return session.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'cambio'")).scalar() or 0
+
+
+def obtener_cambios(desde=None, limit=None):
+    """
+    Cambios posteriores a la secuencia `desde`, compactados por registro.
+
+    Cada registro aparece una vez, con la secuencia de su último cambio y, si
+    no fue eliminado, sus datos actuales. `operacion` es 'eliminado' si el
+    último cambio fue una baja, 'creado' si el registro se creó después de
+    `desde` y 'actualizado' en otro caso. Los registros salen en el orden de
+    su último cambio: `siguiente` es el `desde` de la próxima consulta.
+
+    Sin `desde` no retorna cambios, solo la secuencia actual (para empezar
+    a sincronizar). Lanza CambiosTruncados si `desde` es anterior a lo que
+    conserva el registro. Retorna {'cambios', 'siguiente', 'hay_mas'}.
+    """
+    if desde is None:
+        return {"cambios": [], "siguiente": ultimo_seq(), "hay_mas": False}
+    primero = session.execute(select(func.min(Cambio.seq))).scalar()
+    if primero is None:
+        primero = ultimo_seq() + 1
+    if desde < primero - 1:
+        raise CambiosTruncados(f"El registro de cambios empieza en {primero}; "
+                               f"vuelva a sincronizar todo y use desde={ultimo_seq()}")
+
+    limit = limit or LIMITE_POR_DEFECTO
+    # Un GROUP BY sobre el rango seq > desde de la clave primaria: recorre solo
+    # los cambios nuevos. El primero y el último de cada registro dan la operación.
+    registros = (select(Cambio.tabla, Cambio.registro_id,
+                        func.min(Cambio.seq).label("primero"), func.max(Cambio.seq).label("ultimo"))
+                 .where(Cambio.seq > desde)
+                 .group_by(Cambio.tabla, Cambio.registro_id)
+                 .order_by(func.max(Cambio.seq))
+                 .limit(limit + 1)
+                 .subquery("registros"))
+    primer_cambio, ultimo_cambio = aliased(Cambio), aliased(Cambio)
+    operacion = case((ultimo_cambio.operacion == "eliminado", "eliminado"),
+                     (primer_cambio.operacion == "creado", "creado"),
+                     else_="actualizado")
+    filas = session.execute(
+        select(registros.c.tabla, registros.c.registro_id, registros.c.ultimo, operacion.label("operacion"))
+        .join(primer_cambio, primer_cambio.seq == registros.c.primero)
+        .join(ultimo_cambio, ultimo_cambio.seq == registros.c.ultimo)
+        .order_by(registros.c.ultimo)
+    ).all()
+    hay_mas = len(filas) > limit
+    filas = filas[:limit]
+
+    # Los datos actuales, con una consulta por tabla
+    datos = {}
+    modelos = _modelos()
+    for tabla in {fila.tabla for fila in filas if fila.operacion != "eliminado"}:
+        modelo, serializar = modelos[tabla]
+        ids = [fila.registro_id for fila in filas if fila.tabla == tabla and fila.operacion != "eliminado"]
+        for registro in session.execute(select(*serializar.columnas).where(modelo.id.in_(ids))):
+            datos[(tabla, registro.id)] = serializar(registro)
+
+    cambios = [{"seq": fila.ultimo, "tabla": fila.tabla, "id": fila.registro_id, "operacion": fila.operacion,
+                "datos": datos.get((fila.tabla, fila.registro_id))}
+               for fila in filas]
+    siguiente = filas[-1].ultimo if filas else max(desde, ultimo_seq())
+    return {"cambios": cambios, "siguiente": siguiente, "hay_mas": hay_mas}
+
+
+def truncar_cambios(engine, retencion_dias=CAMBIOS_RETENCION_DIAS, tamano_lote=CAMBIOS_TAMANO_LOTE):
+    """
+    Borra los cambios de más de `retencion_dias` días, de a `tamano_lote` por
+    transacción. Retorna la cantidad borrada.
+    """
+    limite = datetime.now() - timedelta(days=retencion_dias)
+    lote = (select(Cambio.seq).where(Cambio.fecha < limite)
+            .order_by(Cambio.seq).limit(tamano_lote).scalar_subquery())
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            borrados = conn.execute(delete(Cambio).where(Cambio.seq.in_(lote))).rowcount
+        total += borrados
+        if borrados < tamano_lote:
+            return total
+
+
+def iniciar_truncado_cambios(engine, intervalo_min=CAMBIOS_INTERVALO_TRUNCADO_MIN):
+    """Trunca el registro al arrancar y luego cada `intervalo_min` minutos en un hilo aparte."""
+    truncar_cambios(engine)
+
+    def bucle():
+        while True:
+            time.sleep(intervalo_min * 60)
+            try:
+                truncar_cambios(engine)
+            except Exception:
+                logger.exception("Error al truncar el registro de cambios")
+
+    hilo = threading.Thread(target=bucle, name="truncado-cambios", daemon=True)
+    hilo.start()
+    return hilo
+
+
+if __name__ == "__main__":
+    # Truncado manual (p. ej. desde cron):
+    #   python -m src.models.cambios [--dias 7]
+    import argparse
+    from . import engine
+
+    parser = argparse.ArgumentParser(description="Truncado del registro de cambios")
+    parser.add_argument("--dias", type=int, default=CAMBIOS_RETENCION_DIAS,
+                        help="Se borran los cambios de hace más días")
+    args = parser.parse_args()
+    print(f"Cambios borrados: {truncar_cambios(engine, args.dias)}")
@@ -0,0 +1,174 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+from sqlalchemy import event
+from . import session, SesionEnrutada
+
+# Group commit: las escrituras concurrentes se encolan a un hilo escritor que
+# las agrupa en una sola transacción cada pocos milisegundos. SQLite paga un
+# fsync por transacción, así que el throughput pasa a depender del tamaño del
+# lote y no de la latencia del disco. Se activa con GROUP_COMMIT=1.
+GROUP_COMMIT = os.environ.get("GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_VENTANA_MS = float(os.environ.get("GROUP_COMMIT_VENTANA_MS", 2))
+GROUP_COMMIT_MAX_LOTE = int(os.environ.get("GROUP_COMMIT_MAX_LOTE", 256))
+
+_coalescedor = None
+
+
+class CoalescedorEscrituras:
+    """
+    Hilo escritor que ejecuta las operaciones encoladas en lotes.
+
+    Cada operación corre dentro de su propio SAVEPOINT: si falla se deshace
+    solo ella y su error se reporta a quien la envió; las demás del lote se
+    confirman juntas con un único COMMIT.
+    """
+
+    def __init__(self, ventana_ms=GROUP_COMMIT_VENTANA_MS, max_lote=GROUP_COMMIT_MAX_LOTE):
+        self.ventana = ventana_ms / 1000
+        self.max_lote = max_lote
+        self._cola = queue.Queue()
+        self.hilo = threading.Thread(target=self._bucle, name="group-commit", daemon=True)
+        self.lotes = 0
+        self.operaciones = 0
+
+    def iniciar(self):
+        self.hilo.start()
+
+    def enviar(self, funcion, *args, **kwargs):
+        """Encola la operación y espera su resultado (o re-lanza su excepción)."""
+        futuro = Future()
+        self._cola.put((funcion, args, kwargs, futuro))
+        return futuro.result()
+
+    def _bucle(self):
+        while True:
+            lote = [self._cola.get()]
+            limite = time.monotonic() + self.ventana
+            while len(lote) < self.max_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self._cola.get(timeout=restante))
+                except queue.Empty:
+                    break
+            self._procesar(lote)
+
+    def _procesar(self, lote):
+        sesion = session()
+        sesion.info["grupo"] = True
+        resultados = []
+        try:
+            conexion = sesion.connection()
+            if conexion.dialect.name == "sqlite":
+                # pysqlite no abre una transacción antes de un SAVEPOINT: SQLite
+                # abriría una por operación y el RELEASE la confirmaría, con un
+                # fsync cada una. Se abre una sola para todo el lote.
+                conexion.exec_driver_sql("BEGIN IMMEDIATE")
+            for funcion, args, kwargs, futuro in lote:
+                punto = sesion.begin_nested()
+                # Las acciones al_confirmar de una operación deshecha no deben ejecutarse
+                pendientes = len(sesion.info.get("al_confirmar", []))
+                try:
+                    resultado = funcion(*args, **kwargs)
+                    if punto.is_active:
+                        punto.commit()
+                    resultados.append((futuro, resultado, None))
+                except Exception as e:
+                    # Se deshace el SAVEPOINT aunque un error en el flush ya lo haya
+                    # desactivado; si no, la sesión no sirve para el resto del lote
+                    while sesion.in_nested_transaction():
+                        sesion.rollback()
+                    del sesion.info.get("al_confirmar", [])[pendientes:]
+                    resultados.append((futuro, None, e))
+            sesion.info["grupo"] = False
+            sesion.commit()
+        except Exception as e:
+            # Nada del lote se confirmó: todas las operaciones fallan con este error
+            sesion.info["grupo"] = False
+            sesion.rollback()
+            for _, _, _, futuro in lote:
+                futuro.set_exception(e)
+            return
+        finally:
+            session.remove()
+
+        self.lotes += 1
+        self.operaciones += len(lote)
+        for futuro, resultado, error in resultados:
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+
+    def estadisticas(self):
+        return {
+            "lotes": self.lotes,
+            "operaciones": self.operaciones,
+            "promedio_por_lote": round(self.operaciones / self.lotes, 2) if self.lotes else None,
+            "pendientes": self._cola.qsize(),
+        }
+
+
+def iniciar_group_commit(ventana_ms=GROUP_COMMIT_VENTANA_MS, max_lote=GROUP_COMMIT_MAX_LOTE):
+    global _coalescedor
+    if _coalescedor is None:
+        _coalescedor = CoalescedorEscrituras(ventana_ms, max_lote)
+        _coalescedor.iniciar()
+    return _coalescedor
+
+
+def group_commit_activo():
+    return _coalescedor is not None
+
+
+def estadisticas_group_commit():
+    if _coalescedor is None:
+        return {"activo": False}
+    return {"activo": True, **_coalescedor.estadisticas()}
+
+
+def escritura(funcion):
+    """
+    Marca un método de escritura de un modelo.
+
+    Con group commit activo la llamada se ejecuta en el hilo escritor y se
+    espera su resultado; sin él (o si ya se está en el hilo escritor) se
+    ejecuta directamente, como siempre.
+    """
+    @wraps(funcion)
+    def wrapper(*args, **kwargs):
+        if _coalescedor is None or threading.current_thread() is _coalescedor.hilo:
+            return funcion(*args, **kwargs)
+        return _coalescedor.enviar(funcion, *args, **kwargs)
+    return wrapper
+
+
+def al_confirmar(accion):
+    """
+    Ejecuta `accion` cuando la transacción actual se confirme de verdad.
+
+    Debe registrarse antes de session.commit(). En modo group commit el COMMIT
+    real ocurre al final del lote, así que efectos como invalidar un cache no
+    deben adelantarse a él. Si la transacción (o el SAVEPOINT de la operación,
+    en group commit) se deshace, la acción se descarta.
+    """
+    session.info.setdefault("al_confirmar", []).append(accion)
+
+
+@event.listens_for(SesionEnrutada, "after_commit")
+def _ejecutar_al_confirmar(sesion):
+    for accion in sesion.info.pop("al_confirmar", []):
+        accion()
+
+
+@event.listens_for(SesionEnrutada, "after_soft_rollback")
+def _descartar_al_confirmar(sesion, transaccion):
+    # Solo al deshacer la transacción exterior. Al deshacer un SAVEPOINT del
+    # lote, _procesar descarta solo las acciones de la operación fallida.
+    if transaccion.parent is None:
+        sesion.info.pop("al_confirmar", None)
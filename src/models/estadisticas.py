@@ -0,0 +1,307 @@
+from datetime import date, datetime, time
+from . import Base, session
+from sqlalchemy import Column, Integer, String, and_, func, select, text
+
+# Resúmenes de tareas que se leen sin recorrer las tareas. Cada fila cuenta
+# las tareas de un grupo (un tablero o una persona) que comparten el valor de
+# una dimensión; la dimensión `vence` guarda, por día de fecha_fin (días desde
+# 1970-01-01), las tareas no completadas, y sirve para contar las vencidas.
+# Los mantienen triggers de SQLite en cada INSERT/UPDATE/DELETE de tarea, igual
+# que version_tabla y tarea_fts: el conteo cambia en la misma transacción que
+# la tarea y cubre todas las rutas de escritura (alta, edición, baja, carga
+# masiva y mover).
+SIN_ASIGNAR = 0
+ESTADO_COMPLETADA = "completada"
+
+_EPOCA = date(1970, 1, 1)
+
+
+def _dia(fila):
+    return f"CAST(strftime('%s', {fila}.fecha_fin) AS INTEGER) / 86400"
+
+
+def _pendiente(fila):
+    return f"{fila}.estado != '{ESTADO_COMPLETADA}'"
+
+
+class ResumenTablero(Base):
+    """Por tablero: tareas por fase, por persona (0 = sin asignar) y pendientes por día de vencimiento."""
+    __tablename__ = "resumen_tablero"
+
+    tablero_id = Column(Integer, primary_key=True)
+    dimension = Column(String, primary_key=True)
+    clave = Column(Integer, primary_key=True)
+    cantidad = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (f"<ResumenTablero(tablero_id={self.tablero_id}, dimension='{self.dimension}', "
+                f"clave={self.clave}, cantidad={self.cantidad})>")
+
+
+class ResumenPersona(Base):
+    """Por persona: tareas asignadas, abiertas (no completadas) y pendientes por día de vencimiento."""
+    __tablename__ = "resumen_persona"
+
+    persona_id = Column(Integer, primary_key=True)
+    dimension = Column(String, primary_key=True)
+    clave = Column(Integer, primary_key=True)
+    cantidad = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (f"<ResumenPersona(persona_id={self.persona_id}, dimension='{self.dimension}', "
+                f"clave={self.clave}, cantidad={self.cantidad})>")
+
+
+class Resumen:
+    """
+    Definición de un resumen: la tabla, la columna de tarea que agrupa y las
+    dimensiones. `dimensiones(fila)` retorna (dimensión, expresión de la clave,
+    condición) en SQL para la fila `new`/`old` de un trigger o para `tarea`.
+    `columnas` son las columnas de tarea cuyo UPDATE puede mover un conteo.
+    """
+
+    def __init__(self, modelo, grupo, dimensiones, columnas):
+        self.tabla = modelo.__tablename__
+        self.grupo = grupo
+        self.dimensiones = dimensiones
+        self.columnas = columnas
+
+    def _sumar(self, fila):
+        return " ".join(
+            f"INSERT INTO {self.tabla} ({self.grupo}, dimension, clave, cantidad) "
+            f"SELECT {fila}.{self.grupo}, '{dimension}', {clave}, 1 WHERE {condicion} "
+            f"ON CONFLICT ({self.grupo}, dimension, clave) DO UPDATE SET cantidad = cantidad + 1;"
+            for dimension, clave, condicion in self.dimensiones(fila)
+        )
+
+    def _restar(self, fila):
+        return " ".join(
+            f"UPDATE {self.tabla} SET cantidad = cantidad - 1 "
+            f"WHERE {self.grupo} = {fila}.{self.grupo} AND dimension = '{dimension}' AND clave = {clave} "
+            f"AND {condicion};"
+            for dimension, clave, condicion in self.dimensiones(fila)
+        ) + f" DELETE FROM {self.tabla} WHERE {self.grupo} = {fila}.{self.grupo} AND cantidad <= 0;"
+
+    def triggers(self):
+        return {
+            f"trg_{self.tabla}_insert": f"AFTER INSERT ON tarea BEGIN {self._sumar('new')} END",
+            f"trg_{self.tabla}_delete": f"AFTER DELETE ON tarea BEGIN {self._restar('old')} END",
+            f"trg_{self.tabla}_update": f"AFTER UPDATE OF {', '.join(self.columnas)} ON tarea "
+                                        f"BEGIN {self._restar('old')} {self._sumar('new')} END",
+        }
+
+    def _agrupado(self):
+        """SELECT con los conteos correctos, calculados con GROUP BY sobre tarea."""
+        return " UNION ALL ".join(
+            f"SELECT {self.grupo}, '{dimension}' AS dimension, {clave} AS clave, count(*) AS cantidad "
+            f"FROM tarea WHERE {condicion} AND (:grupo IS NULL OR {self.grupo} = :grupo) GROUP BY 1, 3"
+            for dimension, clave, condicion in self.dimensiones("tarea")
+        )
+
+    def recalcular(self, conn, grupo=None):
+        """Reemplaza los conteos (de un grupo o de todos) por los del GROUP BY."""
+        conn.execute(text(f"DELETE FROM {self.tabla} WHERE :grupo IS NULL OR {self.grupo} = :grupo"),
+                     {"grupo": grupo})
+        conn.execute(text(f"INSERT INTO {self.tabla} ({self.grupo}, dimension, clave, cantidad) "
+                          f"{self._agrupado()}"), {"grupo": grupo})
+
+    def diferencias(self, conn):
+        """[(grupo, dimensión, clave, guardado, correcto)] donde el resumen no coincide con tarea."""
+        guardado = {fila[:3]: fila[3] for fila in conn.execute(text(
+            f"SELECT {self.grupo}, dimension, clave, cantidad FROM {self.tabla}"))}
+        correcto = {fila[:3]: fila[3] for fila in conn.execute(text(self._agrupado()), {"grupo": None})}
+        return sorted((*clave, guardado.get(clave, 0), correcto.get(clave, 0))
+                      for clave in guardado.keys() | correcto.keys()
+                      if guardado.get(clave, 0) != correcto.get(clave, 0))
+
+
+resumen_tablero = Resumen(
+    ResumenTablero, "tablero_id",
+    lambda fila: (
+        ("fase", f"{fila}.fase_id", "1"),
+        ("persona", f"coalesce({fila}.persona_id, {SIN_ASIGNAR})", "1"),
+        ("vence", _dia(fila), f"{fila}.fecha_fin IS NOT NULL AND {_pendiente(fila)}"),
+    ),
+    ("tablero_id", "fase_id", "persona_id", "fecha_fin", "estado"),
+)
+
+resumen_persona = Resumen(
+    ResumenPersona, "persona_id",
+    lambda fila: (
+        ("total", "0", f"{fila}.persona_id IS NOT NULL"),
+        ("abiertas", "0", f"{fila}.persona_id IS NOT NULL AND {_pendiente(fila)}"),
+        ("vence", _dia(fila),
+         f"{fila}.persona_id IS NOT NULL AND {fila}.fecha_fin IS NOT NULL AND {_pendiente(fila)}"),
+    ),
+    ("persona_id", "fecha_fin", "estado"),
+)
+
+RESUMENES = (resumen_tablero, resumen_persona)
+
+
+def instalar_estadisticas(engine):
+    """
+    Crea (si no existen) los triggers de cada resumen.
+
+    Un resumen cuyos triggers no estaban se calcula completo, así una base
+    anterior (p. ej. my_project.db) queda consistente desde el arranque.
+    """
+    with engine.begin() as conn:
+        existentes = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars())
+        for resumen in RESUMENES:
+            triggers = resumen.triggers()
+            for nombre, cuerpo in triggers.items():
+                conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {nombre} {cuerpo}"))
+            if not triggers.keys() <= existentes:
+                resumen.recalcular(conn)
+
+
+def recalcular_estadisticas(engine, tablero_id=None):
+    """
+    Reconstruye el resumen de tableros con un GROUP BY sobre tarea (de un tablero o de todos).
+
+    Es una reparación: en la operación normal los triggers lo mantienen.
+    """
+    with engine.begin() as conn:
+        resumen_tablero.recalcular(conn, tablero_id)
+
+
+def verificar_estadisticas(engine, reparar=False):
+    """
+    Compara cada resumen con un GROUP BY sobre tarea.
+
+    Retorna {tabla: diferencias} (ver Resumen.diferencias); con `reparar`
+    además recalcula, en la misma transacción, los resúmenes que no coinciden.
+    """
+    resultado = {}
+    with engine.begin() as conn:
+        for resumen in RESUMENES:
+            resultado[resumen.tabla] = resumen.diferencias(conn)
+            if resultado[resumen.tabla] and reparar:
+                resumen.recalcular(conn)
+    return resultado
+
+
+def dia(fecha):
+    """Clave de la dimensión `vence` para una fecha (días desde 1970-01-01)."""
+    return (fecha - _EPOCA).days
+
+
+def _vencidas_hoy(columna, filtro, ahora):
+    """Tareas no completadas que vencieron hoy antes de `ahora`, con el índice de fecha_fin."""
+    from .tarea_m import Tarea
+
+    return (select(columna, func.count())
+            .where(and_(filtro,
+                        Tarea.fecha_fin >= datetime.combine(ahora.date(), time.min),
+                        Tarea.fecha_fin < ahora,
+                        Tarea.estado != ESTADO_COMPLETADA))
+            .group_by(columna))
+
+
+def obtener_estadisticas(tablero_id, ahora=None):
+    """
+    Estadísticas de un tablero leídas del resumen.
+
+    Retorna total, tareas por fase (todas las fases, incluso vacías), por
+    persona (persona_id None = sin asignar) y vencidas: no completadas con
+    fecha_fin anterior a `ahora`. Las de días anteriores salen del resumen;
+    las que vencen hoy se cuentan sobre el índice de fecha_fin. Cuesta
+    O(fases + personas + días con vencimientos), no O(tareas).
+    """
+    from .fase_m import Fase
+    from .persona_m import Persona
+    from .tarea_m import Tarea
+
+    ahora = ahora or datetime.now()
+    filas = session.execute(
+        select(ResumenTablero.dimension, ResumenTablero.clave, ResumenTablero.cantidad)
+        .where(ResumenTablero.tablero_id == tablero_id)
+    ).all()
+    por_dimension = {"fase": {}, "persona": {}, "vence": {}}
+    for dimension, clave, cantidad in filas:
+        por_dimension[dimension][clave] = cantidad
+
+    fases = session.execute(select(Fase.id, Fase.nombre).order_by(Fase.id)).all()
+    ids_personas = [clave for clave in por_dimension["persona"] if clave != SIN_ASIGNAR]
+    personas = dict(session.execute(
+        select(Persona.id, Persona.nombre).where(Persona.id.in_(ids_personas))
+    ).all()) if ids_personas else {}
+
+    vencidas_hoy = sum(cantidad for _, cantidad in session.execute(
+        _vencidas_hoy(Tarea.tablero_id, Tarea.tablero_id == tablero_id, ahora)))
+    vencidas = sum(cantidad for clave, cantidad in por_dimension["vence"].items() if clave < dia(ahora.date()))
+
+    return {
+        "tablero_id": tablero_id,
+        "total": sum(por_dimension["fase"].values()),
+        "por_fase": [
+            {"fase_id": id, "nombre": nombre, "cantidad": por_dimension["fase"].get(id, 0)}
+            for id, nombre in fases
+        ],
+        "por_persona": [
+            {"persona_id": None if clave == SIN_ASIGNAR else clave,
+             "nombre": None if clave == SIN_ASIGNAR else personas.get(clave),
+             "cantidad": cantidad}
+            for clave, cantidad in sorted(por_dimension["persona"].items())
+        ],
+        "vencidas": vencidas + vencidas_hoy,
+    }
+
+
+def obtener_carga(ahora=None):
+    """
+    Carga de trabajo de cada persona leída del resumen: tareas asignadas
+    (total), abiertas (no completadas) y vencidas (abiertas con fecha_fin
+    anterior a `ahora`). Incluye a las personas sin tareas. Cuesta
+    O(personas + días con vencimientos), no O(tareas).
+    """
+    from .persona_m import Persona
+    from .tarea_m import Tarea
+
+    ahora = ahora or datetime.now()
+    hoy = dia(ahora.date())
+    conteos = {}
+    for persona_id, dimension, clave, cantidad in session.execute(
+            select(ResumenPersona.persona_id, ResumenPersona.dimension,
+                   ResumenPersona.clave, ResumenPersona.cantidad)):
+        persona = conteos.setdefault(persona_id, {"total": 0, "abiertas": 0, "vencidas": 0})
+        if dimension == "vence":
+            if clave < hoy:
+                persona["vencidas"] += cantidad
+        else:
+            persona[dimension] = cantidad
+    for persona_id, cantidad in session.execute(
+            _vencidas_hoy(Tarea.persona_id, Tarea.persona_id.isnot(None), ahora)):
+        conteos.setdefault(persona_id, {"total": 0, "abiertas": 0, "vencidas": 0})["vencidas"] += cantidad
+
+    return [
+        {"persona_id": id, "nombre": nombre,
+         **conteos.get(id, {"total": 0, "abiertas": 0, "vencidas": 0})}
+        for id, nombre in session.execute(select(Persona.id, Persona.nombre).order_by(Persona.id))
+    ]
+
+
+if __name__ == "__main__":
+    # Verificación y reparación de los resúmenes en una base existente:
+    #   python -m src.models.estadisticas verificar
+    #   python -m src.models.estadisticas reparar [--tablero ID]
+    import argparse
+    from . import engine
+
+    parser = argparse.ArgumentParser(prog="python -m src.models.estadisticas")
+    parser.add_argument("accion", choices=("verificar", "reparar"))
+    parser.add_argument("--tablero", type=int, help="Reparar solo el resumen de este tablero")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine, tables=[ResumenTablero.__table__, ResumenPersona.__table__])
+    instalar_estadisticas(engine)
+    if args.accion == "reparar" and args.tablero is not None:
+        recalcular_estadisticas(engine, args.tablero)
+        print(f"Resumen del tablero {args.tablero} recalculado")
+    else:
+        reparar = args.accion == "reparar"
+        for tabla, diferencias in verificar_estadisticas(engine, reparar).items():
+            for grupo, dimension, clave, guardado, correcto in diferencias:
+                print(f"{tabla}: {grupo} {dimension}[{clave}] guardado={guardado} correcto={correcto}")
+            print(f"{tabla}: {len(diferencias)} diferencias" + (" reparadas" if reparar and diferencias else ""))
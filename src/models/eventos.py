@@ -0,0 +1,238 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from .escritura import al_confirmar
+
+# Eventos en vivo de cada tablero (GET /api/v1/tableros/<id>/eventos). Los
+# métodos de escritura de Tarea publican en un bus en memoria del proceso
+# cuando la transacción se confirma; cada suscriptor tiene su propia cola
+# acotada. Un suscriptor que no consume a tiempo no frena a nadie: al llenarse
+# su cola se lo descarta y su stream termina con un evento `descartado`, para
+# que el cliente se reconecte y se ponga al día con /api/v1/cambios.
+EVENTOS_CAPACIDAD_COLA = int(os.environ.get("EVENTOS_CAPACIDAD_COLA", 1000))
+# Cada cuánto se envía un comentario de latido por un stream sin eventos
+EVENTOS_LATIDO_S = float(os.environ.get("EVENTOS_LATIDO_S", 15))
+# Milisegundos que espera el navegador (EventSource) antes de reconectarse
+EVENTOS_REINTENTO_MS = int(os.environ.get("EVENTOS_REINTENTO_MS", 3000))
+# En la API Flask cada stream ocupa un hilo del servidor mientras está abierto:
+# se acota cuántos hay a la vez por proceso y cuánto dura cada uno (EventSource
+# se reconecta solo). La API ASGI espera en el event loop y no tiene esos límites.
+EVENTOS_MAX_SUSCRIPTORES = int(os.environ.get("EVENTOS_MAX_SUSCRIPTORES", 32))
+EVENTOS_DURACION_MAX_S = float(os.environ.get("EVENTOS_DURACION_MAX_S", 300))
+
+TIPOS_EVENTO = ("tarea_creada", "tarea_actualizada", "tarea_movida", "tarea_eliminada", "tablero_eliminado")
+# Después de estos eventos el stream se cierra
+_FINALES = ("descartado", "tablero_eliminado")
+
+
+class DemasiadasSuscripciones(Exception):
+    pass
+
+
+class Suscripcion:
+    """
+    Cola acotada de eventos de un tablero para un suscriptor.
+
+    Se consume desde un hilo (`siguiente`) o desde un event loop
+    (`siguiente_async`, si se creó con `loop`); quien publica nunca espera.
+    """
+
+    def __init__(self, tablero_id, capacidad=EVENTOS_CAPACIDAD_COLA, loop=None):
+        self.tablero_id = tablero_id
+        self.capacidad = capacidad
+        self.descartada = False
+        self._eventos = deque()
+        self._condicion = threading.Condition()
+        self._loop = loop
+        self._aviso = asyncio.Event() if loop else None
+
+    def entregar(self, evento):
+        """Encola el evento. Retorna False (y queda descartada) si la cola está llena."""
+        with self._condicion:
+            if len(self._eventos) >= self.capacidad:
+                self.descartada = True
+            else:
+                self._eventos.append(evento)
+            self._condicion.notify_all()
+        if self._loop:
+            try:
+                self._loop.call_soon_threadsafe(self._aviso.set)
+            except RuntimeError:
+                pass  # El event loop del suscriptor ya terminó
+        return not self.descartada
+
+    def _sacar(self):
+        # Con la cola vacía: None si espera más eventos, o la marca de descarte
+        if self._eventos:
+            return self._eventos.popleft()
+        if self.descartada:
+            return DESCARTADO
+        return None
+
+    def siguiente(self, timeout):
+        """El próximo evento; None si no llegó ninguno en `timeout` segundos."""
+        limite = time.monotonic() + timeout
+        with self._condicion:
+            while True:
+                evento = self._sacar()
+                restante = limite - time.monotonic()
+                if evento is not None or restante <= 0:
+                    return evento
+                self._condicion.wait(restante)
+
+    async def siguiente_async(self, timeout):
+        """Como `siguiente`, pero espera en el event loop sin ocupar un hilo."""
+        try:
+            await asyncio.wait_for(self._esperar(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._condicion:
+            return self._sacar()
+
+    async def _esperar(self):
+        while True:
+            with self._condicion:
+                if self._eventos or self.descartada:
+                    return
+                self._aviso.clear()
+            await self._aviso.wait()
+
+
+# Último evento de una suscripción descartada
+DESCARTADO = {"tipo": "descartado", "datos": {"motivo": "El cliente no consumió los eventos a tiempo"}}
+
+
+class BusEventos:
+    """Pub/sub en memoria: suscripciones por tablero y publicación sin bloqueo."""
+
+    def __init__(self):
+        self._suscripciones = {}
+        self._candado = threading.Lock()
+        self._secuencia = itertools.count(1)
+        self.publicados = 0
+        self.descartadas = 0
+
+    def suscribir(self, tablero_id, capacidad=EVENTOS_CAPACIDAD_COLA, loop=None, maximo=None):
+        """
+        Nueva suscripción a los eventos del tablero. Con `maximo` lanza
+        DemasiadasSuscripciones si el proceso ya tiene esa cantidad.
+        """
+        with self._candado:
+            if maximo is not None and self._contar() >= maximo:
+                raise DemasiadasSuscripciones(f"Se alcanzó el máximo de {maximo} suscripciones")
+            suscripcion = Suscripcion(tablero_id, capacidad, loop)
+            self._suscripciones.setdefault(tablero_id, set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        with self._candado:
+            suscripciones = self._suscripciones.get(suscripcion.tablero_id, set())
+            suscripciones.discard(suscripcion)
+            if not suscripciones:
+                self._suscripciones.pop(suscripcion.tablero_id, None)
+
+    def cantidad(self):
+        with self._candado:
+            return self._contar()
+
+    def _contar(self):
+        return sum(len(suscripciones) for suscripciones in self._suscripciones.values())
+
+    def publicar(self, tablero_id, tipo, datos):
+        """Entrega el evento a cada suscriptor del tablero; descarta a los que tienen la cola llena."""
+        with self._candado:
+            suscripciones = list(self._suscripciones.get(tablero_id, ()))
+        if not suscripciones:
+            return
+        evento = {"id": next(self._secuencia), "tipo": tipo, "datos": datos}
+        self.publicados += 1
+        for suscripcion in suscripciones:
+            if not suscripcion.entregar(evento):
+                self.cancelar(suscripcion)
+                self.descartadas += 1
+
+    def estadisticas(self):
+        with self._candado:
+            tableros = len(self._suscripciones)
+            suscripciones = self._contar()
+        return {"tableros": tableros, "suscripciones": suscripciones,
+                "publicados": self.publicados, "descartadas": self.descartadas}
+
+
+bus_eventos = BusEventos()
+
+
+def publicar_al_confirmar(tablero_id, tipo, datos):
+    """Publica el evento cuando la transacción actual se confirme (ver al_confirmar)."""
+    al_confirmar(lambda: bus_eventos.publicar(tablero_id, tipo, datos))
+
+
+def eventos_cambio_tarea(anterior, tarea):
+    """
+    Eventos de la edición de una tarea, como [(tablero_id, tipo, datos)]:
+    `tarea_movida` si cambió de fase y `tarea_actualizada` si no. Si cambió de
+    tablero, para el anterior es una baja y para el nuevo un alta. `anterior`
+    es el par (tablero_id, fase_id) previo.
+    """
+    tablero_anterior, fase_anterior = anterior
+    if tarea["tablero_id"] != tablero_anterior:
+        return [(tablero_anterior, "tarea_eliminada", {"id": tarea["id"]}),
+                (tarea["tablero_id"], "tarea_creada", tarea)]
+    if tarea["fase_id"] != fase_anterior:
+        return [(tarea["tablero_id"], "tarea_movida", {**tarea, "fase_id_anterior": fase_anterior})]
+    return [(tarea["tablero_id"], "tarea_actualizada", tarea)]
+
+
+def _json(valor):
+    return valor.isoformat() if isinstance(valor, datetime) else str(valor)
+
+
+def mensaje_sse(evento):
+    """Un evento en el formato de Server-Sent Events (id, event y data en JSON)."""
+    lineas = [f"id: {evento['id']}"] if "id" in evento else []
+    lineas += [f"event: {evento['tipo']}", f"data: {json.dumps(evento['datos'], default=_json)}"]
+    return "\n".join(lineas) + "\n\n"
+
+
+def stream_eventos(suscripcion, duracion_max=EVENTOS_DURACION_MAX_S):
+    """
+    Generador del cuerpo text/event-stream para una suscripción (WSGI).
+
+    Envía un latido cada EVENTOS_LATIDO_S sin eventos (así se detecta un
+    cliente desconectado) y termina tras `duracion_max` segundos. Al cerrarse
+    cancela la suscripción.
+    """
+    try:
+        yield f"retry: {EVENTOS_REINTENTO_MS}\n\n"
+        limite = time.monotonic() + duracion_max
+        while (restante := limite - time.monotonic()) > 0:
+            evento = suscripcion.siguiente(min(EVENTOS_LATIDO_S, restante))
+            if evento is None:
+                yield ": latido\n\n"
+                continue
+            yield mensaje_sse(evento)
+            if evento["tipo"] in _FINALES:
+                return
+    finally:
+        bus_eventos.cancelar(suscripcion)
+
+
+async def stream_eventos_async(suscripcion):
+    """Como stream_eventos, pero esperando en el event loop y sin duración máxima (ASGI)."""
+    try:
+        yield f"retry: {EVENTOS_REINTENTO_MS}\n\n"
+        while True:
+            evento = await suscripcion.siguiente_async(EVENTOS_LATIDO_S)
+            if evento is None:
+                yield ": latido\n\n"
+                continue
+            yield mensaje_sse(evento)
+            if evento["tipo"] in _FINALES:
+                return
+    finally:
+        bus_eventos.cancelar(suscripcion)
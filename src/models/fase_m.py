@@ -1,7 +1,20 @@
 from . import Base, session
+from .paginacion import paginar, columnas_con_orden
+from .cache import CacheLRU
+from .escritura import escritura, al_confirmar
+from .serializacion import crear_serializador, elegir_campos
 from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.orm import relationship
 
+# Las fases casi nunca cambian: se cachean y cada escritura invalida lo afectado.
+# Las entradas se validan contra la versión de `fase`, así que también caducan
+# con las escrituras de otros procesos.
+cache_fases = CacheLRU("fases", max_elementos=256, ttl=300, tabla="fase")
+
+def _invalidar_cache(id):
+    cache_fases.invalidar(("id", id))
+    cache_fases.invalidar_si(lambda clave: clave[0] == "lista")
+
 class Fase(Base):
     __tablename__ = "fase"
 
@@ -9,29 +22,40 @@ class Fase(Base):
     nombre = Column(String, nullable=False, unique=True)
 
     # Relationships
-    tareas_asociadas = relationship("Tarea", back_populates="fase_asociada", cascade="all, delete-orphan")
+    tareas_asociadas = relationship("Tarea", back_populates="fase_asociada", cascade="all, delete-orphan",
+                                    passive_deletes=True)
 
     def __init__(self, nombre):
         self.nombre = nombre
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "nombre": self.nombre,
-        }
+        return serializar_fase(self)
 
     def __repr__(self):
         return f"<Fase(id={self.id}, nombre='{self.nombre}')>"
 
     @classmethod
+    @escritura
     def crear_fase(cls, nombre): # Recibe 'cls' para referirse a la clase Fase
         nueva_fase = cls(nombre=nombre)  # Usar cls() para crear instancias
         session.add(nueva_fase) 
+        session.flush() # Asigna el id para poder invalidar el cache
+        id = nueva_fase.id
+        al_confirmar(lambda: _invalidar_cache(id))
         session.commit() # Commit de la sesión actual
-        return nueva_fase
+        return nueva_fase.to_dict()
     
     @classmethod
-    def obtener_fase_por_id(cls, id):
+    def obtener_fase_por_id(cls, id, campos=None):
+        serializar = elegir_campos(serializar_fase, campos)
+        fase = cache_fases.obtener_o_calcular(("id", id), lambda: cls._consultar_fase(id))
+        if fase and serializar is not serializar_fase:
+            # La fase completa ya está en cache: se recortan los campos sin consultar
+            return {campo: fase[campo] for campo in serializar.campos}
+        return fase
+
+    @classmethod
+    def _consultar_fase(cls, id):
         fase = session.query(cls).filter(cls.id == id).first()
         if fase:
             return fase.to_dict()
@@ -39,28 +63,41 @@ class Fase(Base):
             return None
         
     @classmethod
-    def obtener_fases(cls):
-        fases = session.query(cls).all()
-        return [fase.to_dict() for fase in fases]
+    def obtener_fases(cls, limit=None, after=None, campos=None):
+        serializar = elegir_campos(serializar_fase, campos)
+        return cache_fases.obtener_o_calcular(("lista", limit, after, serializar.campos),
+                                              lambda: cls._consultar_fases(limit, after, serializar))
+
+    @classmethod
+    def _consultar_fases(cls, limit, after, serializar):
+        orden = [(cls.id, False)]
+        fases, siguiente = paginar(session.query(*columnas_con_orden(serializar.columnas, orden)),
+                                   orden, limit, after)
+        return list(map(serializar, fases)), siguiente
     
     @classmethod
+    @escritura
     def actualizar_fase(cls, id, nombre):
         fase = session.query(cls).filter(cls.id == id).first()
         if fase:
             fase.nombre = nombre
+            al_confirmar(lambda: _invalidar_cache(id))
             session.commit()
             return fase.to_dict()
         else:
             return None
         
     @classmethod
+    @escritura
     def eliminar_fase(cls, id):
         fase = session.query(cls).filter(cls.id == id).first()
         if fase:
             session.delete(fase)
+            al_confirmar(lambda: _invalidar_cache(id))
             session.commit()
             return True
         else:
             return False
 
-    
\ No newline at end of file
+
+serializar_fase = crear_serializador(Fase)
@@ -0,0 +1,89 @@
+import re
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+
+def aplicar_migraciones(engine, metadata):
+    """
+    Lleva una base existente (p. ej. my_project.db) al esquema actual de los modelos.
+
+    create_all solo crea tablas nuevas; aquí se agregan las columnas y los
+    índices que se hayan definido después de crear la tabla, y se reconstruyen
+    las tablas cuyas claves foráneas o AUTOINCREMENT cambiaron (SQLite no
+    puede alterarlos). Es idempotente.
+    """
+    reconstruir = []
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        tablas_existentes = set(inspector.get_table_names())
+        for tabla in metadata.sorted_tables:
+            if tabla.name not in tablas_existentes:
+                continue
+            columnas = {c["name"] for c in inspector.get_columns(tabla.name)}
+            for columna in tabla.columns:
+                if columna.name not in columnas:
+                    ddl = CreateColumn(columna).compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {tabla.name} ADD COLUMN {ddl}"))
+            if engine.dialect.name == "sqlite" and _cambio_estructura(conn, inspector, tabla):
+                reconstruir.append(tabla)
+
+    for tabla in reconstruir:
+        _reconstruir_tabla(engine, tabla)
+
+    with engine.begin() as conn:
+        for tabla in metadata.sorted_tables:
+            for indice in tabla.indexes:
+                indice.create(conn, checkfirst=True)
+
+
+def _cambio_estructura(conn, inspector, tabla):
+    if _claves_foraneas(tabla) != _claves_foraneas_en_base(inspector, tabla):
+        return True
+    ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :nombre"),
+                       {"nombre": tabla.name}).scalar()
+    return bool(tabla.dialect_options["sqlite"]["autoincrement"]) != ("AUTOINCREMENT" in ddl.upper())
+
+
+def _normalizar(columnas, tabla_referida, ondelete):
+    return tuple(columnas), tabla_referida, (ondelete or "NO ACTION").upper()
+
+
+def _claves_foraneas(tabla):
+    return {_normalizar(fk.column_keys, fk.referred_table.name, fk.ondelete)
+            for fk in tabla.foreign_key_constraints}
+
+
+def _claves_foraneas_en_base(inspector, tabla):
+    return {_normalizar(fk["constrained_columns"], fk["referred_table"], fk.get("options", {}).get("ondelete"))
+            for fk in inspector.get_foreign_keys(tabla.name)}
+
+
+def _reconstruir_tabla(engine, tabla):
+    """
+    Recrea la tabla con el DDL actual conservando sus filas (y sus ids).
+
+    Es el procedimiento de SQLite para cambiar restricciones: tabla nueva,
+    copia, DROP y RENAME en una transacción, con las claves foráneas
+    desactivadas para que filas huérfanas antiguas no impidan la copia. Los
+    índices los vuelve a crear aplicar_migraciones y los triggers, los
+    instalar_* del arranque.
+    """
+    temporal = f"{tabla.name}_migracion"
+    ddl = str(CreateTable(tabla).compile(dialect=engine.dialect))
+    ddl = re.sub(rf"^\s*CREATE TABLE {tabla.name}\b", f"CREATE TABLE {temporal}", ddl, count=1)
+    with engine.connect() as conn:
+        # foreign_keys no se puede cambiar dentro de una transacción
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.commit()
+        try:
+            with conn.begin():
+                existentes = {c["name"] for c in inspect(conn).get_columns(tabla.name)}
+                columnas = ", ".join(c.name for c in tabla.columns if c.name in existentes)
+                conn.execute(text(f"DROP TABLE IF EXISTS {temporal}"))
+                conn.execute(text(ddl))
+                conn.execute(text(f"INSERT INTO {temporal} ({columnas}) SELECT {columnas} FROM {tabla.name}"))
+                conn.execute(text(f"DROP TABLE {tabla.name}"))
+                conn.execute(text(f"ALTER TABLE {temporal} RENAME TO {tabla.name}"))
+        finally:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            conn.commit()
@@ -0,0 +1,140 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, false, or_
+
+# Paginación por cursor (keyset): en lugar de OFFSET se busca a partir de la
+# última fila entregada, así que cada página cuesta lo mismo sin importar
+# qué tan profunda sea.
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+def codificar_cursor(valores):
+    """Convierte los valores de orden de la última fila en un cursor opaco."""
+    datos = [v.isoformat() if isinstance(v, datetime) else v for v in valores]
+    crudo = json.dumps(datos, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(crudo).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor, columnas):
+    """Recupera los valores de orden de un cursor generado por codificar_cursor."""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (ValueError, TypeError):
+        raise CursorInvalido("Cursor 'after' inválido")
+    if not isinstance(valores, list) or len(valores) != len(columnas):
+        raise CursorInvalido("Cursor 'after' inválido")
+
+    resultado = []
+    for columna, valor in zip(columnas, valores):
+        if valor is not None and _es_fecha(columna):
+            try:
+                valor = datetime.fromisoformat(valor)
+            except (ValueError, TypeError):
+                raise CursorInvalido("Cursor 'after' inválido")
+        resultado.append(valor)
+    return resultado
+
+
+def leer_parametros(args):
+    """Obtiene (limit, after) de los query params, validando el límite."""
+    limite = args.get("limit")
+    if limite in (None, ""):
+        limite = LIMITE_POR_DEFECTO
+    else:
+        try:
+            limite = int(limite)
+        except (TypeError, ValueError):
+            raise ValueError("El parámetro 'limit' debe ser un entero")
+        if limite < 1:
+            raise ValueError("El parámetro 'limit' debe ser mayor que 0")
+        limite = min(limite, LIMITE_MAXIMO)
+    return limite, args.get("after") or None
+
+
+def paginar(query, orden, limit=None, after=None):
+    """
+    Aplica paginación keyset a un query.
+
+    `orden` es una lista de pares (columna, descendente); la última columna
+    debe ser única (normalmente la clave primaria) para desempatar.
+    Retorna (filas, siguiente_cursor); el cursor es None en la última página.
+    """
+    limit = limit or LIMITE_POR_DEFECTO
+    filas = preparar_pagina(query, orden, limit, after).all()
+    return cortar_pagina(filas, orden, limit)
+
+
+def preparar_pagina(consulta, orden, limit, after=None):
+    """
+    Agrega el filtro del cursor, el ORDER BY y el LIMIT (uno de más para saber
+    si hay otra página). Sirve tanto para un Query como para un select(), así
+    que la API asíncrona pagina igual que la síncrona.
+    """
+    if after:
+        valores = decodificar_cursor(after, [columna for columna, _ in orden])
+        consulta = consulta.filter(_condicion_keyset(orden, valores))
+    consulta = consulta.order_by(*[_ordenar(columna, desc) for columna, desc in orden])
+    return consulta.limit(limit + 1)
+
+
+def cortar_pagina(filas, orden, limit):
+    """Recorta la fila de más que trajo preparar_pagina y arma el cursor siguiente."""
+    siguiente = None
+    if len(filas) > limit:
+        filas = filas[:limit]
+        ultima = filas[-1]
+        siguiente = codificar_cursor([getattr(ultima, columna.key) for columna, _ in orden])
+    return filas, siguiente
+
+
+def columnas_con_orden(columnas, orden):
+    """Las columnas pedidas más las de orden que falten: el cursor se arma con ellas."""
+    presentes = {columna.key for columna in columnas}
+    return list(columnas) + [columna for columna, _ in orden if columna.key not in presentes]
+
+
+def _es_fecha(columna):
+    try:
+        return columna.type.python_type is datetime
+    except NotImplementedError:
+        return False
+
+
+def _ordenar(columna, descendente):
+    # SQLite ordena los NULL como el valor más pequeño; se respeta ese orden
+    # para que el cursor y el ORDER BY coincidan.
+    return columna.desc() if descendente else columna.asc()
+
+
+def _despues(columna, valor, descendente):
+    """Condición 'estrictamente después de valor' para una columna."""
+    if valor is None:
+        # NULL es el menor: en ASC viene todo lo no nulo, en DESC nada más.
+        return columna.isnot(None) if not descendente else False
+    if descendente:
+        return or_(columna < valor, columna.is_(None))
+    return columna > valor
+
+
+def _igual(columna, valor):
+    return columna.is_(None) if valor is None else columna == valor
+
+
+def _condicion_keyset(orden, valores):
+    # (a > x) OR (a = x AND b > y) OR ... expresado de forma que el índice
+    # sobre la primera columna de orden pueda usarse para el seek.
+    condiciones = []
+    for i, (columna, descendente) in enumerate(orden):
+        previas = [_igual(c, v) for (c, _), v in zip(orden[:i], valores[:i])]
+        despues = _despues(columna, valores[i], descendente)
+        if despues is False:
+            continue
+        condiciones.append(and_(*previas, despues))
+    return or_(*condiciones) if condiciones else false()
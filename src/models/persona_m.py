@@ -1,4 +1,7 @@
 from . import Base, session
+from .paginacion import paginar, columnas_con_orden
+from .escritura import escritura
+from .serializacion import crear_serializador, elegir_campos
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
 from sqlalchemy.orm import relationship
 
@@ -11,7 +14,8 @@ class Persona(Base):
     password = Column(String, nullable=False) # In a real app, store hashed passwords!
 
     # Relationships
-    tareas_asignadas = relationship("Tarea", back_populates="asignado_a", cascade="all, delete-orphan")
+    tareas_asignadas = relationship("Tarea", back_populates="asignado_a", cascade="all, delete-orphan",
+                                    passive_deletes=True)
 
     def __init__(self, nombre, correo, password):
         self.nombre = nombre
@@ -19,16 +23,13 @@ class Persona(Base):
         self.password = password
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "nombre": self.nombre,
-            "correo": self.correo,
-        }
+        return serializar_persona(self)
 
     def __repr__(self):
         return f"<Persona(id={self.id}, nombre='{self.nombre}', correo='{self.correo}')>"
 
     @classmethod
+    @escritura
     def crear_persona(cls, nombre, correo, password):
         nueva_persona = cls(nombre=nombre, correo=correo, password=password)
         session.add(nueva_persona)
@@ -36,19 +37,30 @@ class Persona(Base):
         return nueva_persona.to_dict()
     
     @classmethod
-    def obtener_persona_por_id(cls, persona_id):
-        persona = session.query(cls).filter(cls.id == persona_id).first()
+    def obtener_persona_por_id(cls, persona_id, campos=None):
+        serializar = elegir_campos(serializar_persona, campos)
+        persona = session.query(*serializar.columnas).filter(cls.id == persona_id).first()
         if persona:
-            return persona.to_dict()
+            return serializar(persona)
         else:
             return None
         
     @classmethod
-    def obtener_personas(cls):
-        personas = session.query(cls).all()
-        return [persona.to_dict() for persona in personas]
+    def obtener_personas(cls, limit=None, after=None, campos=None):
+        serializar = elegir_campos(serializar_persona, campos)
+        orden = [(cls.id, False)]
+        personas, siguiente = paginar(session.query(*columnas_con_orden(serializar.columnas, orden)),
+                                      orden, limit, after)
+        return list(map(serializar, personas)), siguiente
     
     @classmethod
+    def obtener_carga(cls):
+        """Tareas asignadas, abiertas y vencidas de cada persona (ver estadisticas.py)."""
+        from .estadisticas import obtener_carga
+        return obtener_carga()
+
+    @classmethod
+    @escritura
     def actualizar_persona(cls, persona_id, nombre=None, correo=None, password=None):
         persona = session.query(cls).filter(cls.id == persona_id).first()
         if persona:
@@ -64,7 +76,9 @@ class Persona(Base):
             return None
         
     @classmethod
+    @escritura
     def eliminar_persona(cls, persona_id):
+        # Las tareas asignadas las borra la base (ON DELETE CASCADE); el ORM no las carga
         persona = session.query(cls).filter(cls.id == persona_id).first()
         if persona:
             session.delete(persona)
@@ -72,4 +86,19 @@ class Persona(Base):
             return True
         else:
             return False
-    
\ No newline at end of file
+
+    @classmethod
+    def purgar_persona(cls, persona_id):
+        """
+        Crea el trabajo que elimina la persona en segundo plano: sus tareas por
+        lotes y después la persona (ver purga.py). Retorna el trabajo o None si no existe.
+        """
+        from .trabajos import Trabajo
+
+        if not session.query(cls.id).filter(cls.id == persona_id).first():
+            return None
+        return Trabajo.crear_trabajo("purgar_persona", persona_id=persona_id)
+
+
+# La contraseña nunca se serializa
+serializar_persona = crear_serializador(Persona, excluir=("password",))
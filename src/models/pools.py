@@ -0,0 +1,61 @@
+import threading
+import time
+from sqlalchemy import event
+
+# Métricas de uso de cada pool de conexiones, para detectar saturación
+_METRICAS = {}
+
+
+class MetricasPool:
+    def __init__(self, nombre, engine):
+        self.nombre = nombre
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.en_uso = 0
+        self.maximo_en_uso = 0
+        self.tiempo_retenido = 0.0
+
+    def al_tomar(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["tomada_en"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self.en_uso += 1
+            self.maximo_en_uso = max(self.maximo_en_uso, self.en_uso)
+
+    def al_devolver(self, dbapi_connection, connection_record):
+        tomada_en = connection_record.info.pop("tomada_en", None)
+        with self._lock:
+            self.en_uso = max(self.en_uso - 1, 0)
+            if tomada_en is not None:
+                self.tiempo_retenido += time.perf_counter() - tomada_en
+
+    def estadisticas(self):
+        pool = self.engine.pool
+        capacidad = None
+        if hasattr(pool, "size") and hasattr(pool, "_max_overflow"):
+            capacidad = pool.size() + max(pool._max_overflow, 0)
+        with self._lock:
+            return {
+                "nombre": self.nombre,
+                "pool": pool.status(),
+                "capacidad": capacidad,
+                "en_uso": self.en_uso,
+                "maximo_en_uso": self.maximo_en_uso,
+                "saturacion": round(self.en_uso / capacidad, 4) if capacidad else None,
+                "checkouts": self.checkouts,
+                "retencion_promedio_ms": round(self.tiempo_retenido * 1000 / self.checkouts, 3)
+                                         if self.checkouts else None,
+            }
+
+
+def instrumentar_pool(engine, nombre):
+    metricas = MetricasPool(nombre, engine)
+    event.listen(engine, "checkout", metricas.al_tomar)
+    event.listen(engine, "checkin", metricas.al_devolver)
+    _METRICAS[nombre] = metricas
+    return metricas
+
+
+def estadisticas_pools():
+    return {nombre: metricas.estadisticas() for nombre, metricas in _METRICAS.items()}
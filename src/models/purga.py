@@ -0,0 +1,36 @@
+import os
+import time
+from sqlalchemy import delete, select
+from . import engine
+
+# Purga por lotes: en lugar de un único DELETE que en un tablero (o persona)
+# con decenas de miles de tareas retiene el lock de escritura de SQLite hasta
+# terminar, las tareas se borran de a PURGA_TAMANO_LOTE por transacción, con
+# una pausa entre lotes para que las demás escrituras entren. Se ejecuta como
+# trabajo en segundo plano (ver trabajos.py); al final se elimina el padre y
+# ON DELETE CASCADE se lleva lo que se haya creado mientras.
+PURGA_TAMANO_LOTE = int(os.environ.get("PURGA_TAMANO_LOTE", 1000))
+PURGA_PAUSA_MS = float(os.environ.get("PURGA_PAUSA_MS", 10))
+
+
+def purgar_tareas(columna, valor, tamano_lote=PURGA_TAMANO_LOTE, pausa_ms=PURGA_PAUSA_MS, al_avanzar=None):
+    """
+    Elimina las tareas con `columna == valor` en transacciones de a `tamano_lote`.
+
+    Los triggers de versiones, búsqueda y estadísticas se disparan en cada
+    lote como en cualquier otro DELETE. Después de cada lote llama a
+    `al_avanzar(eliminadas_hasta_ahora)`. Retorna la cantidad eliminada.
+    """
+    from .tarea_m import Tarea
+
+    lote = select(Tarea.id).where(columna == valor).limit(tamano_lote).scalar_subquery()
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            eliminadas = conn.execute(delete(Tarea).where(Tarea.id.in_(lote))).rowcount
+        total += eliminadas
+        if al_avanzar:
+            al_avanzar(total)
+        if eliminadas < tamano_lote:
+            return total
+        time.sleep(pausa_ms / 1000)
@@ -0,0 +1,54 @@
+from functools import lru_cache
+
+
+def crear_serializador(modelo, excluir=(), campos=None):
+    """
+    Genera, a partir de las columnas del modelo, una función fila -> dict.
+
+    La función se compila una sola vez: cada columna es un acceso por atributo,
+    sin recorrer los campos de nuevo. Acepta tanto instancias del modelo como
+    filas de Core (p. ej. session.execute(select(*serializador.columnas))),
+    que exponen las columnas como atributos. Las fechas quedan como datetime:
+    cada representación las codifica a su manera (ISO 8601 en JSON, timestamp
+    en MessagePack). El serializador lleva en `.columnas` las columnas que
+    lee, para consultar solo esas, y en `.campos` los nombres de salida.
+
+    Con `campos` se limita a ese subconjunto (ver elegir_campos).
+    """
+    mapper = modelo.__mapper__
+    pares = [(columna, mapper.get_property_by_column(columna).key)
+             for columna in modelo.__table__.columns if columna.key not in excluir]
+    if campos is not None:
+        pares = [(columna, atributo) for columna, atributo in pares if atributo in campos]
+    columnas = [columna for columna, _ in pares]
+    atributos = [atributo for _, atributo in pares]
+
+    codigo = ("def serializar(fila):\n"
+              "    return {" + ", ".join(f"{atributo!r}: fila.{atributo}" for atributo in atributos) + "}\n")
+    espacio = {}
+    exec(compile(codigo, f"<serializador {modelo.__name__}>", "exec"), espacio)
+    serializar = espacio["serializar"]
+    serializar.__name__ = f"serializar_{modelo.__tablename__}"
+    serializar.columnas = columnas
+    serializar.campos = tuple(atributos)
+    if campos is None:
+        # Los subconjuntos se compilan la primera vez que se piden
+        serializar.parcial = lru_cache(maxsize=128)(
+            lambda pedidos: crear_serializador(modelo, excluir, pedidos))
+    return serializar
+
+
+def elegir_campos(serializador, campos):
+    """
+    Serializador restringido a `campos` (lista de nombres, p. ej. de ?fields=).
+
+    Con None retorna el serializador completo. Los campos salen en el orden
+    de las columnas del modelo. Lanza ValueError si alguno no existe.
+    """
+    if campos is None:
+        return serializador
+    desconocidos = [campo for campo in campos if campo not in serializador.campos]
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos en 'fields': {', '.join(desconocidos)}. "
+                         f"Campos válidos: {', '.join(serializador.campos)}")
+    return serializador.parcial(frozenset(campos))
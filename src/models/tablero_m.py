@@ -1,10 +1,22 @@
 from . import Base, session
-from sqlalchemy import Column, Integer, String, DateTime, Text
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from .paginacion import paginar, columnas_con_orden
+from .cache import CacheLRU
+from .escritura import escritura, al_confirmar
+from .eventos import publicar_al_confirmar
+from .serializacion import crear_serializador, elegir_campos
+from .archivo import tabla_archivo, con_archivadas
+from sqlalchemy import Column, Integer, String, DateTime, Text, func, insert, literal, null, select
+from sqlalchemy.orm import relationship, selectinload, joinedload
+from datetime import datetime, timedelta
+
+# Cache de lecturas por ID; crear/actualizar/eliminar invalidan la entrada
+# Validado contra la versión de `tablero` (ver CacheLRU)
+cache_tableros = CacheLRU("tableros", max_elementos=1024, ttl=60, tabla="tablero")
 
 class Tablero(Base):
     __tablename__ = "tablero"
+    # AUTOINCREMENT: un id archivado (ver archivo.py) no se reutiliza
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String, nullable=False)
@@ -14,42 +26,132 @@ class Tablero(Base):
     estado = Column(String, default="activo", nullable=False) # e.g., 'activo', 'completado', 'en espera'
 
     # Relationships
-    tareas = relationship("Tarea", back_populates="tablero_asociado", cascade="all, delete-orphan")
+    tareas = relationship("Tarea", back_populates="tablero_asociado", cascade="all, delete-orphan",
+                          passive_deletes=True)
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "nombre": self.nombre,
-            "descripcion": self.descripcion,
-            "fecha_creacion": self.fecha_creacion,
-            "fecha_entrega": self.fecha_entrega,
-            "estado": self.estado,
-        }
+        return serializar_tablero(self)
 
     def __repr__(self):
         return f"<Proyecto(id={self.id}, nombre='{self.nombre}')>"
     
     @classmethod
+    @escritura
     def crear_tablero(cls, nombre, descripcion, fecha_entrega, estado):
         tablero_nuevo = cls(nombre=nombre, descripcion=descripcion,
                             fecha_entrega=fecha_entrega, estado=estado)
         session.add(tablero_nuevo)
+        session.flush()
+        id = tablero_nuevo.id
+        al_confirmar(lambda: cache_tableros.invalidar(id))
         session.commit()
         return tablero_nuevo.to_dict()
     
     @classmethod
-    def obtener_tableros(cls):
-        tableros = session.query(cls).all()
-        return [tablero.to_dict() for tablero in tableros]
+    def obtener_tableros(cls, limit=None, after=None, campos=None, incluir_archivadas=False):
+        serializar = elegir_campos(serializar_tablero, campos)
+        origen = con_archivadas(cls, tablero_archivado) if incluir_archivadas else cls
+        orden = [(origen.id, False)]
+        columnas = [getattr(origen, columna.key) for columna in serializar.columnas]
+        tableros, siguiente = paginar(session.query(*columnas_con_orden(columnas, orden)),
+                                      orden, limit, after)
+        return list(map(serializar, tableros)), siguiente
     
     @classmethod
-    def obtener_tablero_por_id(cls, id):
+    def obtener_tablero_por_id(cls, id, campos=None, incluir_archivadas=False):
+        serializar = elegir_campos(serializar_tablero, campos)
+        tablero = cache_tableros.obtener_o_calcular(id, lambda: cls._consultar_tablero(id))
+        if not tablero and incluir_archivadas:
+            # El archivo no pasa por el cache: se consulta solo cuando se pide
+            fila = session.execute(select(tablero_archivado).filter_by(id=id)).first()
+            tablero = serializar_tablero(fila) if fila else None
+        if tablero and serializar is not serializar_tablero:
+            # El tablero completo ya está en cache: se recortan los campos sin consultar
+            return {campo: tablero[campo] for campo in serializar.campos}
+        return tablero
+
+    @classmethod
+    def _consultar_tablero(cls, id):
         tablero = session.query(cls).filter_by(id=id).first()
         if tablero:
             return tablero.to_dict()
         return None
     
     @classmethod
+    def obtener_estadisticas(cls, id):
+        """Conteos de tareas del tablero (ver estadisticas.py) o None si no existe."""
+        from .estadisticas import obtener_estadisticas
+
+        if not cls.obtener_tablero_por_id(id):
+            return None
+        return obtener_estadisticas(id)
+
+    @classmethod
+    def obtener_tablero_completo(cls, id, campos=None):
+        """
+        Vista del tablero para el kanban: el tablero, todas las fases en orden
+        y, en cada fase, las tareas del tablero con el nombre de la persona asignada.
+        Siempre ejecuta tres consultas sin importar la cantidad de tareas.
+
+        `campos` limita los campos de cada tarea (columnas de Tarea y
+        persona_nombre); sin persona_nombre no se consulta la persona.
+        """
+        from .fase_m import Fase
+
+        tablero = session.scalars(cls.consulta_tablero_completo(id, campos)).first()
+        if not tablero:
+            return None
+        fases = session.query(Fase).order_by(Fase.id).all()
+        return cls.armar_tablero_completo(tablero, fases, campos)
+
+    @classmethod
+    def consulta_tablero_completo(cls, id, campos=None):
+        from .tarea_m import Tarea
+        from .persona_m import Persona
+
+        serializar, con_persona = cls._campos_tarea(campos)
+        # Además de los campos pedidos, lo que usa el armado: orden, fase y relaciones
+        necesarias = {"id", "fase_id", "tablero_id", *serializar.campos}
+        if con_persona:
+            necesarias.add("persona_id")
+        tareas = selectinload(cls.tareas).load_only(*[getattr(Tarea, campo) for campo in sorted(necesarias)])
+        if con_persona:
+            tareas = tareas.joinedload(Tarea.asignado_a).load_only(Persona.nombre)
+        return select(cls).options(tareas).filter_by(id=id)
+
+    @staticmethod
+    def _campos_tarea(campos):
+        """(serializador de las tareas, si se incluye persona_nombre) según `campos`."""
+        from .tarea_m import serializar_tarea
+
+        if campos is None:
+            return serializar_tarea, True
+        columnas = [campo for campo in campos if campo != "persona_nombre"]
+        try:
+            return elegir_campos(serializar_tarea, columnas), len(columnas) < len(campos)
+        except ValueError as e:
+            raise ValueError(f"{e}, persona_nombre") from None
+
+    @staticmethod
+    def armar_tablero_completo(tablero, fases, campos=None):
+        serializar, con_persona = Tablero._campos_tarea(campos)
+        tareas_por_fase = {}
+        for tarea in sorted(tablero.tareas, key=lambda t: t.id):
+            datos = serializar(tarea)
+            if con_persona:
+                datos["persona_nombre"] = tarea.asignado_a.nombre if tarea.asignado_a else None
+            tareas_por_fase.setdefault(tarea.fase_id, []).append(datos)
+
+        return {
+            "tablero": tablero.to_dict(),
+            "fases": [
+                {**fase.to_dict(), "tareas": tareas_por_fase.get(fase.id, [])}
+                for fase in fases
+            ],
+        }
+
+    @classmethod
+    @escritura
     def actualizar_tablero(cls, id, nombre=None, descripcion=None, fecha_entrega=None, estado=None):
         tablero = session.query(cls).filter_by(id=id).first()
         if not tablero:
@@ -64,21 +166,119 @@ class Tablero(Base):
         if estado:
             tablero.estado = estado
         
+        al_confirmar(lambda: cache_tableros.invalidar(id))
         session.commit()
         return tablero.to_dict()
     
     @classmethod
-    def eliminar_tablero(cls, id):
-        tablero = session.query(cls).filter_by(id=id).first()
-        session.delete(tablero)
+    @escritura
+    def clonar_tablero(cls, id, nombre=None, descripcion=None, fecha_entrega=None, estado=None,
+                       desplazar_dias=0, fases=None, sin_personas=False, reiniciar_estado=False):
+        """
+        Duplica el tablero y sus tareas en una sola transacción.
+
+        Las tareas se copian con un único INSERT ... SELECT, sin pasar por el
+        ORM. `desplazar_dias` corre las fechas de las tareas y la entrega del
+        tablero; `fases` limita la copia a esas fases; `sin_personas` deja las
+        tareas sin asignar y `reiniciar_estado` las deja pendientes. Retorna
+        {'tablero', 'tareas'} o None si no existe; ValueError si algo es inválido.
+        """
+        from .tarea_m import Tarea, _parsear_fecha, _parsear_id
+        from .fase_m import Fase
+
+        if isinstance(desplazar_dias, bool) or not isinstance(desplazar_dias, int):
+            raise ValueError("El campo desplazar_dias debe ser un entero")
+        if fases is not None:
+            if not isinstance(fases, list):
+                raise ValueError("El campo fases debe ser una lista de IDs")
+            fases = {_parsear_id(fase_id, 'fases', True) for fase_id in fases}
+            faltantes = fases - set(session.scalars(select(Fase.id).where(Fase.id.in_(fases))))
+            if faltantes:
+                raise ValueError(f"No existen las fases: {sorted(faltantes)}")
+
+        original = session.query(cls).filter_by(id=id).first()
+        if not original:
+            return None
+        desplazamiento = timedelta(days=desplazar_dias)
+        if fecha_entrega is None and original.fecha_entrega:
+            fecha_entrega = original.fecha_entrega + desplazamiento
+        copia = cls(nombre=nombre or f"{original.nombre} (copia)",
+                    descripcion=original.descripcion if descripcion is None else descripcion,
+                    fecha_entrega=_parsear_fecha(fecha_entrega, 'fecha_entrega'),
+                    estado=estado or original.estado)
+        session.add(copia)
+        session.flush()
+
+        def desplazar(columna):
+            # Se mueve solo la fecha y se conserva el resto del texto (hora y
+            # microsegundos) para que la columna mantenga el formato del ORM
+            if not desplazar_dias:
+                return columna
+            return func.date(columna, f"{desplazar_dias:+d} days").concat(func.substr(columna, 11))
+
+        columnas = {
+            "nombre": Tarea.nombre,
+            "descripcion": Tarea.descripcion,
+            "fecha_creacion": literal(datetime.now(), DateTime),
+            "fecha_inicio": desplazar(Tarea.fecha_inicio),
+            "fecha_fin": desplazar(Tarea.fecha_fin),
+            "estado": literal("pendiente") if reiniciar_estado else Tarea.estado,
+            "fase_id": Tarea.fase_id,
+            "persona_id": null() if sin_personas else Tarea.persona_id,
+            "tablero_id": literal(copia.id),
+        }
+        origen = select(*columnas.values()).where(Tarea.tablero_id == id).order_by(Tarea.id)
+        if fases is not None:
+            origen = origen.where(Tarea.fase_id.in_(fases))
+        tareas = session.execute(insert(Tarea).from_select(list(columnas), origen)).rowcount
+
+        nuevo_id = copia.id
+        al_confirmar(lambda: cache_tableros.invalidar(nuevo_id))
         session.commit()
-        return True
-    
+        return {"tablero": copia.to_dict(), "tareas": tareas}
+
     @classmethod
+    @escritura
     def eliminar_tablero(cls, id):
+        # Las tareas las borra la base (ON DELETE CASCADE); el ORM no las carga
         tablero = session.query(cls).filter_by(id=id).first()
         if not tablero:
             return False
         session.delete(tablero)
+        al_confirmar(lambda: cache_tableros.invalidar(id))
+        publicar_al_confirmar(id, "tablero_eliminado", {"id": id})
         session.commit()
         return True
+
+    @classmethod
+    def restaurar_tablero(cls, id):
+        """
+        Devuelve un tablero archivado, y sus tareas, a las tablas activas (ver
+        archivo.py). Retorna {'tablero', 'tareas', 'pendientes'} o None si no
+        está archivado.
+        """
+        from .archivo import restaurar_tablero
+
+        restaurado = restaurar_tablero(id)
+        if not restaurado:
+            return None
+        return {"tablero": cls.obtener_tablero_por_id(id), "tareas": restaurado["tareas"],
+                "pendientes": restaurado["pendientes"]}
+
+    @classmethod
+    def purgar_tablero(cls, id):
+        """
+        Crea el trabajo que elimina el tablero en segundo plano: sus tareas por
+        lotes y después el tablero (ver purga.py). Retorna el trabajo o None si no existe.
+        """
+        from .trabajos import Trabajo
+
+        if not session.query(cls.id).filter_by(id=id).first():
+            return None
+        return Trabajo.crear_trabajo("purgar_tablero", tablero_id=id)
+
+
+serializar_tablero = crear_serializador(Tablero)
+
+# Tableros completados (ver archivo.py)
+tablero_archivado = tabla_archivo(Tablero.__table__, "tablero_archivado")
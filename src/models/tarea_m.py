@@ -1,10 +1,57 @@
 from . import Base, session
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from .paginacion import paginar, columnas_con_orden
+from .escritura import escritura
+from .eventos import bus_eventos, publicar_al_confirmar, eventos_cambio_tarea
+from .serializacion import crear_serializador, elegir_campos
+from .archivo import tabla_archivo, con_archivadas
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, insert, select, update
+from sqlalchemy.orm import relationship, joinedload, selectinload, load_only
 from datetime import datetime
 
+ESTADOS_TAREA = ("pendiente", "en_progreso", "completada")
+
+# Columnas por las que se permite ordenar el listado (?sort=campo,-otro)
+COLUMNAS_ORDENABLES = ("id", "nombre", "fecha_creacion", "fecha_inicio", "fecha_fin",
+                       "estado", "fase_id", "persona_id", "tablero_id")
+
+# Relaciones que se pueden embeber en cada tarea con ?include=
+INCLUSIONES_TAREA = ("persona", "fase", "tablero")
+
+# Máximo de tareas aceptadas en una sola carga masiva
+MAX_TAREAS_BULK = 10000
+# ...y como trabajo en segundo plano, que inserta por lotes (ver trabajos.py)
+MAX_TAREAS_BULK_EN_SEGUNDO_PLANO = 100000
+
+def _parsear_fecha(valor, campo):
+    if valor is None or isinstance(valor, datetime):
+        return valor
+    try:
+        return datetime.fromisoformat(str(valor).replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Formato de {campo} inválido. Use formato ISO 8601")
+
+def _parsear_id(valor, campo, requerido):
+    if valor is None and not requerido:
+        return None
+    if isinstance(valor, bool) or not isinstance(valor, int):
+        raise ValueError(f"El campo {campo} debe ser un entero")
+    return valor
+
 class Tarea(Base):
     __tablename__ = "tarea"
+    # Índices compuestos para que los filtros del listado sean búsquedas por índice.
+    # SQLite agrega el rowid (id) al final de cada índice, lo que también sirve
+    # para el orden por id de la paginación. AUTOINCREMENT: un id archivado
+    # (ver archivo.py) no se reutiliza.
+    __table_args__ = (
+        Index("ix_tarea_tablero_fase", "tablero_id", "fase_id"),
+        Index("ix_tarea_fase", "fase_id"),
+        Index("ix_tarea_persona_fecha_fin", "persona_id", "fecha_fin"),
+        Index("ix_tarea_estado_fecha_fin", "estado", "fecha_fin"),
+        Index("ix_tarea_fecha_inicio", "fecha_inicio"),
+        Index("ix_tarea_fecha_fin", "fecha_fin"),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String, nullable=False)
@@ -12,11 +59,14 @@ class Tarea(Base):
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_inicio = Column(DateTime, nullable=False)
     fecha_fin = Column(DateTime, nullable=True) # Can be null if not yet finished
+    estado = Column(String, default="pendiente", server_default="pendiente", nullable=False) # 'pendiente', 'en_progreso', 'completada'
 
     # Foreign Keys
-    fase_id = Column(Integer, ForeignKey("fase.id"), nullable=False)
-    persona_id = Column(Integer, ForeignKey("persona.id"), nullable=True) # Can be null if not yet assigned
-    tablero_id = Column(Integer, ForeignKey("tablero.id"), nullable=False)
+    # ON DELETE CASCADE: borrar un tablero, una fase o una persona elimina sus
+    # tareas en la propia base (PRAGMA foreign_keys=ON), sin cargarlas en el ORM
+    fase_id = Column(Integer, ForeignKey("fase.id", ondelete="CASCADE"), nullable=False)
+    persona_id = Column(Integer, ForeignKey("persona.id", ondelete="CASCADE"), nullable=True) # Can be null if not yet assigned
+    tablero_id = Column(Integer, ForeignKey("tablero.id", ondelete="CASCADE"), nullable=False)
 
     # Relationships
     fase_asociada = relationship("Fase", back_populates="tareas_asociadas")
@@ -24,17 +74,7 @@ class Tarea(Base):
     tablero_asociado = relationship("Tablero", back_populates="tareas")
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "nombre": self.nombre,
-            "descripcion": self.descripcion,
-            "fecha_creacion": self.fecha_creacion.isoformat(),
-            "fecha_inicio": self.fecha_inicio.isoformat(),
-            "fecha_fin": self.fecha_fin.isoformat() if self.fecha_fin else None,
-            "fase_id": self.fase_id,
-            "persona_id": self.persona_id,
-            "tablero_id": self.tablero_id
-        }
+        return serializar_tarea(self)
     
     def __repr__(self):
         return (f"<Tarea(id={self.id}, nombre='{self.nombre}', "
@@ -42,32 +82,305 @@ class Tarea(Base):
                 f"persona_id={self.persona_id})>")
     
     @classmethod
-    def crear_tarea(cls, nombre, descripcion, fecha_inicio, fecha_fin, fase_id, persona_id, tablero_id):
+    @escritura
+    def crear_tarea(cls, nombre, descripcion, fecha_inicio, fecha_fin, fase_id, persona_id, tablero_id,
+                    estado="pendiente"):
         nueva_tarea = cls(nombre=nombre, descripcion=descripcion,
                           fecha_inicio=fecha_inicio, fecha_fin= fecha_fin, fase_id=fase_id,
-                          persona_id=persona_id, tablero_id=tablero_id)
+                          persona_id=persona_id, tablero_id=tablero_id, estado=estado)
         session.add(nueva_tarea)
+        session.flush()
+        tarea = nueva_tarea.to_dict()
+        publicar_al_confirmar(tablero_id, "tarea_creada", tarea)
         session.commit()
-        return nueva_tarea.to_dict()
+        return tarea
     
     @classmethod
-    def obtener_tarea_por_id(cls, id):
-        tarea = session.query(cls).filter(cls.id == id).first()
+    def validar_datos(cls, data):
+        """Valida un elemento de entrada y retorna los valores listos para insertar."""
+        if not isinstance(data, dict):
+            raise ValueError("Cada tarea debe ser un objeto")
+        if not data.get('nombre'):
+            raise ValueError("El campo nombre es requerido")
+        if not data.get('fecha_inicio'):
+            raise ValueError("El campo fecha_inicio es requerido")
+        estado = data.get('estado') or "pendiente"
+        if estado not in ESTADOS_TAREA:
+            raise ValueError(f"Estado inválido. Use: {', '.join(ESTADOS_TAREA)}")
+        return {
+            "nombre": data['nombre'],
+            "descripcion": data.get('descripcion', ''),
+            "fecha_inicio": _parsear_fecha(data['fecha_inicio'], 'fecha_inicio'),
+            "fecha_fin": _parsear_fecha(data.get('fecha_fin'), 'fecha_fin'),
+            "estado": estado,
+            "fase_id": _parsear_id(data.get('fase_id'), 'fase_id', True),
+            "tablero_id": _parsear_id(data.get('tablero_id'), 'tablero_id', True),
+            "persona_id": _parsear_id(data.get('persona_id'), 'persona_id', False),
+        }
+
+    @classmethod
+    @escritura
+    def crear_tareas_bulk(cls, items):
+        """
+        Crea muchas tareas en una sola transacción.
+
+        Todos los elementos se validan antes de escribir (incluidas las referencias
+        a fase, tablero y persona, con una consulta por tabla) y los válidos se
+        insertan con INSERT de múltiples filas. Retorna un resultado por elemento,
+        en el mismo orden: {'indice', 'id'} o {'indice', 'error'}.
+        """
+        from .fase_m import Fase
+        from .tablero_m import Tablero
+        from .persona_m import Persona
+
+        resultados = [None] * len(items)
+        validos = []
+        for indice, data in enumerate(items):
+            try:
+                validos.append((indice, cls.validar_datos(data)))
+            except ValueError as e:
+                resultados[indice] = {"indice": indice, "error": str(e)}
+
+        referencias = (("fase_id", Fase), ("tablero_id", Tablero), ("persona_id", Persona))
+        existentes = {}
+        for campo, modelo in referencias:
+            ids = {valores[campo] for _, valores in validos if valores[campo] is not None}
+            existentes[campo] = set(session.scalars(
+                select(modelo.id).where(modelo.id.in_(ids)))) if ids else set()
+
+        filas, indices = [], []
+        for indice, valores in validos:
+            faltante = next((campo for campo, _ in referencias
+                             if valores[campo] is not None and valores[campo] not in existentes[campo]), None)
+            if faltante:
+                resultados[indice] = {"indice": indice,
+                                      "error": f"No existe el registro con {faltante}={valores[faltante]}"}
+                continue
+            filas.append(valores)
+            indices.append(indice)
+
+        if filas:
+            # render_nulls: sin él el ORM omite las columnas en None y parte el
+            # lote cada vez que cambian. sort_by_parameter_order no tiene centinela
+            # en SQLite y degrada a un INSERT por fila; con el lock de escritura
+            # tomado los rowid nuevos crecen en el orden de VALUES, así que
+            # ordenados corresponden a las filas.
+            ids = sorted(session.scalars(insert(cls).returning(cls.id), filas,
+                                         execution_options={"render_nulls": True}).all())
+            for id, valores in zip(ids, filas):
+                publicar_al_confirmar(valores["tablero_id"], "tarea_creada", {"id": id, **valores})
+            session.commit()
+            for indice, id in zip(indices, ids):
+                resultados[indice] = {"indice": indice, "id": id}
+        return resultados
+
+    @classmethod
+    @escritura
+    def mover_tareas(cls, movimientos):
+        """
+        Mueve un lote de tareas de fase (y opcionalmente de persona) de forma atómica.
+
+        `movimientos` es una lista de {'id', 'fase_id', 'persona_id'?}. Se valida
+        todo antes de escribir y se ejecuta un UPDATE ... WHERE id IN (...) por cada
+        destino distinto, todo en una sola transacción. Lanza ValueError si algún
+        elemento es inválido; en ese caso no se modifica ninguna tarea.
+        """
+        from .fase_m import Fase
+        from .persona_m import Persona
+
+        destinos = {}
+        vistos = set()
+        for indice, mov in enumerate(movimientos):
+            if not isinstance(mov, dict):
+                raise ValueError(f"Elemento {indice}: cada movimiento debe ser un objeto")
+            try:
+                id = _parsear_id(mov.get('id'), 'id', True)
+                fase_id = _parsear_id(mov.get('fase_id'), 'fase_id', True)
+                persona_id = _parsear_id(mov.get('persona_id'), 'persona_id', False)
+            except ValueError as e:
+                raise ValueError(f"Elemento {indice}: {e}")
+            if id in vistos:
+                raise ValueError(f"La tarea {id} aparece más de una vez")
+            vistos.add(id)
+            # Sin 'persona_id' se conserva la persona; con null se desasigna
+            clave = (fase_id, 'persona_id' in mov, persona_id)
+            destinos.setdefault(clave, []).append(id)
+
+        actuales = {fila.id: fila for fila in session.execute(
+            select(cls.id, cls.tablero_id, cls.fase_id, cls.persona_id).where(cls.id.in_(vistos)))}
+        faltantes = vistos - actuales.keys()
+        if faltantes:
+            raise ValueError(f"No existen las tareas: {sorted(faltantes)}")
+        fases = {fase_id for fase_id, _, _ in destinos}
+        faltantes = fases - set(session.scalars(select(Fase.id).where(Fase.id.in_(fases))))
+        if faltantes:
+            raise ValueError(f"No existen las fases: {sorted(faltantes)}")
+        personas = {persona_id for _, _, persona_id in destinos if persona_id is not None}
+        faltantes = personas - set(session.scalars(select(Persona.id).where(Persona.id.in_(personas))))
+        if faltantes:
+            raise ValueError(f"No existen las personas: {sorted(faltantes)}")
+
+        try:
+            for (fase_id, cambia_persona, persona_id), ids in destinos.items():
+                valores = {"fase_id": fase_id}
+                if cambia_persona:
+                    valores["persona_id"] = persona_id
+                session.execute(update(cls).where(cls.id.in_(ids)).values(**valores)
+                                .execution_options(synchronize_session=False))
+                for id in ids:
+                    actual = actuales[id]
+                    publicar_al_confirmar(actual.tablero_id, "tarea_movida",
+                                          {"id": id, "fase_id": fase_id, "fase_id_anterior": actual.fase_id,
+                                           "persona_id": valores.get("persona_id", actual.persona_id)})
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return sorted(vistos)
+
+    @classmethod
+    def obtener_tarea_por_id(cls, id, campos=None, include=None, incluir_archivadas=False):
+        serializar = elegir_campos(serializar_tarea, campos)
+        origen = cls._origen(incluir_archivadas)
+        tarea = cls._consulta(serializar, [], include, origen).filter(origen.id == id).first()
         if tarea:
-            return tarea.to_dict()
+            return cls._serializador(serializar, include)(tarea)
         else:
             return None
         
     @classmethod
-    def listar_tareas(cls):
-        tareas = session.query(cls).all()
-        return [tarea.to_dict() for tarea in tareas]
+    def listar_tareas(cls, limit=None, after=None, sort=None, tablero_id=None, fase_id=None,
+                      persona_id=None, estado=None, fecha_inicio_desde=None, fecha_inicio_hasta=None,
+                      fecha_fin_desde=None, fecha_fin_hasta=None, campos=None, include=None,
+                      incluir_archivadas=False):
+        """
+        Página de tareas filtradas. Con `campos` solo se consultan y devuelven
+        esas columnas (más las de orden, que necesita el cursor). `include`
+        embebe las relaciones de INCLUSIONES_TAREA sin una consulta por tarea.
+        Con `incluir_archivadas` también se buscan en tarea_archivada.
+        """
+        serializar = elegir_campos(serializar_tarea, campos)
+        origen = cls._origen(incluir_archivadas)
+        orden = cls.ordenamiento(sort, origen)
+        query = cls.filtrar(cls._consulta(serializar, orden, include, origen),
+                            tablero_id=tablero_id, fase_id=fase_id, persona_id=persona_id, estado=estado,
+                            fecha_inicio_desde=fecha_inicio_desde, fecha_inicio_hasta=fecha_inicio_hasta,
+                            fecha_fin_desde=fecha_fin_desde, fecha_fin_hasta=fecha_fin_hasta, origen=origen)
+        tareas, siguiente = paginar(query, orden, limit, after)
+        return list(map(cls._serializador(serializar, include), tareas)), siguiente
+
+    @classmethod
+    def _origen(cls, incluir_archivadas):
+        """La entidad a consultar: Tarea, o Tarea más el archivo (ver archivo.py)."""
+        return con_archivadas(cls, tarea_archivada) if incluir_archivadas else cls
+
+    @classmethod
+    def _relaciones(cls, include, origen=None):
+        """[(nombre, relación, estrategia de carga, serializador)] para los nombres de `include`."""
+        from .persona_m import serializar_persona
+        from .fase_m import serializar_fase
+        from .tablero_m import serializar_tablero
+
+        desconocidas = [nombre for nombre in include if nombre not in INCLUSIONES_TAREA]
+        if desconocidas:
+            raise ValueError(f"No se puede incluir '{', '.join(desconocidas)}'. "
+                             f"Valores válidos: {', '.join(INCLUSIONES_TAREA)}")
+        origen = origen or cls
+        relaciones = {
+            # Casi una persona distinta por tarea: va en la misma consulta con un JOIN
+            "persona": (origen.asignado_a, joinedload, serializar_persona),
+            # Pocas fases y tableros repetidos en muchas tareas: una consulta IN (...) por relación
+            "fase": (origen.fase_asociada, selectinload, serializar_fase),
+            "tablero": (origen.tablero_asociado, selectinload, serializar_tablero),
+        }
+        return [(nombre, *relaciones[nombre]) for nombre in INCLUSIONES_TAREA if nombre in include]
+
+    @classmethod
+    def _consulta(cls, serializar, orden, include=None, origen=None):
+        """
+        Sin `include`, un select de las columnas del serializador (y las de orden).
+        Con `include` se cargan instancias limitadas a esas mismas columnas, más
+        las claves foráneas, y cada relación pedida con su estrategia de carga.
+        `origen` es la entidad consultada (ver _origen).
+        """
+        origen = origen or cls
+        columnas = columnas_con_orden([getattr(origen, columna.key) for columna in serializar.columnas], orden)
+        if not include:
+            return session.query(*columnas)
+        relaciones = cls._relaciones(include, origen)
+        claves = {columna.key for columna in columnas} | {"id", "fase_id", "persona_id", "tablero_id"}
+        opciones = [load_only(*[getattr(origen, clave) for clave in sorted(claves)])]
+        for _, relacion, carga, serializar_relacion in relaciones:
+            modelo = relacion.property.mapper.class_
+            opciones.append(carga(relacion).load_only(
+                *[getattr(modelo, columna.key) for columna in serializar_relacion.columnas]))
+        return session.query(origen).options(*opciones)
+
+    @classmethod
+    def _serializador(cls, serializar, include=None):
+        if not include:
+            return serializar
+        relaciones = [(nombre, relacion.key, serializar_relacion)
+                      for nombre, relacion, _, serializar_relacion in cls._relaciones(include)]
+
+        def serializar_con_relaciones(tarea):
+            datos = serializar(tarea)
+            for nombre, atributo, serializar_relacion in relaciones:
+                relacionado = getattr(tarea, atributo)
+                datos[nombre] = serializar_relacion(relacionado) if relacionado is not None else None
+            return datos
+        return serializar_con_relaciones
+
+    @classmethod
+    def filtrar(cls, query, tablero_id=None, fase_id=None, persona_id=None, estado=None,
+                fecha_inicio_desde=None, fecha_inicio_hasta=None, fecha_fin_desde=None,
+                fecha_fin_hasta=None, origen=None):
+        """Aplica los filtros del listado a un Query o a un select()."""
+        origen = origen or cls
+        if tablero_id is not None:
+            query = query.filter(origen.tablero_id == tablero_id)
+        if fase_id is not None:
+            query = query.filter(origen.fase_id == fase_id)
+        if persona_id is not None:
+            query = query.filter(origen.persona_id == persona_id)
+        if estado is not None:
+            query = query.filter(origen.estado == estado)
+        if fecha_inicio_desde is not None:
+            query = query.filter(origen.fecha_inicio >= fecha_inicio_desde)
+        if fecha_inicio_hasta is not None:
+            query = query.filter(origen.fecha_inicio <= fecha_inicio_hasta)
+        if fecha_fin_desde is not None:
+            query = query.filter(origen.fecha_fin >= fecha_fin_desde)
+        if fecha_fin_hasta is not None:
+            query = query.filter(origen.fecha_fin <= fecha_fin_hasta)
+        return query
+
+    @classmethod
+    def ordenamiento(cls, sort, origen=None):
+        # "fase_id,-fecha_fin" -> [(fase_id, asc), (fecha_fin, desc), (id, asc)]
+        origen = origen or cls
+        orden = []
+        for campo in (sort or "").split(","):
+            campo = campo.strip()
+            if not campo:
+                continue
+            descendente = campo.startswith("-")
+            nombre = campo.lstrip("-")
+            if nombre not in COLUMNAS_ORDENABLES:
+                raise ValueError(f"No se puede ordenar por '{nombre}'. "
+                                 f"Campos válidos: {', '.join(COLUMNAS_ORDENABLES)}")
+            orden.append((getattr(origen, nombre), descendente))
+        if not any(columna.key == "id" for columna, _ in orden):
+            orden.append((origen.id, False))
+        return orden
     
     @classmethod
+    @escritura
     def actualizar_tarea(cls, id, nombre=None, descripcion=None, fecha_inicio=None,
-                         fecha_fin=None, fase_id=None, persona_id=None, tablero_id=None):
+                         fecha_fin=None, fase_id=None, persona_id=None, tablero_id=None, estado=None):
         tarea = session.query(cls).filter(cls.id == id).first()
         if tarea:
+            anterior = (tarea.tablero_id, tarea.fase_id)
             if nombre:
                 tarea.nombre = nombre
             if descripcion:
@@ -82,17 +395,64 @@ class Tarea(Base):
                 tarea.persona_id = persona_id
             if tablero_id:
                 tarea.tablero_id = tablero_id
-            session.commit()
-            return tarea.to_dict()
+            if estado:
+                tarea.estado = estado
+            return cls._confirmar_cambio(tarea, anterior)
         else:
             return None
         
     @classmethod
+    @escritura
+    def modificar_tarea(cls, id, **cambios):
+        """Asigna tal cual los campos recibidos (incluido None); a diferencia de actualizar_tarea."""
+        tarea = session.query(cls).filter(cls.id == id).first()
+        if not tarea:
+            return None
+        anterior = (tarea.tablero_id, tarea.fase_id)
+        for campo, valor in cambios.items():
+            setattr(tarea, campo, valor)
+        return cls._confirmar_cambio(tarea, anterior)
+
+    @classmethod
+    def _confirmar_cambio(cls, tarea, anterior):
+        """Confirma la edición de `tarea` y publica sus eventos; `anterior` es (tablero_id, fase_id)."""
+        session.flush()
+        datos = tarea.to_dict()
+        for evento in eventos_cambio_tarea(anterior, datos):
+            publicar_al_confirmar(*evento)
+        session.commit()
+        return datos
+
+    @classmethod
+    @escritura
     def eliminar_tarea(cls, id):
         tarea = session.query(cls).filter(cls.id == id).first()
         if tarea:
+            publicar_al_confirmar(tarea.tablero_id, "tarea_eliminada", {"id": id})
             session.delete(tarea)
             session.commit()
             return True
         else:
             return False
+
+    @classmethod
+    def restaurar_tarea(cls, id):
+        """
+        Devuelve una tarea archivada a la tabla activa (ver archivo.py). Retorna
+        la tarea o None si no está archivada; ValueError si no se puede restaurar.
+        """
+        from .archivo import restaurar_tarea
+
+        if not restaurar_tarea(id):
+            return None
+        tarea = cls.obtener_tarea_por_id(id)
+        bus_eventos.publicar(tarea["tablero_id"], "tarea_creada", tarea)
+        return tarea
+
+
+# Serializador compilado desde las columnas (ver serializacion.py)
+serializar_tarea = crear_serializador(Tarea)
+
+# Tareas terminadas hace tiempo (ver archivo.py)
+tarea_archivada = tabla_archivo(Tarea.__table__, "tarea_archivada",
+                                Index("ix_tarea_archivada_tablero", "tablero_id"))
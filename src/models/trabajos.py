@@ -0,0 +1,283 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from . import Base, engine, session
+from .escritura import escritura, al_confirmar
+from sqlalchemy import Column, Integer, String, DateTime, Text, delete, select, update
+
+# Trabajos en segundo plano: las operaciones pesadas (purgar un tablero, crear
+# decenas de miles de tareas) se registran en la tabla `trabajo` y las ejecuta
+# un pool acotado de TRABAJOS_HILOS hilos. La petición responde 202 con el id
+# y el cliente consulta el avance en GET /api/v1/jobs/<id>. El estado vive en
+# SQLite: al reiniciar se retoman los pendientes.
+TRABAJOS_HILOS = int(os.environ.get("TRABAJOS_HILOS", 2))
+# Tareas por transacción en la carga masiva en segundo plano
+TRABAJOS_TAMANO_LOTE = int(os.environ.get("TRABAJOS_TAMANO_LOTE", 1000))
+# Los trabajos terminados se borran al arrancar pasado este plazo
+TRABAJOS_RETENCION_DIAS = int(os.environ.get("TRABAJOS_RETENCION_DIAS", 7))
+# Cada proceso renueva cada TRABAJOS_LATIDO_S el `latido` de los trabajos que
+# ejecuta. Un trabajo en curso sin latido hace TRABAJOS_VENCIMIENTO_S quedó
+# huérfano (su proceso murió) y cualquier proceso lo retoma
+TRABAJOS_LATIDO_S = float(os.environ.get("TRABAJOS_LATIDO_S", 10))
+TRABAJOS_VENCIMIENTO_S = float(os.environ.get("TRABAJOS_VENCIMIENTO_S", 60))
+
+ESTADOS_TRABAJO = ("pendiente", "en_curso", "completado", "fallido")
+
+logger = logging.getLogger(__name__)
+
+
+class Trabajo(Base):
+    __tablename__ = "trabajo"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String, nullable=False)
+    estado = Column(String, default="pendiente", nullable=False, index=True)
+    parametros = Column(Text, nullable=True)  # JSON; se descarta al completarse
+    progreso = Column(Integer, default=0, nullable=False)
+    total = Column(Integer, nullable=True)
+    resultado = Column(Text, nullable=True)  # JSON
+    error = Column(Text, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
+    fecha_inicio = Column(DateTime, nullable=True)
+    fecha_fin = Column(DateTime, nullable=True)
+    latido = Column(DateTime, nullable=True)  # Última señal del proceso que lo ejecuta
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "estado": self.estado,
+            "progreso": self.progreso,
+            "total": self.total,
+            "resultado": json.loads(self.resultado) if self.resultado else None,
+            "error": self.error,
+            "fecha_creacion": self.fecha_creacion,
+            "fecha_inicio": self.fecha_inicio,
+            "fecha_fin": self.fecha_fin,
+        }
+
+    def __repr__(self):
+        return f"<Trabajo(id={self.id}, tipo='{self.tipo}', estado='{self.estado}')>"
+
+    @classmethod
+    @escritura
+    def crear_trabajo(cls, tipo, **parametros):
+        """
+        Registra un trabajo y lo envía al pool cuando la transacción se confirma.
+
+        Lanza ValueError si el tipo no existe.
+        """
+        if tipo not in _TIPOS:
+            raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+        trabajo = cls(tipo=tipo, estado="pendiente", parametros=json.dumps(parametros))
+        session.add(trabajo)
+        session.flush()
+        id = trabajo.id
+        al_confirmar(lambda: _ejecutor().submit(_ejecutar, id))
+        session.commit()
+        return trabajo.to_dict()
+
+    @classmethod
+    def obtener_trabajo(cls, id):
+        trabajo = session.query(cls).filter_by(id=id).first()
+        return trabajo.to_dict() if trabajo else None
+
+
+# Tipos de trabajo: nombre -> (función, reanudable). La función recibe
+# `avance` y los parámetros con que se creó el trabajo, y retorna el resultado
+# (serializable a JSON). Un trabajo reanudable es idempotente: si un reinicio
+# lo interrumpe se vuelve a ejecutar; si no, queda fallido.
+_TIPOS = {}
+
+
+def tipo_trabajo(nombre, reanudable=False):
+    def registrar(funcion):
+        _TIPOS[nombre] = (funcion, reanudable)
+        return funcion
+    return registrar
+
+
+_pool = None
+_latidos = None
+_candado = threading.Lock()
+# Trabajos que se están ejecutando en este proceso
+_en_curso = set()
+
+
+def _ejecutor():
+    global _pool
+    with _candado:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=TRABAJOS_HILOS, thread_name_prefix="trabajo")
+    _iniciar_latidos()
+    return _pool
+
+
+def _iniciar_latidos():
+    global _latidos
+    with _candado:
+        if _latidos is None:
+            _latidos = threading.Thread(target=_latir, name="latido-trabajos", daemon=True)
+            _latidos.start()
+        return _latidos
+
+
+def _latir():
+    # Renueva el latido de los trabajos de este proceso y retoma los huérfanos
+    while True:
+        time.sleep(TRABAJOS_LATIDO_S)
+        try:
+            with _candado:
+                ids = list(_en_curso)
+            if ids:
+                with engine.begin() as conn:
+                    conn.execute(update(Trabajo).where(Trabajo.id.in_(ids), Trabajo.estado == "en_curso")
+                                 .values(latido=datetime.now()))
+            for id in _recuperar(engine):
+                _ejecutor().submit(_ejecutar, id)
+        except Exception:
+            logger.exception("Error al renovar el latido de los trabajos")
+
+
+def _recuperar(engine):
+    """
+    Retoma los trabajos en curso cuyo latido venció: los reanudables vuelven a
+    pendiente y el resto queda fallido. Retorna los ids que volvieron a pendiente.
+
+    Cada UPDATE vuelve a comprobar el vencimiento, así que si varios procesos
+    recuperan a la vez cada trabajo se retoma una sola vez.
+    """
+    vencido = (Trabajo.estado == "en_curso") & (
+        Trabajo.latido.is_(None) | (Trabajo.latido < datetime.now() - timedelta(seconds=TRABAJOS_VENCIMIENTO_S)))
+    reanudables = [tipo for tipo, (_, reanudable) in _TIPOS.items() if reanudable]
+    with engine.begin() as conn:
+        ids = conn.execute(
+            update(Trabajo).where(vencido, Trabajo.tipo.in_(reanudables))
+            .values(estado="pendiente", fecha_inicio=None, latido=None)
+            .returning(Trabajo.id)
+        ).scalars().all()
+        conn.execute(update(Trabajo).where(vencido).values(
+            estado="fallido", error="Interrumpido por un reinicio", fecha_fin=datetime.now()))
+    return ids
+
+
+def _actualizar(id, **valores):
+    # Las funciones de trabajo confirman su propio avance antes de reportarlo: se
+    # cierra la sesión del hilo para no retener la conexión del escritor
+    session.remove()
+    with engine.begin() as conn:
+        conn.execute(update(Trabajo).where(Trabajo.id == id).values(**valores))
+
+
+def _ejecutar(id):
+    with engine.begin() as conn:
+        # Tomarlo es atómico: si otro hilo o proceso ya lo empezó, no se repite
+        trabajo = conn.execute(
+            update(Trabajo).where(Trabajo.id == id, Trabajo.estado == "pendiente")
+            .values(estado="en_curso", fecha_inicio=datetime.now(), latido=datetime.now())
+            .returning(Trabajo.tipo, Trabajo.parametros)
+        ).first()
+    if trabajo is None:
+        return
+    with _candado:
+        _en_curso.add(id)
+
+    def avance(progreso, total=None):
+        valores = {"progreso": progreso, "latido": datetime.now()}
+        if total is not None:
+            valores["total"] = total
+        _actualizar(id, **valores)
+
+    try:
+        funcion, _ = _TIPOS[trabajo.tipo]
+        resultado = funcion(avance, **json.loads(trabajo.parametros or "{}"))
+    except Exception as e:
+        logger.exception("Error en el trabajo %s (%s)", id, trabajo.tipo)
+        session.rollback()
+        _actualizar(id, estado="fallido", error=str(e) or type(e).__name__, fecha_fin=datetime.now())
+    else:
+        _actualizar(id, estado="completado", resultado=json.dumps(resultado, default=str),
+                    parametros=None, fecha_fin=datetime.now())
+    finally:
+        with _candado:
+            _en_curso.discard(id)
+        session.remove()
+
+
+def iniciar_trabajos(engine):
+    """
+    Retoma los trabajos de una ejecución anterior y borra los terminados viejos.
+
+    Los pendientes se vuelven a encolar. De los que estaban en curso solo se
+    retoman los de latido vencido (ver _recuperar): puede haber otros procesos
+    vivos (el del reloader, otros workers) ejecutando los suyos. Los que venzan
+    después los retoma el hilo de latidos, que se inicia aquí aunque no haya
+    nada que ejecutar.
+    """
+    _iniciar_latidos()
+    with engine.begin() as conn:
+        conn.execute(delete(Trabajo).where(
+            Trabajo.estado.in_(("completado", "fallido")),
+            Trabajo.fecha_fin < datetime.now() - timedelta(days=TRABAJOS_RETENCION_DIAS)))
+    _recuperar(engine)
+    with engine.begin() as conn:
+        pendientes = conn.execute(select(Trabajo.id).where(Trabajo.estado == "pendiente")
+                                  .order_by(Trabajo.id)).scalars().all()
+    for id in pendientes:
+        _ejecutor().submit(_ejecutar, id)
+    return len(pendientes)
+
+
+@tipo_trabajo("purgar_tablero", reanudable=True)
+def _purgar_tablero(avance, tablero_id):
+    from .tablero_m import Tablero
+    from .tarea_m import Tarea
+    from .purga import purgar_tareas
+
+    avance(0, session.query(Tarea).filter_by(tablero_id=tablero_id).count())
+    tareas = purgar_tareas(Tarea.tablero_id, tablero_id, al_avanzar=avance)
+    return {"tablero_id": tablero_id, "tareas_eliminadas": tareas,
+            "eliminado": Tablero.eliminar_tablero(tablero_id)}
+
+
+@tipo_trabajo("purgar_persona", reanudable=True)
+def _purgar_persona(avance, persona_id):
+    from .persona_m import Persona
+    from .tarea_m import Tarea
+    from .purga import purgar_tareas
+
+    avance(0, session.query(Tarea).filter_by(persona_id=persona_id).count())
+    tareas = purgar_tareas(Tarea.persona_id, persona_id, al_avanzar=avance)
+    return {"persona_id": persona_id, "tareas_eliminadas": tareas,
+            "eliminado": Persona.eliminar_persona(persona_id)}
+
+
+@tipo_trabajo("crear_tareas_bulk")
+def _crear_tareas_bulk(avance, items):
+    # Por lotes de TRABAJOS_TAMANO_LOTE, cada uno en su transacción: a diferencia
+    # de POST /tareas/bulk, un error a mitad de camino deja creados los lotes previos
+    from .tarea_m import Tarea
+
+    avance(0, len(items))
+    resultados = []
+    for inicio in range(0, len(items), TRABAJOS_TAMANO_LOTE):
+        for resultado in Tarea.crear_tareas_bulk(items[inicio:inicio + TRABAJOS_TAMANO_LOTE]):
+            resultado["indice"] += inicio
+            resultados.append(resultado)
+        avance(len(resultados))
+    creadas = sum(1 for resultado in resultados if "id" in resultado)
+    return {"creadas": creadas, "errores": len(resultados) - creadas, "resultados": resultados}
+
+
+@tipo_trabajo("mover_tareas", reanudable=True)
+def _mover_tareas(avance, movimientos):
+    from .tarea_m import Tarea
+
+    avance(0, len(movimientos))
+    ids = Tarea.mover_tareas(movimientos)
+    avance(len(ids))
+    return {"movidas": len(ids), "ids": ids}
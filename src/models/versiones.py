@@ -0,0 +1,69 @@
+from . import Base, session
+from sqlalchemy import Column, Integer, String, select, text
+
+# Tablas cuyo contenido se versiona para los ETag de las peticiones GET
+TABLAS_VERSIONADAS = ("tarea", "tablero", "fase", "persona")
+
+
+class VersionTabla(Base):
+    """
+    Contador de cambios por tabla.
+
+    Lo incrementan triggers de SQLite en cada INSERT/UPDATE/DELETE, así que
+    cubre cualquier ruta de escritura (ORM, Core o SQL directo) y es
+    consistente entre varios procesos que compartan la misma base.
+    """
+    __tablename__ = "version_tabla"
+
+    tabla = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<VersionTabla(tabla='{self.tabla}', version={self.version})>"
+
+
+def instalar_versiones(engine):
+    """Crea (si no existen) las filas de versión y los triggers que las mantienen."""
+    with engine.begin() as conn:
+        for tabla in TABLAS_VERSIONADAS:
+            conn.execute(text("INSERT OR IGNORE INTO version_tabla (tabla, version) VALUES (:tabla, 0)"),
+                         {"tabla": tabla})
+            for operacion in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS trg_version_{tabla}_{operacion.lower()} "
+                    f"AFTER {operacion} ON {tabla} BEGIN "
+                    f"UPDATE version_tabla SET version = version + 1 WHERE tabla = '{tabla}'; "
+                    f"END"
+                ))
+
+
+def obtener_versiones(*tablas):
+    """Retorna {tabla: version} para las tablas pedidas con una sola consulta."""
+    return completar_versiones(session.execute(consulta_versiones(*tablas)).all(), tablas)
+
+
+def recordar_versiones(versiones):
+    """
+    Guarda en la sesión de la petición las versiones leídas para su ETag: los
+    caches (ver CacheLRU) validan sus entradas con ellas sin otra consulta, y
+    así el cuerpo nunca es más viejo que el ETag.
+    """
+    session.info.setdefault("versiones", {}).update(versiones)
+
+
+def versiones_leidas():
+    return session.info.get("versiones", {})
+
+
+def consulta_versiones(*tablas):
+    return select(VersionTabla.tabla, VersionTabla.version).where(VersionTabla.tabla.in_(tablas))
+
+
+def completar_versiones(filas, tablas):
+    versiones = dict(filas)
+    return {tabla: versiones.get(tabla, 0) for tabla in tablas}
+
+
+def etag_versiones(versiones):
+    """Valor del ETag para un {tabla: version}; igual en la API Flask y en la ASGI."""
+    return "-".join(f"{tabla}.{version}" for tabla, version in versiones.items())
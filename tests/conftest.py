@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+# La aplicación abre la base al importarse: hay que apuntarla a una base
+# temporal antes de importar app o src.models
+_directorio = tempfile.mkdtemp(prefix="gestor-tareas-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directorio, 'pruebas.db')}"
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from app import app as aplicacion
+from src.models import DATABASE_URL, engine, session
+from src.models.cache import CACHES
+from src.models.fase_m import Fase
+from src.models.persona_m import Persona
+from src.models.tablero_m import Tablero
+from src.models.tarea_m import Tarea
+
+# Orden de borrado entre pruebas: primero lo que referencia a lo demás. Los
+# resúmenes, el índice de búsqueda y version_tabla los ajustan los triggers.
+TABLAS = ("tarea", "tarea_archivada", "tablero_archivado", "tablero", "fase", "persona", "trabajo", "cambio")
+
+
+@pytest.fixture(autouse=True)
+def base_limpia():
+    yield
+    session.remove()
+    with engine.begin() as conn:
+        for tabla in TABLAS:
+            conn.execute(text(f"DELETE FROM {tabla}"))
+    for cache in CACHES.values():
+        cache.limpiar()
+
+
+@pytest.fixture
+def cliente():
+    return aplicacion.test_client()
+
+
+@pytest.fixture
+def consultas():
+    """Sentencias SQL ejecutadas mientras dura la prueba, en cualquier engine."""
+    sentencias = []
+
+    def al_ejecutar(conn, cursor, sentencia, parametros, contexto, varios):
+        sentencias.append(sentencia)
+
+    event.listen(Engine, "before_cursor_execute", al_ejecutar)
+    yield sentencias
+    event.remove(Engine, "before_cursor_execute", al_ejecutar)
+
+
+@pytest.fixture
+def esperar_trabajo(cliente):
+    """Consulta GET /api/v1/jobs/<id> hasta que el trabajo termina y lo retorna."""
+    def esperar(id, espera_s=10):
+        limite = time.monotonic() + espera_s
+        while True:
+            trabajo = cliente.get(f"/api/v1/jobs/{id}").get_json()
+            if trabajo["estado"] in ("completado", "fallido") or time.monotonic() > limite:
+                return trabajo
+            time.sleep(0.01)
+    return esperar
+
+
+@pytest.fixture
+def escribir_desde_otro_proceso():
+    """Ejecuta SQL con una conexión propia, como la CLI del archivo o la API ASGI."""
+    def escribir(sql, parametros=()):
+        conexion = sqlite3.connect(make_url(DATABASE_URL).database)
+        conexion.execute(sql, parametros)
+        conexion.commit()
+        conexion.close()
+    return escribir
+
+
+@pytest.fixture
+def crear_tablero():
+    def crear(nombre="Sprint", estado="activo", fecha_entrega=None, descripcion="Tablero de prueba"):
+        tablero = Tablero.crear_tablero(nombre, descripcion, fecha_entrega, estado)
+        session.remove()
+        return tablero
+    return crear
+
+
+@pytest.fixture
+def crear_fase():
+    def crear(nombre):
+        fase = Fase.crear_fase(nombre)
+        session.remove()
+        return fase
+    return crear
+
+
+@pytest.fixture
+def crear_persona():
+    def crear(nombre):
+        persona = Persona.crear_persona(nombre, f"{nombre.lower()}@ejemplo.com", "secreta")
+        session.remove()
+        return persona
+    return crear
+
+
+@pytest.fixture
+def crear_tarea():
+    def crear(tablero_id, fase_id, nombre="Tarea", persona_id=None, descripcion="",
+              fecha_inicio=datetime(2025, 1, 6, 9, 0), fecha_fin=None, estado="pendiente"):
+        tarea = Tarea.crear_tarea(nombre, descripcion, fecha_inicio, fecha_fin, fase_id, persona_id,
+                                  tablero_id, estado)
+        session.remove()
+        return tarea
+    return crear
+
+
+@pytest.fixture
+def fases(crear_fase):
+    """Las tres fases del tablero kanban, como [{'id', 'nombre'}]."""
+    return [crear_fase(nombre) for nombre in ("Por hacer", "En curso", "Hecho")]
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+import pytest
+from src.models.archivo import archivar, restaurar_tarea
+from src.models.fase_m import Fase
+from src.models.persona_m import Persona
+from src.models import session
+
+VIEJA = datetime.now() - timedelta(days=400)
+
+
+def ids(respuesta):
+    assert respuesta.status_code == 200
+    return sorted(fila["id"] for fila in respuesta.get_json())
+
+
+@pytest.fixture
+def tablero(crear_tablero, fases, crear_tarea):
+    """Un tablero activo con una tarea completada hace mucho, una reciente y una pendiente."""
+    tablero = crear_tablero()
+    return {
+        "tablero": tablero,
+        "vieja": crear_tarea(tablero["id"], fases[2]["id"], "Vieja", estado="completada", fecha_fin=VIEJA),
+        "reciente": crear_tarea(tablero["id"], fases[2]["id"], "Reciente", estado="completada",
+                                fecha_fin=datetime.now()),
+        "pendiente": crear_tarea(tablero["id"], fases[0]["id"], "Pendiente"),
+    }
+
+
+def test_archiva_solo_las_completadas_viejas(cliente, tablero):
+    assert archivar() == {"tareas": 1, "tableros": 0}
+    assert archivar() == {"tareas": 0, "tableros": 0}
+
+    activas = sorted([tablero["reciente"]["id"], tablero["pendiente"]["id"]])
+    assert ids(cliente.get("/api/v1/tareas/")) == activas
+    assert ids(cliente.get("/api/v1/tareas/?incluir_archivadas=true")) == sorted(activas + [tablero["vieja"]["id"]])
+    assert ids(cliente.get("/api/v1/tareas/estado/completada?incluir_archivadas=true")) == sorted(
+        [tablero["vieja"]["id"], tablero["reciente"]["id"]])
+    archivada = cliente.get(f"/api/v1/tareas/{tablero['vieja']['id']}?incluir_archivadas=true")
+    assert archivada.status_code == 200
+    assert archivada.get_json()["nombre"] == "Vieja"
+
+
+def test_archiva_los_tableros_completados_con_todas_sus_tareas(cliente, crear_tablero, fases, crear_tarea):
+    terminado, activo = crear_tablero("Terminado", estado="completado"), crear_tablero("Activo")
+    for _ in range(3):
+        crear_tarea(terminado["id"], fases[0]["id"])
+    crear_tarea(activo["id"], fases[0]["id"])
+
+    assert archivar(tamano_lote=2) == {"tareas": 3, "tableros": 1}
+
+    assert ids(cliente.get("/api/v1/tableros/")) == [activo["id"]]
+    assert ids(cliente.get("/api/v1/tableros/?incluir_archivadas=true")) == sorted([terminado["id"], activo["id"]])
+    assert cliente.get(f"/api/v1/tableros/{terminado['id']}?incluir_archivadas=true").status_code == 200
+    assert len(ids(cliente.get(f"/api/v1/tareas/?tablero_id={terminado['id']}"))) == 0
+    assert len(ids(cliente.get(f"/api/v1/tareas/?tablero_id={terminado['id']}&incluir_archivadas=true"))) == 3
+
+
+def test_los_ids_archivados_no_se_reutilizan(tablero, fases, crear_tarea):
+    ultima = crear_tarea(tablero["tablero"]["id"], fases[2]["id"], "Última", estado="completada", fecha_fin=VIEJA)
+    archivar()
+
+    nueva = crear_tarea(tablero["tablero"]["id"], fases[0]["id"], "Nueva")
+
+    assert nueva["id"] > ultima["id"]
+
+
+def test_restaurar_un_tablero(cliente, crear_tablero, fases, crear_fase, crear_tarea):
+    tablero = crear_tablero(estado="completado")
+    temporal = crear_fase("Temporal")
+    crear_tarea(tablero["id"], fases[0]["id"])
+    huerfana = crear_tarea(tablero["id"], temporal["id"], "Sin fase")
+    archivar()
+    Fase.eliminar_fase(temporal["id"])
+    session.remove()
+
+    respuesta = cliente.post(f"/api/v1/tableros/{tablero['id']}/restaurar")
+
+    assert respuesta.status_code == 200
+    assert (respuesta.get_json()["tareas"], respuesta.get_json()["pendientes"]) == (1, 1)
+    assert cliente.get(f"/api/v1/tableros/{tablero['id']}").get_json()["estado"] == "activo"
+    assert huerfana["id"] not in ids(cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}"))
+    assert cliente.post(f"/api/v1/tableros/{tablero['id']}/restaurar").status_code == 404
+
+
+def test_restaurar_una_tarea(cliente, tablero, crear_persona, crear_tarea):
+    beto = crear_persona("Beto")
+    asignada = crear_tarea(tablero["tablero"]["id"], tablero["vieja"]["fase_id"], "Asignada", persona_id=beto["id"],
+                           estado="completada", fecha_fin=VIEJA)
+    archivar()
+    Persona.eliminar_persona(beto["id"])
+    session.remove()
+
+    assert cliente.post(f"/api/v1/tareas/{asignada['id']}/restaurar").status_code == 200
+    restaurada = cliente.get(f"/api/v1/tareas/{asignada['id']}").get_json()
+    # La persona se eliminó mientras la tarea estaba archivada
+    assert restaurada["persona_id"] is None
+    assert restaurada["nombre"] == "Asignada"
+    assert cliente.post(f"/api/v1/tareas/{asignada['id']}/restaurar").status_code == 404
+
+
+def test_no_restaura_una_tarea_de_un_tablero_archivado(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero(estado="completado")
+    tarea = crear_tarea(tablero["id"], fases[0]["id"])
+    archivar()
+
+    respuesta = cliente.post(f"/api/v1/tareas/{tarea['id']}/restaurar")
+
+    assert respuesta.status_code == 400
+    assert "restaure primero el tablero" in respuesta.get_json()["message"]
+    with pytest.raises(ValueError):
+        restaurar_tarea(tarea["id"])
+
+
+def test_incluir_archivadas_invalido_responde_400(cliente):
+    assert cliente.get("/api/v1/tareas/?incluir_archivadas=quizas").status_code == 400
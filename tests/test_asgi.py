@@ -0,0 +1,75 @@
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app_asgi import app as aplicacion_asgi
+
+
+@pytest.fixture(scope="module")
+def cliente_asgi():
+    with TestClient(aplicacion_asgi) as cliente:
+        yield cliente
+
+
+def test_comparte_la_base_con_la_api_flask(cliente, cliente_asgi, crear_fase):
+    fase = crear_fase("Por hacer")
+    tablero = cliente_asgi.post("/api/v1/tableros/", json={"nombre": "Sprint"}).json()["tablero"]
+    respuesta = cliente_asgi.post("/api/v1/tareas/", json={
+        "nombre": "Desde ASGI", "fecha_inicio": "2025-01-06T09:00:00", "fase_id": fase["id"],
+        "tablero_id": tablero["id"]})
+
+    assert respuesta.status_code == 201
+    tarea = respuesta.json()["tarea"]
+    assert cliente.get(f"/api/v1/tareas/{tarea['id']}").get_json()["nombre"] == "Desde ASGI"
+    assert cliente_asgi.get(f"/api/v1/fases/{fase['id']}").json() == fase
+
+    cliente_asgi.put(f"/api/v1/tareas/{tarea['id']}", json={"estado": "completada", "fecha_fin": None})
+    assert cliente.get(f"/api/v1/tareas/{tarea['id']}").get_json()["estado"] == "completada"
+    assert cliente_asgi.delete(f"/api/v1/tareas/{tarea['id']}").status_code == 200
+    assert cliente_asgi.get(f"/api/v1/tareas/{tarea['id']}").status_code == 404
+
+
+def test_mismo_etag_y_304_que_la_api_flask(cliente, cliente_asgi, crear_tablero):
+    crear_tablero()
+    etag = cliente.get("/api/v1/tableros/").headers["ETag"]
+
+    assert cliente_asgi.get("/api/v1/tableros/").headers["ETag"] == etag
+    respuesta = cliente_asgi.get("/api/v1/tableros/", headers={"If-None-Match": etag})
+    assert respuesta.status_code == 304
+    assert respuesta.content == b""
+
+    cliente_asgi.post("/api/v1/tableros/", json={"nombre": "Otro"})
+    assert cliente.get("/api/v1/tableros/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_paginacion_filtros_y_errores(cliente_asgi, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    ids = [crear_tarea(tablero["id"], fases[i % 2]["id"], f"Tarea {i}")["id"] for i in range(5)]
+
+    pagina = cliente_asgi.get(f"/api/v1/tareas/?tablero_id={tablero['id']}&fase_id={fases[0]['id']}&limit=2")
+    assert [tarea["id"] for tarea in pagina.json()] == [ids[0], ids[2]]
+    siguiente = cliente_asgi.get(f"/api/v1/tareas/?tablero_id={tablero['id']}&fase_id={fases[0]['id']}"
+                                 f"&limit=2&after={pagina.headers['X-Next-Cursor']}")
+    assert [tarea["id"] for tarea in siguiente.json()] == [ids[4]]
+    assert "X-Next-Cursor" not in siguiente.headers
+
+    assert cliente_asgi.get("/api/v1/tareas/?sort=password").status_code == 400
+    assert cliente_asgi.get("/api/v1/tareas/?after=roto").status_code == 400
+    # Nombre de fase repetido: la restricción UNIQUE se traduce en 400
+    assert cliente_asgi.post("/api/v1/fases/", json={"nombre": fases[0]["nombre"]}).status_code == 400
+
+
+def test_atiende_lecturas_concurrentes(cliente_asgi, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    crear_tarea(tablero["id"], fases[0]["id"])
+
+    async def leer_en_paralelo():
+        transporte = httpx.ASGITransport(app=aplicacion_asgi)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://prueba") as cliente:
+            return await asyncio.gather(*[cliente.get(f"/api/v1/tableros/{tablero['id']}/board")
+                                          for _ in range(50)])
+
+    respuestas = asyncio.run(leer_en_paralelo())
+
+    assert {respuesta.status_code for respuesta in respuestas} == {200}
+    assert len({respuesta.content for respuesta in respuestas}) == 1
@@ -0,0 +1,50 @@
+from src.models import session
+from src.models.tablero_m import Tablero
+
+
+def test_agrupa_las_tareas_por_fase(cliente, crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    otro = crear_tablero("Otro")
+    ana = crear_persona("Ana")
+    primera = crear_tarea(tablero["id"], fases[1]["id"], "Primera", persona_id=ana["id"])
+    segunda = crear_tarea(tablero["id"], fases[1]["id"], "Segunda")
+    crear_tarea(otro["id"], fases[1]["id"], "De otro tablero")
+
+    respuesta = cliente.get(f"/api/v1/tableros/{tablero['id']}/board")
+
+    assert respuesta.status_code == 200
+    board = respuesta.get_json()
+    assert board["tablero"]["id"] == tablero["id"]
+    assert [fase["nombre"] for fase in board["fases"]] == ["Por hacer", "En curso", "Hecho"]
+    assert board["fases"][0]["tareas"] == board["fases"][2]["tareas"] == []
+    assert [(tarea["id"], tarea["persona_nombre"]) for tarea in board["fases"][1]["tareas"]] == [
+        (primera["id"], "Ana"), (segunda["id"], None)]
+
+
+def test_tres_consultas_sin_importar_la_cantidad_de_tareas(consultas, crear_tablero, fases, crear_persona,
+                                                           crear_tarea):
+    tablero = crear_tablero()
+    personas = [crear_persona(nombre) for nombre in ("Ana", "Beto", "Carla")]
+    for i in range(12):
+        crear_tarea(tablero["id"], fases[i % 3]["id"], f"Tarea {i}", persona_id=personas[i % 3]["id"])
+
+    consultas.clear()
+    board = Tablero.obtener_tablero_completo(tablero["id"])
+    session.remove()
+
+    assert sum(len(fase["tareas"]) for fase in board["fases"]) == 12
+    assert len([sentencia for sentencia in consultas if sentencia.lstrip().upper().startswith("SELECT")]) == 3
+
+
+def test_fields_limita_los_campos_de_las_tareas(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    crear_tarea(tablero["id"], fases[0]["id"], "Única")
+
+    board = cliente.get(f"/api/v1/tableros/{tablero['id']}/board?fields=nombre,persona_nombre").get_json()
+
+    assert board["fases"][0]["tareas"] == [{"nombre": "Única", "persona_nombre": None}]
+    assert cliente.get(f"/api/v1/tableros/{tablero['id']}/board?fields=no_existe").status_code == 400
+
+
+def test_tablero_inexistente(cliente):
+    assert cliente.get("/api/v1/tableros/999999/board").status_code == 404
@@ -0,0 +1,67 @@
+from src.models import session
+from src.models.tarea_m import MAX_TAREAS_BULK, Tarea
+
+
+def item(tablero, fase, nombre="Tarea", **datos):
+    return {"nombre": nombre, "fecha_inicio": "2025-01-06T09:00:00", "fase_id": fase["id"],
+            "tablero_id": tablero["id"], **datos}
+
+
+def nombres_de(tablero):
+    tareas = Tarea.listar_tareas(tablero_id=tablero["id"], limit=1000)[0]
+    session.remove()
+    return [tarea["nombre"] for tarea in tareas]
+
+
+def test_crea_todas_con_un_solo_insert(cliente, consultas, crear_tablero, fases, crear_persona):
+    tablero = crear_tablero()
+    ana = crear_persona("Ana")
+    items = [item(tablero, fases[i % 3], f"Tarea {i}", persona_id=ana["id"] if i % 2 else None)
+             for i in range(50)]
+
+    consultas.clear()
+    respuesta = cliente.post("/api/v1/tareas/bulk", json=items)
+
+    assert respuesta.status_code == 201
+    cuerpo = respuesta.get_json()
+    assert (cuerpo["creadas"], cuerpo["errores"]) == (50, 0)
+    assert [resultado["indice"] for resultado in cuerpo["resultados"]] == list(range(50))
+    assert len([sentencia for sentencia in consultas if sentencia.startswith("INSERT INTO tarea ")]) == 1
+    # Cada resultado trae el ID de la fila de su elemento
+    tareas = {tarea["id"]: tarea for tarea in Tarea.listar_tareas(tablero_id=tablero["id"], limit=1000)[0]}
+    session.remove()
+    assert [(tareas[resultado["id"]]["nombre"], tareas[resultado["id"]]["persona_id"])
+            for resultado in cuerpo["resultados"]] == [(item["nombre"], item["persona_id"]) for item in items]
+
+
+def test_rechaza_solo_los_elementos_invalidos(cliente, crear_tablero, fases):
+    tablero = crear_tablero()
+    items = [
+        item(tablero, fases[0], "Válida"),
+        item(tablero, fases[0], "Sin fecha", fecha_inicio="ayer"),
+        item(tablero, fases[0], "Persona inexistente", persona_id=999999),
+        {**item(tablero, fases[0], "Fase inexistente"), "fase_id": 999999},
+        item(tablero, fases[1], "Otra válida", estado="en_progreso"),
+    ]
+
+    respuesta = cliente.post("/api/v1/tareas/bulk", json=items)
+
+    assert respuesta.status_code == 207
+    resultados = respuesta.get_json()["resultados"]
+    assert ["id" in resultado for resultado in resultados] == [True, False, False, False, True]
+    assert resultados[2]["error"] == "No existe el registro con persona_id=999999"
+    assert resultados[3]["error"] == "No existe el registro con fase_id=999999"
+    assert nombres_de(tablero) == ["Válida", "Otra válida"]
+
+
+def test_ninguna_valida_o_cuerpo_invalido_responde_400(cliente, crear_tablero, fases):
+    tablero = crear_tablero()
+
+    respuesta = cliente.post("/api/v1/tareas/bulk", json=[item(tablero, fases[0], "")])
+    assert respuesta.status_code == 400
+    assert respuesta.get_json()["creadas"] == 0
+    assert cliente.post("/api/v1/tareas/bulk", json=[]).status_code == 400
+    assert cliente.post("/api/v1/tareas/bulk", json={"nombre": "No es un arreglo"}).status_code == 400
+    assert cliente.post("/api/v1/tareas/bulk",
+                        json=[item(tablero, fases[0])] * (MAX_TAREAS_BULK + 1)).status_code == 400
+    assert nombres_de(tablero) == []
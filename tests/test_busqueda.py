@@ -0,0 +1,82 @@
+import pytest
+from src.models import engine
+from src.models.busqueda import consulta_fts, reconstruir_busqueda
+from src.models.tarea_m import Tarea
+
+
+def buscar(cliente, q, **parametros):
+    respuesta = cliente.get("/api/v1/tareas/buscar", query_string={"q": q, **parametros})
+    assert respuesta.status_code == 200
+    return respuesta
+
+
+def nombres(cliente, q):
+    return [tarea["nombre"] for tarea in buscar(cliente, q).get_json()]
+
+
+@pytest.fixture
+def tablero(crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    for nombre, descripcion in (("Migrar la base", "Pasar los datos a la nueva versión"),
+                                ("Revisar diseño", "Ajustar la migración de estilos del formulario"),
+                                ("Preparar demo", "Mostrar la búsqueda al cliente")):
+        crear_tarea(tablero["id"], fases[0]["id"], nombre, descripcion=descripcion)
+    return tablero
+
+
+def test_ordena_por_relevancia_y_resalta(cliente, tablero):
+    resultados = buscar(cliente, "migr").get_json()
+
+    # Prefijo de la última palabra; el nombre pesa más que la descripción
+    assert [tarea["nombre"] for tarea in resultados] == ["Migrar la base", "Revisar diseño"]
+    assert resultados[0]["relevancia"] < resultados[1]["relevancia"]
+    assert resultados[0]["resaltado"]["nombre"] == "<mark>Migrar</mark> la base"
+    assert "<mark>migración</mark>" in resultados[1]["resaltado"]["descripcion"]
+
+
+def test_ignora_tildes_y_mayusculas(cliente, tablero):
+    assert nombres(cliente, "DISENO") == ["Revisar diseño"]
+    assert nombres(cliente, "busqueda cliente") == ["Preparar demo"]
+    assert nombres(cliente, "cliente inexistente") == []
+
+
+def test_el_indice_sigue_a_las_escrituras(cliente, tablero, fases, crear_tarea):
+    tarea = crear_tarea(tablero["id"], fases[0]["id"], "Escribir manual")
+    assert nombres(cliente, "manual") == ["Escribir manual"]
+
+    Tarea.modificar_tarea(tarea["id"], nombre="Escribir guía")
+    assert nombres(cliente, "manual") == []
+    assert nombres(cliente, "guia") == ["Escribir guía"]
+
+    Tarea.eliminar_tarea(tarea["id"])
+    assert nombres(cliente, "guia") == []
+
+
+def test_pagina_por_relevancia(cliente, tablero, fases, crear_tarea):
+    for i in range(5):
+        crear_tarea(tablero["id"], fases[0]["id"], f"Informe {i}")
+
+    vistos, after = [], None
+    while True:
+        respuesta = buscar(cliente, "informe", limit=2, **({"after": after} if after else {}))
+        vistos += [tarea["nombre"] for tarea in respuesta.get_json()]
+        after = respuesta.headers.get("X-Next-Cursor")
+        if not after:
+            break
+
+    assert sorted(vistos) == [f"Informe {i}" for i in range(5)]
+
+
+def test_el_texto_del_usuario_no_es_sintaxis_fts(cliente, tablero):
+    assert consulta_fts('base" OR nombre:*') == '"base" "OR" "nombre"*'
+    assert nombres(cliente, 'migrar" (') == ["Migrar la base"]
+    assert cliente.get("/api/v1/tareas/buscar?q=%22*%22").status_code == 400
+    assert cliente.get("/api/v1/tareas/buscar").status_code == 400
+
+
+def test_reconstruir_no_afecta_a_las_conexiones_abiertas(cliente, tablero):
+    assert nombres(cliente, "demo") == ["Preparar demo"]
+
+    assert reconstruir_busqueda(engine) == 3
+    # La conexión de lectura que ya consultó el índice sigue funcionando
+    assert nombres(cliente, "demo") == ["Preparar demo"]
@@ -0,0 +1,112 @@
+import time
+import pytest
+from src.models import session
+from src.models.cache import CACHES, CacheLRU
+from src.models.fase_m import Fase, cache_fases
+
+
+@pytest.fixture
+def nuevo_cache():
+    creados = []
+
+    def crear(**opciones):
+        creados.append(CacheLRU(f"prueba-{len(creados)}", **opciones))
+        return creados[-1]
+    yield crear
+    for cache in creados:
+        CACHES.pop(cache.nombre, None)
+
+
+def selects(consultas):
+    return [sentencia for sentencia in consultas if sentencia.lstrip().upper().startswith("SELECT")]
+
+
+def test_descarta_el_menos_usado_y_lo_vencido(nuevo_cache):
+    cache = nuevo_cache(max_elementos=2, ttl=300)
+    cache.obtener_o_calcular("a", lambda: 1)
+    cache.obtener_o_calcular("b", lambda: 2)
+    cache.obtener_o_calcular("a", lambda: "recalculado")
+    cache.obtener_o_calcular("c", lambda: 3)
+
+    assert cache.obtener_o_calcular("a", lambda: "recalculado") == 1
+    assert cache.obtener_o_calcular("b", lambda: "recalculado") == "recalculado"
+    estadisticas = cache.estadisticas()
+    assert (estadisticas["elementos"], estadisticas["aciertos"], estadisticas["fallos"]) == (2, 2, 4)
+    assert estadisticas["tasa_aciertos"] == round(2 / 6, 4)
+
+    vencido = nuevo_cache(ttl=0)
+    vencido.obtener_o_calcular("a", lambda: 1)
+    assert vencido.obtener_o_calcular("a", lambda: 2) == 2
+
+
+def test_invalidar(nuevo_cache):
+    cache = nuevo_cache()
+    for clave in (("id", 1), ("id", 2), ("lista", None)):
+        cache.obtener_o_calcular(clave, lambda: "viejo")
+
+    cache.invalidar(("id", 1), ("id", 99))
+    cache.invalidar_si(lambda clave: clave[0] == "lista")
+
+    assert [cache.obtener_o_calcular(clave, lambda: "nuevo") for clave in (("id", 1), ("id", 2), ("lista", None))] \
+        == ["nuevo", "viejo", "nuevo"]
+    assert cache.estadisticas()["invalidaciones"] == 2
+
+
+def test_un_acierto_no_consulta_la_base(consultas, crear_fase):
+    fase = crear_fase("Por hacer")
+    assert Fase.obtener_fase_por_id(fase["id"]) == fase
+    session.remove()
+
+    consultas.clear()
+    for _ in range(3):
+        assert Fase.obtener_fase_por_id(fase["id"]) == fase
+        session.remove()
+
+    assert selects(consultas) == []
+
+
+def test_la_version_se_consulta_una_vez_por_intervalo(consultas, nuevo_cache, crear_fase,
+                                                     escribir_desde_otro_proceso):
+    fase = crear_fase("Por hacer")
+    cache = nuevo_cache(tabla="fase", intervalo_version=0.2)
+    leer = lambda: cache.obtener_o_calcular(fase["id"], lambda: Fase._consultar_fase(fase["id"]))["nombre"]
+    assert leer() == "Por hacer"
+    session.remove()
+
+    escribir_desde_otro_proceso("UPDATE fase SET nombre = 'Externa' WHERE id = ?", (fase["id"],))
+    consultas.clear()
+    # Dentro del intervalo se usa la versión ya leída, sin consultar
+    assert leer() == "Por hacer"
+    assert selects(consultas) == []
+    time.sleep(0.25)
+    # Pasado el intervalo se vuelve a leer la versión y la entrada caduca
+    assert leer() == "Externa"
+    session.remove()
+
+
+def test_las_escrituras_del_proceso_invalidan(crear_fase):
+    fase = crear_fase("Por hacer")
+    assert [f["nombre"] for f in Fase.obtener_fases()[0]] == ["Por hacer"]
+    assert Fase.obtener_fase_por_id(fase["id"])["nombre"] == "Por hacer"
+    session.remove()
+
+    Fase.actualizar_fase(fase["id"], "Pendiente")
+    crear_fase("Hecho")
+
+    assert [f["nombre"] for f in Fase.obtener_fases()[0]] == ["Pendiente", "Hecho"]
+    assert Fase.obtener_fase_por_id(fase["id"])["nombre"] == "Pendiente"
+    Fase.eliminar_fase(fase["id"])
+    assert Fase.obtener_fase_por_id(fase["id"]) is None
+    session.remove()
+
+
+def test_una_peticion_con_etag_solo_consulta_las_versiones(cliente, consultas, crear_fase):
+    fase = crear_fase("Por hacer")
+    cliente.get(f"/api/v1/fases/{fase['id']}")
+
+    consultas.clear()
+    respuesta = cliente.get(f"/api/v1/fases/{fase['id']}")
+
+    assert respuesta.get_json() == fase
+    assert [sentencia for sentencia in selects(consultas) if "version_tabla" not in sentencia] == []
+    assert cache_fases.estadisticas()["aciertos"] >= 1
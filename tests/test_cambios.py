@@ -0,0 +1,90 @@
+from sqlalchemy import text
+from src.models import engine
+from src.models.cambios import truncar_cambios
+from src.models.tarea_m import Tarea
+import pytest
+
+
+def secuencia_actual(cliente):
+    respuesta = cliente.get("/api/v1/cambios").get_json()
+    assert respuesta["cambios"] == [] and respuesta["hay_mas"] is False
+    return respuesta["siguiente"]
+
+
+def test_compacta_cada_registro_en_su_ultimo_estado(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    existente = crear_tarea(tablero["id"], fases[0]["id"], "Existente")
+    a_borrar = crear_tarea(tablero["id"], fases[0]["id"], "A borrar")
+    desde = secuencia_actual(cliente)
+
+    nueva = crear_tarea(tablero["id"], fases[0]["id"], "Nueva")
+    Tarea.modificar_tarea(nueva["id"], nombre="Nueva (editada)")
+    Tarea.modificar_tarea(existente["id"], fase_id=fases[1]["id"])
+    Tarea.modificar_tarea(existente["id"], fase_id=fases[2]["id"])
+    Tarea.eliminar_tarea(a_borrar["id"])
+    efimera = crear_tarea(tablero["id"], fases[0]["id"], "Efímera")
+    Tarea.eliminar_tarea(efimera["id"])
+
+    respuesta = cliente.get(f"/api/v1/cambios?desde={desde}").get_json()
+    cambios = {(cambio["tabla"], cambio["id"]): cambio for cambio in respuesta["cambios"]}
+
+    assert len(cambios) == len(respuesta["cambios"]) == 4
+    assert cambios[("tarea", nueva["id"])]["operacion"] == "creado"
+    assert cambios[("tarea", nueva["id"])]["datos"]["nombre"] == "Nueva (editada)"
+    assert cambios[("tarea", existente["id"])]["operacion"] == "actualizado"
+    assert cambios[("tarea", existente["id"])]["datos"]["fase_id"] == fases[2]["id"]
+    assert cambios[("tarea", a_borrar["id"])] | {"seq": None} == {
+        "seq": None, "tabla": "tarea", "id": a_borrar["id"], "operacion": "eliminado", "datos": None}
+    assert cambios[("tarea", efimera["id"])]["operacion"] == "eliminado"
+    # En el orden de su último cambio; `siguiente` es la secuencia del último
+    secuencias = [cambio["seq"] for cambio in respuesta["cambios"]]
+    assert secuencias == sorted(secuencias)
+    assert respuesta["siguiente"] == secuencias[-1]
+    assert cliente.get(f"/api/v1/cambios?desde={respuesta['siguiente']}").get_json()["cambios"] == []
+
+
+def test_registra_todas_las_tablas(cliente, crear_tablero, crear_fase, crear_persona):
+    desde = secuencia_actual(cliente)
+    tablero = crear_tablero()
+    fase = crear_fase("Revisión")
+    persona = crear_persona("Ana")
+
+    cambios = cliente.get(f"/api/v1/cambios?desde={desde}").get_json()["cambios"]
+
+    assert [(cambio["tabla"], cambio["id"], cambio["operacion"]) for cambio in cambios] == [
+        ("tablero", tablero["id"], "creado"), ("fase", fase["id"], "creado"), ("persona", persona["id"], "creado")]
+    assert "password" not in cambios[2]["datos"]
+
+
+def test_pagina_con_limit_y_hay_mas(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    desde = secuencia_actual(cliente)
+    ids = [crear_tarea(tablero["id"], fases[0]["id"], f"Tarea {i}")["id"] for i in range(5)]
+
+    vistos = []
+    while True:
+        respuesta = cliente.get(f"/api/v1/cambios?desde={desde}&limit=2").get_json()
+        vistos += [cambio["id"] for cambio in respuesta["cambios"]]
+        desde = respuesta["siguiente"]
+        if not respuesta["hay_mas"]:
+            break
+
+    assert vistos == ids
+
+
+def test_410_si_desde_es_anterior_al_registro_truncado(cliente, crear_tablero):
+    crear_tablero("Viejo")
+    desde = secuencia_actual(cliente)
+    crear_tablero("Reciente")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE cambio SET fecha = '2000-01-01 00:00:00' WHERE seq <= :seq"), {"seq": desde})
+
+    assert truncar_cambios(engine) >= 1
+    assert cliente.get("/api/v1/cambios?desde=0").status_code == 410
+    # Desde la secuencia del primer cambio que se conserva todavía alcanza
+    assert cliente.get(f"/api/v1/cambios?desde={desde}").status_code == 200
+
+
+@pytest.mark.parametrize("desde", ["-1", "abc"])
+def test_desde_invalido_responde_400(cliente, desde):
+    assert cliente.get(f"/api/v1/cambios?desde={desde}").status_code == 400
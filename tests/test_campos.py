@@ -0,0 +1,61 @@
+import re
+from datetime import datetime
+import pytest
+
+
+def columnas_consultadas(consultas, tabla):
+    """Columnas del SELECT ... FROM `tabla` ejecutado, sin el prefijo de la tabla."""
+    for sentencia in consultas:
+        coincidencia = re.match(rf"SELECT (.*?)\s+FROM {tabla}\b", sentencia, re.S)
+        if coincidencia:
+            return [columna.strip().split(".")[-1].split(" ")[0] for columna in coincidencia.group(1).split(",")]
+    raise AssertionError(f"No se consultó {tabla}")
+
+
+def test_solo_se_consultan_y_devuelven_los_campos_pedidos(cliente, consultas, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    crear_tarea(tablero["id"], fases[0]["id"], "Diseño")
+
+    consultas.clear()
+    respuesta = cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}&fields=nombre,estado")
+
+    assert respuesta.get_json() == [{"nombre": "Diseño", "estado": "pendiente"}]
+    # Más el id, que necesita el cursor de la paginación
+    assert sorted(columnas_consultadas(consultas, "tarea")) == ["estado", "id", "nombre"]
+
+
+def test_el_cursor_funciona_sin_pedir_las_columnas_de_orden(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    for dia in (9, 7, 8):
+        crear_tarea(tablero["id"], fases[0]["id"], f"Día {dia}", fecha_inicio=datetime(2025, 1, dia, 9, 0))
+
+    url = f"/api/v1/tareas/?tablero_id={tablero['id']}&fields=nombre&sort=-fecha_inicio&limit=2"
+    primera = cliente.get(url)
+    segunda = cliente.get(f"{url}&after={primera.headers['X-Next-Cursor']}")
+
+    assert primera.get_json() + segunda.get_json() == [{"nombre": "Día 9"}, {"nombre": "Día 8"}, {"nombre": "Día 7"}]
+
+
+@pytest.mark.parametrize("url", ["/api/v1/tableros/", "/api/v1/fases/", "/api/v1/personas/"])
+def test_listados_con_fields(cliente, crear_tablero, fases, crear_persona, url):
+    crear_tablero()
+    crear_persona("Ana")
+
+    assert {tuple(elemento) for elemento in cliente.get(f"{url}?fields=nombre,id").get_json()} == {("id", "nombre")}
+
+
+def test_un_elemento_y_el_cache(cliente, crear_fase):
+    fase = crear_fase("Por hacer")
+
+    assert cliente.get(f"/api/v1/fases/{fase['id']}").get_json() == fase
+    # La fase completa está en cache: se recorta sin volver a consultar
+    assert cliente.get(f"/api/v1/fases/{fase['id']}?fields=nombre").get_json() == {"nombre": "Por hacer"}
+
+
+@pytest.mark.parametrize("url", ["/api/v1/tareas/?fields=nombre,no_existe", "/api/v1/personas/?fields=password",
+                                 "/api/v1/tableros/?fields=tareas"])
+def test_campos_desconocidos_responden_400(cliente, url):
+    respuesta = cliente.get(url)
+
+    assert respuesta.status_code == 400
+    assert "Campos válidos" in respuesta.get_json()["message"]
@@ -0,0 +1,81 @@
+from datetime import datetime
+from src.models import engine, session
+from src.models.estadisticas import obtener_carga, verificar_estadisticas
+from src.models.persona_m import Persona
+from src.models.tarea_m import Tarea
+
+AHORA = datetime(2025, 1, 10, 12, 0)
+
+
+def calcular_carga(ahora):
+    """La carga de cada persona recorriendo las tareas, para comparar con el resumen."""
+    personas = Persona.obtener_personas()[0]
+    tareas = Tarea.listar_tareas(limit=1000)[0]
+    session.remove()
+    carga = []
+    for persona in personas:
+        suyas = [tarea for tarea in tareas if tarea["persona_id"] == persona["id"]]
+        abiertas = [tarea for tarea in suyas if tarea["estado"] != "completada"]
+        carga.append({"persona_id": persona["id"], "nombre": persona["nombre"], "total": len(suyas),
+                      "abiertas": len(abiertas),
+                      "vencidas": sum(1 for tarea in abiertas if tarea["fecha_fin"] and tarea["fecha_fin"] < ahora)})
+    return carga
+
+
+def leer_carga(ahora):
+    carga = obtener_carga(ahora)
+    session.remove()
+    return carga
+
+
+def test_la_carga_sigue_a_reasignaciones_y_bajas(cliente, crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    ana, beto, carla = crear_persona("Ana"), crear_persona("Beto"), crear_persona("Carla")
+    vencida = crear_tarea(tablero["id"], fases[0]["id"], "Vencida", ana["id"], fecha_fin=datetime(2025, 1, 3))
+    hoy = crear_tarea(tablero["id"], fases[0]["id"], "Vence hoy", ana["id"], fecha_fin=datetime(2025, 1, 10, 9, 0))
+    crear_tarea(tablero["id"], fases[1]["id"], "Hecha", ana["id"], fecha_fin=datetime(2025, 1, 2),
+                estado="completada")
+    abierta = crear_tarea(tablero["id"], fases[1]["id"], "Abierta", beto["id"], fecha_fin=datetime(2025, 2, 1))
+    sin_asignar = crear_tarea(tablero["id"], fases[2]["id"], "Sin asignar", fecha_fin=datetime(2025, 1, 1))
+    session.remove()
+
+    assert leer_carga(AHORA) == calcular_carga(AHORA)
+    assert [(p["total"], p["abiertas"], p["vencidas"]) for p in leer_carga(AHORA)] == [(3, 2, 2), (1, 1, 0),
+                                                                                       (0, 0, 0)]
+
+    respuesta = cliente.patch("/api/v1/tareas/mover", json=[
+        {"id": vencida["id"], "fase_id": fases[1]["id"], "persona_id": beto["id"]},
+        {"id": sin_asignar["id"], "fase_id": fases[2]["id"], "persona_id": carla["id"]},
+    ])
+    assert respuesta.status_code == 200
+    Tarea.modificar_tarea(hoy["id"], persona_id=None)
+    Tarea.modificar_tarea(abierta["id"], estado="completada")
+    session.remove()
+
+    assert leer_carga(AHORA) == calcular_carga(AHORA)
+    assert [(p["total"], p["abiertas"], p["vencidas"]) for p in leer_carga(AHORA)] == [(1, 0, 0), (2, 1, 1),
+                                                                                       (1, 1, 1)]
+
+    # Las tareas de la persona se borran en cascada y salen de su resumen
+    Persona.eliminar_persona(beto["id"])
+    Tarea.eliminar_tarea(sin_asignar["id"])
+    session.remove()
+
+    carga = leer_carga(AHORA)
+    assert carga == calcular_carga(AHORA)
+    assert [(p["nombre"], p["total"]) for p in carga] == [("Ana", 1), ("Carla", 0)]
+    assert verificar_estadisticas(engine) == {"resumen_tablero": [], "resumen_persona": []}
+
+
+def test_endpoint_incluye_a_las_personas_sin_tareas(cliente, crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    ana, beto = crear_persona("Ana"), crear_persona("Beto")
+    crear_tarea(tablero["id"], fases[0]["id"], persona_id=ana["id"], fecha_fin=datetime(2000, 1, 1))
+
+    respuesta = cliente.get("/api/v1/personas/carga")
+
+    assert respuesta.status_code == 200
+    assert respuesta.get_json() == [
+        {"persona_id": ana["id"], "nombre": "Ana", "total": 1, "abiertas": 1, "vencidas": 1},
+        {"persona_id": beto["id"], "nombre": "Beto", "total": 0, "abiertas": 0, "vencidas": 0},
+    ]
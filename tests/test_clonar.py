@@ -0,0 +1,70 @@
+from datetime import datetime
+from src.models.tarea_m import Tarea
+
+
+def tareas_de(tablero_id):
+    return Tarea.listar_tareas(tablero_id=tablero_id)[0]
+
+
+def test_desplaza_las_fechas_de_las_tareas_y_la_entrega(cliente, crear_tablero, fases, crear_persona, crear_tarea):
+    original = crear_tablero("Sprint 7", fecha_entrega=datetime(2025, 1, 31, 18, 0))
+    persona = crear_persona("Ana")
+    crear_tarea(original["id"], fases[0]["id"], "Diseño", persona_id=persona["id"],
+                fecha_inicio=datetime(2025, 1, 6, 9, 30, 15, 120000), fecha_fin=datetime(2025, 1, 10, 18, 0))
+    crear_tarea(original["id"], fases[1]["id"], "Sin fin", fecha_inicio=datetime(2025, 1, 30, 23, 59))
+
+    respuesta = cliente.post(f"/api/v1/tableros/{original['id']}/clonar",
+                             json={"nombre": "Sprint 8", "desplazar_dias": 14})
+
+    assert respuesta.status_code == 201
+    copia = respuesta.get_json()
+    assert copia["tareas"] == 2
+    assert copia["tablero"]["nombre"] == "Sprint 8"
+    assert copia["tablero"]["fecha_entrega"] == "2025-02-14T18:00:00"
+    tareas = tareas_de(copia["tablero"]["id"])
+    # Cambia solo el día: la hora y los microsegundos se conservan
+    assert [(t["nombre"], t["fecha_inicio"], t["fecha_fin"], t["persona_id"]) for t in tareas] == [
+        ("Diseño", datetime(2025, 1, 20, 9, 30, 15, 120000), datetime(2025, 1, 24, 18, 0), persona["id"]),
+        ("Sin fin", datetime(2025, 2, 13, 23, 59), None, None),
+    ]
+    # El original no cambia
+    assert [t["fecha_inicio"] for t in tareas_de(original["id"])] == [datetime(2025, 1, 6, 9, 30, 15, 120000),
+                                                                      datetime(2025, 1, 30, 23, 59)]
+
+
+def test_desplazamiento_negativo_cruza_el_mes(cliente, crear_tablero, fases, crear_tarea):
+    original = crear_tablero()
+    crear_tarea(original["id"], fases[0]["id"], fecha_inicio=datetime(2025, 3, 1, 8, 0))
+
+    copia = cliente.post(f"/api/v1/tableros/{original['id']}/clonar", json={"desplazar_dias": -1}).get_json()
+
+    assert copia["tablero"]["nombre"] == "Sprint (copia)"
+    assert tareas_de(copia["tablero"]["id"])[0]["fecha_inicio"] == datetime(2025, 2, 28, 8, 0)
+
+
+def test_plantilla_por_fases_sin_personas_y_con_estado_reiniciado(cliente, crear_tablero, fases, crear_persona,
+                                                                   crear_tarea):
+    original = crear_tablero()
+    persona = crear_persona("Ana")
+    crear_tarea(original["id"], fases[0]["id"], "A", persona_id=persona["id"], estado="en_progreso")
+    crear_tarea(original["id"], fases[1]["id"], "B", persona_id=persona["id"], estado="completada")
+    crear_tarea(original["id"], fases[2]["id"], "C")
+
+    copia = cliente.post(f"/api/v1/tableros/{original['id']}/clonar",
+                         json={"fases": [fases[0]["id"], fases[1]["id"]], "sin_personas": True,
+                               "reiniciar_estado": True}).get_json()
+
+    assert copia["tareas"] == 2
+    assert [(t["nombre"], t["persona_id"], t["estado"]) for t in tareas_de(copia["tablero"]["id"])] == [
+        ("A", None, "pendiente"), ("B", None, "pendiente")]
+
+
+def test_opciones_invalidas_y_tablero_inexistente(cliente, crear_tablero, fases):
+    original = crear_tablero()
+
+    assert cliente.post("/api/v1/tableros/999999/clonar", json={}).status_code == 404
+    assert cliente.post(f"/api/v1/tableros/{original['id']}/clonar",
+                        json={"desplazar_dias": "14"}).status_code == 400
+    assert cliente.post(f"/api/v1/tableros/{original['id']}/clonar",
+                        json={"fases": [999999]}).status_code == 400
+    assert len(cliente.get("/api/v1/tableros/").get_json()) == 1
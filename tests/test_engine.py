@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import SingletonThreadPool
+import src.models
+from src.models import SQLITE_PRAGMAS, crear_engine, engine
+
+
+def pragma(conexion, nombre):
+    return conexion.exec_driver_sql(f"PRAGMA {nombre}").scalar()
+
+
+def test_cada_conexion_nueva_aplica_el_perfil():
+    # Una conexión nueva del pool, no la que ya abrió la aplicación
+    engine.pool.dispose()
+    with engine.connect() as conexion:
+        assert pragma(conexion, "journal_mode") == "wal"
+        assert pragma(conexion, "synchronous") == 1  # NORMAL
+        assert pragma(conexion, "foreign_keys") == 1
+        assert pragma(conexion, "busy_timeout") == SQLITE_PRAGMAS["busy_timeout"]
+        assert pragma(conexion, "cache_size") == SQLITE_PRAGMAS["cache_size"]
+        assert pragma(conexion, "temp_store") == 2  # MEMORY
+
+
+def test_las_claves_foraneas_se_aplican(crear_tablero):
+    tablero = crear_tablero()
+    with pytest.raises(Exception, match="FOREIGN KEY"):
+        with engine.begin() as conexion:
+            conexion.execute(text("INSERT INTO tarea (nombre, fecha_creacion, fecha_inicio, estado, fase_id, "
+                                  "tablero_id) VALUES ('x', '2025-01-01', '2025-01-01', 'pendiente', 999999, :t)"),
+                             {"t": tablero["id"]})
+
+
+def test_el_pool_se_dimensiona_y_la_base_en_memoria_no_lo_usa(tmp_path):
+    archivo = crear_engine(f"sqlite:///{tmp_path / 'otra.db'}", pool_size=3, max_overflow=2)
+    memoria = crear_engine("sqlite://")
+
+    assert (archivo.pool.size(), archivo.pool._max_overflow) == (3, 2)
+    assert isinstance(memoria.pool, SingletonThreadPool)
+    with memoria.connect() as conexion:
+        assert pragma(conexion, "foreign_keys") == 1
+    archivo.dispose()
+    memoria.dispose()
+
+
+def test_no_queda_una_conexion_abierta_al_importar():
+    assert not hasattr(src.models, "conexion")
+    # Un solo escritor: las escrituras esperan su turno en el pool
+    assert (engine.pool.size(), engine.pool._max_overflow) == (1, 0)
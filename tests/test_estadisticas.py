@@ -0,0 +1,116 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from src.models import engine, session
+from src.models.estadisticas import obtener_estadisticas, verificar_estadisticas
+from src.models.tarea_m import Tarea
+
+AHORA = datetime(2025, 1, 10, 12, 0)
+
+
+def sin_diferencias():
+    return verificar_estadisticas(engine) == {"resumen_tablero": [], "resumen_persona": []}
+
+
+def calcular_estadisticas(tablero_id, fases, ahora):
+    """Las estadísticas recorriendo las tareas, para comparar con el resumen."""
+    tareas = Tarea.listar_tareas(tablero_id=tablero_id, limit=1000)[0]
+    session.remove()
+    por_fase = Counter(tarea["fase_id"] for tarea in tareas)
+    return {
+        "total": len(tareas),
+        "por_fase": {fase["id"]: por_fase[fase["id"]] for fase in fases},
+        "por_persona": dict(Counter(tarea["persona_id"] for tarea in tareas)),
+        "vencidas": sum(1 for tarea in tareas
+                        if tarea["estado"] != "completada" and tarea["fecha_fin"] and tarea["fecha_fin"] < ahora),
+    }
+
+
+def leer_estadisticas(tablero_id, ahora):
+    estadisticas = obtener_estadisticas(tablero_id, ahora)
+    session.remove()
+    return {
+        "total": estadisticas["total"],
+        "por_fase": {fase["fase_id"]: fase["cantidad"] for fase in estadisticas["por_fase"]},
+        "por_persona": {persona["persona_id"]: persona["cantidad"] for persona in estadisticas["por_persona"]},
+        "vencidas": estadisticas["vencidas"],
+    }
+
+
+def test_el_resumen_sigue_a_altas_movimientos_ediciones_y_bajas(cliente, crear_tablero, fases, crear_persona,
+                                                                  crear_tarea):
+    tablero = crear_tablero()
+    otro = crear_tablero("Otro")
+    ana, beto = crear_persona("Ana"), crear_persona("Beto")
+    vencida = crear_tarea(tablero["id"], fases[0]["id"], "Vencida", ana["id"], fecha_fin=datetime(2025, 1, 3))
+    completada = crear_tarea(tablero["id"], fases[0]["id"], "Completada", beto["id"],
+                             fecha_fin=datetime(2025, 1, 2), estado="completada")
+    futura = crear_tarea(tablero["id"], fases[1]["id"], "Futura", fecha_fin=datetime(2025, 2, 1))
+    sin_fin = crear_tarea(tablero["id"], fases[1]["id"], "Sin fin", ana["id"])
+    crear_tarea(otro["id"], fases[0]["id"], "De otro tablero", ana["id"], fecha_fin=datetime(2025, 1, 1))
+    Tarea.crear_tareas_bulk([{"nombre": f"Lote {i}", "fecha_inicio": "2025-01-06T09:00:00",
+                              "fecha_fin": "2025-01-08T18:00:00", "fase_id": fases[2]["id"],
+                              "tablero_id": tablero["id"], "persona_id": beto["id"]} for i in range(3)])
+    session.remove()
+    assert leer_estadisticas(tablero["id"], AHORA) == calcular_estadisticas(tablero["id"], fases, AHORA)
+    assert leer_estadisticas(tablero["id"], AHORA)["vencidas"] == 4
+
+    respuesta = cliente.patch("/api/v1/tareas/mover", json=[
+        {"id": vencida["id"], "fase_id": fases[2]["id"]},
+        {"id": futura["id"], "fase_id": fases[2]["id"], "persona_id": beto["id"]},
+    ])
+    assert respuesta.status_code == 200
+    Tarea.modificar_tarea(sin_fin["id"], estado="completada", fecha_fin=datetime(2025, 1, 5))
+    Tarea.modificar_tarea(futura["id"], fecha_fin=datetime(2025, 1, 9))
+    Tarea.modificar_tarea(completada["id"], tablero_id=otro["id"])
+    Tarea.eliminar_tarea(vencida["id"])
+    session.remove()
+
+    estadisticas = leer_estadisticas(tablero["id"], AHORA)
+    assert estadisticas == calcular_estadisticas(tablero["id"], fases, AHORA)
+    assert estadisticas["por_fase"] == {fases[0]["id"]: 0, fases[1]["id"]: 1, fases[2]["id"]: 4}
+    assert leer_estadisticas(otro["id"], AHORA) == calcular_estadisticas(otro["id"], fases, AHORA)
+    assert sin_diferencias()
+
+
+def test_vencidas_de_hoy_segun_la_hora(crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    for hora in (9, 11, 13, 15):
+        crear_tarea(tablero["id"], fases[0]["id"], f"Vence a las {hora}", fecha_fin=AHORA.replace(hour=hora))
+
+    assert leer_estadisticas(tablero["id"], AHORA)["vencidas"] == 2
+    assert leer_estadisticas(tablero["id"], AHORA + timedelta(hours=4))["vencidas"] == 4
+    assert leer_estadisticas(tablero["id"], AHORA.replace(hour=0))["vencidas"] == 0
+
+
+def test_borrar_una_fase_o_un_tablero_descuenta_sus_tareas(crear_tablero, fases, crear_tarea):
+    from src.models.fase_m import Fase
+    from src.models.tablero_m import Tablero
+
+    tablero, otro = crear_tablero(), crear_tablero("Otro")
+    for fase in fases:
+        crear_tarea(tablero["id"], fase["id"], fecha_fin=datetime(2025, 1, 1))
+        crear_tarea(otro["id"], fase["id"], fecha_fin=datetime(2025, 1, 1))
+
+    Fase.eliminar_fase(fases[0]["id"])
+    Tablero.eliminar_tablero(otro["id"])
+    session.remove()
+
+    assert leer_estadisticas(tablero["id"], AHORA)["total"] == 2
+    assert leer_estadisticas(otro["id"], AHORA)["total"] == 0
+    assert sin_diferencias()
+
+
+def test_endpoint(cliente, crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    ana = crear_persona("Ana")
+    crear_tarea(tablero["id"], fases[1]["id"], persona_id=ana["id"])
+    crear_tarea(tablero["id"], fases[1]["id"])
+
+    respuesta = cliente.get(f"/api/v1/tableros/{tablero['id']}/estadisticas")
+
+    assert respuesta.status_code == 200
+    estadisticas = respuesta.get_json()
+    assert estadisticas["total"] == 2
+    assert [fase["cantidad"] for fase in estadisticas["por_fase"]] == [0, 2, 0]
+    assert estadisticas["por_persona"] == [{"persona_id": None, "nombre": None, "cantidad": 1},
+                                           {"persona_id": ana["id"], "nombre": "Ana", "cantidad": 1}]
@@ -0,0 +1,61 @@
+def test_304_si_el_etag_coincide(cliente, crear_tablero):
+    crear_tablero()
+    respuesta = cliente.get("/api/v1/tableros/")
+    etag = respuesta.headers["ETag"]
+
+    condicional = cliente.get("/api/v1/tableros/", headers={"If-None-Match": etag})
+
+    assert condicional.status_code == 304
+    assert condicional.data == b""
+    assert condicional.headers["ETag"] == etag
+
+
+def test_una_escritura_cambia_el_etag(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    url = f"/api/v1/tareas/?tablero_id={tablero['id']}"
+    etag = cliente.get(url).headers["ETag"]
+
+    crear_tarea(tablero["id"], fases[0]["id"], "Nueva")
+    respuesta = cliente.get(url, headers={"If-None-Match": etag})
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers["ETag"] != etag
+    assert [tarea["nombre"] for tarea in respuesta.get_json()] == ["Nueva"]
+
+
+def test_el_etag_de_otra_tabla_no_cambia(cliente, crear_tablero, crear_persona):
+    crear_tablero()
+    etag = cliente.get("/api/v1/tableros/").headers["ETag"]
+
+    crear_persona("Ana")
+
+    assert cliente.get("/api/v1/tableros/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_msgpack_tiene_su_propio_etag(cliente, crear_tablero):
+    crear_tablero()
+    json = cliente.get("/api/v1/tableros/").headers["ETag"]
+    msgpack = cliente.get("/api/v1/tableros/", headers={"Accept": "application/msgpack"}).headers["ETag"]
+
+    assert json != msgpack
+    assert cliente.get("/api/v1/tableros/", headers={"If-None-Match": json,
+                                                      "Accept": "application/msgpack"}).status_code == 200
+
+
+def test_el_cache_nunca_sirve_un_cuerpo_mas_viejo_que_el_etag(cliente, crear_tablero, escribir_desde_otro_proceso):
+    tablero = crear_tablero("Original")
+    url = f"/api/v1/tableros/{tablero['id']}"
+    assert cliente.get(url).get_json()["nombre"] == "Original"  # queda en el cache
+
+    escribir_desde_otro_proceso("UPDATE tablero SET nombre = 'Externo' WHERE id = ?", (tablero["id"],))
+    respuesta = cliente.get(url)
+
+    assert respuesta.get_json()["nombre"] == "Externo"
+    assert cliente.get(url, headers={"If-None-Match": respuesta.headers["ETag"]}).status_code == 304
+
+
+def test_los_errores_no_llevan_etag(cliente):
+    respuesta = cliente.get("/api/v1/fases/?fields=no_existe")
+
+    assert respuesta.status_code == 400
+    assert "ETag" not in respuesta.headers
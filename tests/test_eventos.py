@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+import pytest
+from src.controller import tablero_restx
+from src.models import eventos, session
+from src.models.eventos import BusEventos, bus_eventos, stream_eventos_async
+from src.models.tarea_m import Tarea
+
+
+def leer(chunks):
+    """El próximo mensaje del stream como (tipo, datos); los latidos como (None, None)."""
+    mensaje = next(chunks)
+    mensaje = mensaje.decode() if isinstance(mensaje, bytes) else mensaje
+    if mensaje.startswith(":"):
+        return None, None
+    campos = dict(linea.split(": ", 1) for linea in mensaje.strip().splitlines())
+    return campos["event"], json.loads(campos["data"])
+
+
+@pytest.fixture
+def abrir_stream(cliente):
+    """Abre GET /tableros/<id>/eventos y retorna un iterador de sus chunks, ya pasado el `retry`."""
+    abiertos = []
+
+    def abrir(tablero_id):
+        respuesta = cliente.get(f"/api/v1/tableros/{tablero_id}/eventos", buffered=False)
+        assert respuesta.status_code == 200
+        assert respuesta.mimetype == "text/event-stream"
+        abiertos.append(respuesta)
+        chunks = iter(respuesta.response)
+        assert next(chunks).startswith(b"retry: ")
+        return chunks
+
+    yield abrir
+    for respuesta in abiertos:
+        respuesta.close()
+
+
+def test_el_stream_recibe_los_cambios_del_tablero(abrir_stream, crear_tablero, fases, crear_tarea):
+    tablero, otro = crear_tablero(), crear_tablero("Otro")
+    chunks = abrir_stream(tablero["id"])
+
+    crear_tarea(otro["id"], fases[0]["id"], "De otro tablero")
+    tarea = crear_tarea(tablero["id"], fases[0]["id"], "Nueva")
+    tipo, datos = leer(chunks)
+    assert (tipo, datos["id"], datos["nombre"]) == ("tarea_creada", tarea["id"], "Nueva")
+
+    Tarea.modificar_tarea(tarea["id"], fase_id=fases[1]["id"])
+    session.remove()
+    tipo, datos = leer(chunks)
+    assert (tipo, datos["fase_id"], datos["fase_id_anterior"]) == ("tarea_movida", fases[1]["id"], fases[0]["id"])
+
+    Tarea.modificar_tarea(tarea["id"], nombre="Renombrada")
+    session.remove()
+    assert leer(chunks)[0] == "tarea_actualizada"
+
+    Tarea.eliminar_tarea(tarea["id"])
+    session.remove()
+    assert leer(chunks) == ("tarea_eliminada", {"id": tarea["id"]})
+
+
+def test_eliminar_el_tablero_cierra_el_stream(cliente, abrir_stream, crear_tablero):
+    tablero = crear_tablero()
+    chunks = abrir_stream(tablero["id"])
+    assert bus_eventos.cantidad() == 1
+
+    cliente.delete(f"/api/v1/tableros/{tablero['id']}")
+
+    assert leer(chunks) == ("tablero_eliminado", {"id": tablero["id"]})
+    with pytest.raises(StopIteration):
+        next(chunks)
+    assert bus_eventos.cantidad() == 0
+
+
+def test_una_escritura_deshecha_no_publica(abrir_stream, crear_tablero, fases, monkeypatch):
+    monkeypatch.setattr(eventos, "EVENTOS_LATIDO_S", 0.01)
+    tablero = crear_tablero()
+    chunks = abrir_stream(tablero["id"])
+
+    with pytest.raises(Exception):
+        Tarea.crear_tarea("Sin fase", "", None, None, 999999, None, tablero["id"], "pendiente")
+    session.remove()
+
+    assert leer(chunks) == (None, None)
+
+
+def test_tablero_inexistente_o_demasiados_streams(cliente, crear_tablero, monkeypatch):
+    assert cliente.get("/api/v1/tableros/999999/eventos").status_code == 404
+
+    monkeypatch.setattr(tablero_restx, "EVENTOS_MAX_SUSCRIPTORES", 0)
+    respuesta = cliente.get(f"/api/v1/tableros/{crear_tablero()['id']}/eventos")
+
+    assert respuesta.status_code == 503
+    assert "Retry-After" in respuesta.headers
+
+
+def test_un_suscriptor_lento_se_descarta_sin_frenar_a_los_demas():
+    bus = BusEventos()
+    lento, rapido = bus.suscribir(1, capacidad=2), bus.suscribir(1, capacidad=10)
+
+    for i in range(3):
+        bus.publicar(1, "tarea_creada", {"id": i})
+    bus.publicar(2, "tarea_creada", {"id": 99})
+
+    assert [lento.siguiente(0)["datos"]["id"] for _ in range(2)] == [0, 1]
+    assert lento.siguiente(0)["tipo"] == "descartado"
+    assert [rapido.siguiente(0)["datos"]["id"] for _ in range(3)] == [0, 1, 2]
+    assert rapido.siguiente(0) is None
+    assert bus.estadisticas() == {"tableros": 1, "suscripciones": 1, "publicados": 3, "descartadas": 1}
+
+
+def test_el_stream_asincrono_recibe_lo_publicado_desde_otro_hilo():
+    async def recibir():
+        suscripcion = bus_eventos.suscribir(1, loop=asyncio.get_running_loop())
+        stream = stream_eventos_async(suscripcion)
+        assert (await anext(stream)).startswith("retry: ")
+        threading.Timer(0.05, bus_eventos.publicar, (1, "tablero_eliminado", {"id": 1})).start()
+        mensaje = await asyncio.wait_for(anext(stream), 5)
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+        return mensaje
+
+    assert "event: tablero_eliminado" in asyncio.run(recibir())
+    assert bus_eventos.cantidad() == 0
+
+
+def test_estadisticas_del_bus(cliente, abrir_stream, crear_tablero):
+    abrir_stream(crear_tablero()["id"])
+
+    estadisticas = cliente.get("/eventos/estadisticas").get_json()
+
+    assert (estadisticas["tableros"], estadisticas["suscripciones"]) == (1, 1)
@@ -0,0 +1,68 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from src.models import engine
+
+
+@pytest.fixture
+def tareas(crear_tablero, fases, crear_persona, crear_tarea):
+    """Dos tableros con tareas en distintas fases, personas, estados y fechas."""
+    tablero, otro = crear_tablero(), crear_tablero("Otro")
+    ana, beto = crear_persona("Ana"), crear_persona("Beto")
+    creadas = {
+        "a": crear_tarea(tablero["id"], fases[0]["id"], "a", ana["id"], fecha_inicio=datetime(2025, 1, 6),
+                         fecha_fin=datetime(2025, 1, 20)),
+        "b": crear_tarea(tablero["id"], fases[1]["id"], "b", beto["id"], fecha_inicio=datetime(2025, 1, 8),
+                         fecha_fin=datetime(2025, 1, 10), estado="en_progreso"),
+        "c": crear_tarea(tablero["id"], fases[1]["id"], "c", ana["id"], fecha_inicio=datetime(2025, 1, 13),
+                         estado="completada"),
+        "d": crear_tarea(otro["id"], fases[1]["id"], "d", ana["id"], fecha_inicio=datetime(2025, 1, 7),
+                         fecha_fin=datetime(2025, 1, 15)),
+    }
+    return {"tablero": tablero, "otro": otro, "ana": ana, "beto": beto, "fases": fases, **creadas}
+
+
+def nombres(cliente, consulta):
+    respuesta = cliente.get(f"/api/v1/tareas/?{consulta}")
+    assert respuesta.status_code == 200
+    return [tarea["nombre"] for tarea in respuesta.get_json()]
+
+
+def test_filtros(cliente, tareas):
+    tablero, fase, ana = tareas["tablero"]["id"], tareas["fases"][1]["id"], tareas["ana"]["id"]
+
+    assert nombres(cliente, f"tablero_id={tablero}") == ["a", "b", "c"]
+    assert nombres(cliente, f"tablero_id={tablero}&fase_id={fase}") == ["b", "c"]
+    assert nombres(cliente, f"persona_id={ana}") == ["a", "c", "d"]
+    assert nombres(cliente, "estado=completada") == ["c"]
+    assert nombres(cliente, "fecha_inicio_desde=2025-01-07T00:00:00&fecha_inicio_hasta=2025-01-08T00:00:00") == [
+        "b", "d"]
+    # Las tareas sin fecha_fin no entran en un rango de fecha_fin
+    assert nombres(cliente, "fecha_fin_desde=2025-01-10T00:00:00&fecha_fin_hasta=2025-01-15T00:00:00") == [
+        "b", "d"]
+    assert nombres(cliente, f"tablero_id={tablero}&persona_id={ana}&estado=pendiente") == ["a"]
+
+
+def test_orden_por_varios_campos(cliente, tareas):
+    assert nombres(cliente, "sort=-fecha_inicio") == ["c", "b", "d", "a"]
+    assert nombres(cliente, "sort=fase_id,-nombre") == ["a", "d", "c", "b"]
+    # Los nulos van primero en orden ascendente, como en SQLite
+    assert nombres(cliente, "sort=fecha_fin") == ["c", "b", "d", "a"]
+
+
+@pytest.mark.parametrize("consulta", ["sort=password", "sort=fecha_fin,-no_existe", "estado=archivada",
+                                      "fecha_fin_desde=ayer", "tablero_id=uno"])
+def test_parametros_invalidos_responden_400(cliente, consulta):
+    assert cliente.get(f"/api/v1/tareas/?{consulta}").status_code == 400
+
+
+@pytest.mark.parametrize("condicion, indice", [
+    ("tablero_id = 1 AND fase_id = 2", "ix_tarea_tablero_fase"),
+    ("persona_id = 1 AND fecha_fin < '2025-01-10'", "ix_tarea_persona_fecha_fin"),
+    ("estado = 'pendiente' AND fecha_fin < '2025-01-10'", "ix_tarea_estado_fecha_fin"),
+])
+def test_los_filtros_usan_los_indices_compuestos(condicion, indice):
+    with engine.connect() as conn:
+        plan = " ".join(fila[-1] for fila in conn.execute(text(f"EXPLAIN QUERY PLAN SELECT id FROM tarea "
+                                                               f"WHERE {condicion}")))
+    assert indice in plan
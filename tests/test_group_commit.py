@@ -0,0 +1,133 @@
+import threading
+import time
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from src.models import engine, session
+from src.models.escritura import CoalescedorEscrituras, al_confirmar
+from src.models.fase_m import Fase
+from src.models.tarea_m import Tarea
+
+
+def procesar_lote(*operaciones):
+    """
+    Encola las operaciones en un coalescedor nuevo, en orden, antes de iniciar
+    su hilo: así van todas en el mismo lote. Retorna (coalescedor, resultados),
+    con ('ok', valor) o ('error', excepción) por operación.
+    """
+    coalescedor = CoalescedorEscrituras(ventana_ms=50)
+    resultados = [None] * len(operaciones)
+
+    def enviar(indice, operacion):
+        try:
+            resultados[indice] = ("ok", coalescedor.enviar(operacion))
+        except Exception as e:
+            resultados[indice] = ("error", e)
+
+    hilos = []
+    for indice, operacion in enumerate(operaciones):
+        hilos.append(threading.Thread(target=enviar, args=(indice, operacion)))
+        hilos[-1].start()
+        while coalescedor._cola.qsize() <= indice:
+            time.sleep(0.001)
+    coalescedor.iniciar()
+    for hilo in hilos:
+        hilo.join(10)
+    return coalescedor, resultados
+
+
+@pytest.fixture
+def sentencias():
+    """[(sentencia, había una transacción abierta)] ejecutadas por los hilos group-commit, y los COMMIT."""
+    registro = {"sentencias": [], "commits": 0}
+
+    def al_ejecutar(conn, cursor, sentencia, parametros, contexto, varios):
+        if threading.current_thread().name == "group-commit":
+            registro["sentencias"].append((sentencia, conn.connection.dbapi_connection.in_transaction))
+
+    def al_confirmar_conexion(conn):
+        if threading.current_thread().name == "group-commit":
+            registro["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", al_ejecutar)
+    event.listen(engine, "commit", al_confirmar_conexion)
+    yield registro
+    event.remove(engine, "before_cursor_execute", al_ejecutar)
+    event.remove(engine, "commit", al_confirmar_conexion)
+
+
+def nombres_de_fases():
+    nombres = sorted(fase["nombre"] for fase in Fase.obtener_fases()[0])
+    session.remove()
+    return nombres
+
+
+def test_un_solo_commit_por_lote(sentencias):
+    coalescedor, resultados = procesar_lote(*[lambda i=i: Fase.crear_fase(f"Fase {i}") for i in range(5)])
+
+    assert [estado for estado, _ in resultados] == ["ok"] * 5
+    assert coalescedor.estadisticas()["lotes"] == 1
+    assert sentencias["commits"] == 1
+    # Cada SAVEPOINT y su RELEASE corren dentro de la transacción del lote:
+    # ninguno abre ni confirma una transacción propia
+    puntos = [(sentencia, abierta) for sentencia, abierta in sentencias["sentencias"]
+              if sentencia.startswith(("SAVEPOINT", "RELEASE"))]
+    assert len(puntos) == 10
+    assert all(abierta for _, abierta in puntos)
+    assert nombres_de_fases() == [f"Fase {i}" for i in range(5)]
+
+
+def test_una_escritura_fallida_no_afecta_al_resto_del_lote(crear_tablero):
+    tablero = crear_tablero()
+    ejecutadas = []
+
+    def crear_fase(nombre):
+        al_confirmar(lambda: ejecutadas.append(nombre))
+        return Fase.crear_fase(nombre)
+
+    def tarea_con_fase_inexistente():
+        al_confirmar(lambda: ejecutadas.append("tarea"))
+        # La clave foránea falla en el flush y desactiva el SAVEPOINT
+        return Tarea.crear_tarea("Huérfana", "", tablero["fecha_creacion"], None, 999999, None, tablero["id"])
+
+    coalescedor, resultados = procesar_lote(lambda: crear_fase("a"), lambda: crear_fase("b"),
+                                            tarea_con_fase_inexistente, lambda: crear_fase("d"))
+
+    assert [estado for estado, _ in resultados] == ["ok", "ok", "error", "ok"]
+    assert isinstance(resultados[2][1], IntegrityError)
+    assert coalescedor.estadisticas()["lotes"] == 1
+    assert nombres_de_fases() == ["a", "b", "d"]
+    # Las acciones de la operación deshecha se descartan; las demás corren tras el COMMIT
+    assert ejecutadas == ["a", "b", "d"]
+
+
+def test_una_excepcion_de_la_operacion_descarta_sus_acciones():
+    ejecutadas = []
+
+    def falla():
+        al_confirmar(lambda: ejecutadas.append("falla"))
+        Fase.crear_fase("Descartada")
+        raise ValueError("datos inválidos")
+
+    _, resultados = procesar_lote(lambda: Fase.crear_fase("Primera"), falla,
+                                  lambda: al_confirmar(lambda: ejecutadas.append("ultima")))
+
+    assert [estado for estado, _ in resultados] == ["ok", "error", "ok"]
+    assert str(resultados[1][1]) == "datos inválidos"
+    assert nombres_de_fases() == ["Primera"]
+    assert ejecutadas == ["ultima"]
+
+
+def test_rollback_sin_group_commit_descarta_las_acciones():
+    ejecutadas = []
+    session.add(Fase("Deshecha"))
+    session.flush()
+    al_confirmar(lambda: ejecutadas.append("deshecha"))
+    session.rollback()
+    session.add(Fase("Confirmada"))
+    al_confirmar(lambda: ejecutadas.append("confirmada"))
+    session.commit()
+    session.remove()
+
+    assert ejecutadas == ["confirmada"]
+    assert nombres_de_fases() == ["Confirmada"]
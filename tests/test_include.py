@@ -0,0 +1,67 @@
+import pytest
+
+
+def selects(consultas):
+    return [sentencia for sentencia in consultas
+            if sentencia.lstrip().upper().startswith("SELECT") and "version_tabla" not in sentencia]
+
+
+def test_embebe_las_relaciones(cliente, crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    ana = crear_persona("Ana")
+    asignada = crear_tarea(tablero["id"], fases[0]["id"], "Asignada", persona_id=ana["id"])
+    crear_tarea(tablero["id"], fases[1]["id"], "Sin asignar")
+
+    tareas = cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}&include=persona,fase,tablero").get_json()
+
+    assert tareas[0]["persona"] == ana
+    assert tareas[0]["fase"] == fases[0]
+    assert tareas[0]["tablero"]["nombre"] == "Sprint"
+    assert tareas[1]["persona"] is None
+    assert tareas[1]["fase"] == fases[1]
+    assert "password" not in tareas[0]["persona"]
+    assert cliente.get(f"/api/v1/tareas/{asignada['id']}?include=persona").get_json()["persona"] == ana
+
+
+def test_sin_una_consulta_por_tarea(cliente, consultas, crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    personas = [crear_persona(nombre) for nombre in ("Ana", "Beto", "Carla", "Dora")]
+    url = f"/api/v1/tareas/?tablero_id={tablero['id']}&include=persona,fase,tablero&limit=100"
+
+    for i in range(20):
+        crear_tarea(tablero["id"], fases[i % 3]["id"], persona_id=personas[i % 4]["id"])
+    consultas.clear()
+    assert len(cliente.get(url).get_json()) == 20
+
+    # Tareas con la persona en un JOIN, más una consulta IN (...) por fase y otra por tablero
+    assert len(selects(consultas)) == 3
+
+
+def test_el_etag_cambia_con_las_tablas_incluidas(cliente, crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    crear_tarea(tablero["id"], fases[0]["id"])
+    con_persona = f"/api/v1/tareas/?tablero_id={tablero['id']}&include=persona"
+    sin_persona = f"/api/v1/tareas/?tablero_id={tablero['id']}"
+    etags = {url: cliente.get(url).headers["ETag"] for url in (con_persona, sin_persona)}
+
+    crear_persona("Ana")
+
+    assert cliente.get(con_persona, headers={"If-None-Match": etags[con_persona]}).status_code == 200
+    assert cliente.get(sin_persona, headers={"If-None-Match": etags[sin_persona]}).status_code == 304
+
+
+def test_fields_limita_la_tarea_y_no_lo_incluido(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    crear_tarea(tablero["id"], fases[0]["id"], "Única")
+
+    tareas = cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}&fields=nombre&include=fase").get_json()
+
+    assert tareas == [{"nombre": "Única", "fase": fases[0]}]
+
+
+@pytest.mark.parametrize("include", ["tareas", "persona,password"])
+def test_inclusion_desconocida_responde_400(cliente, include):
+    respuesta = cliente.get(f"/api/v1/tareas/?include={include}")
+
+    assert respuesta.status_code == 400
+    assert "Valores válidos: persona, fase, tablero" in respuesta.get_json()["message"]
@@ -0,0 +1,46 @@
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from flask import Flask
+from app import app as aplicacion
+from src.controller.json_rapido import ProveedorJSON, ProveedorJSONRapido, registrar_json_rapido
+
+
+def test_la_aplicacion_usa_orjson():
+    assert isinstance(aplicacion.json, ProveedorJSONRapido)
+
+
+@pytest.mark.parametrize("proveedor", [ProveedorJSON, ProveedorJSONRapido])
+def test_mismo_formato_con_y_sin_orjson(proveedor):
+    app = Flask(__name__)
+    app.json = proveedor(app)
+    datos = {"b": datetime(2025, 1, 6, 9, 30, 15, 120000), "a": date(2025, 1, 6), 1: Decimal("1.5"),
+             "texto": "Diseño"}
+
+    codificado = app.json.dumps_bytes(datos)
+
+    assert codificado == ('{"b":"2025-01-06T09:30:15.120000","a":"2025-01-06","1":"1.5",'
+                          '"texto":"Diseño"}').encode("utf-8")
+    assert app.json.loads(codificado) == {"b": "2025-01-06T09:30:15.120000", "a": "2025-01-06", "1": "1.5",
+                                          "texto": "Diseño"}
+    # Con opciones de json.dumps se respeta el comportamiento estándar
+    assert app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_registrar_sin_api_solo_cambia_jsonify():
+    app = Flask(__name__)
+    assert registrar_json_rapido(app) is True
+    assert isinstance(app.json, ProveedorJSONRapido)
+
+
+def test_restx_y_jsonify_responden_con_fechas_iso(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero(fecha_entrega=datetime(2025, 1, 31, 18, 0))
+    crear_tarea(tablero["id"], fases[0]["id"], "Diseño")
+
+    restx = cliente.get(f"/api/v1/tableros/{tablero['id']}")
+    flask = cliente.get("/tareas")
+
+    assert restx.mimetype == flask.mimetype == "application/json"
+    assert restx.get_json()["fecha_entrega"] == "2025-01-31T18:00:00"
+    assert flask.get_json()["tareas"][0]["fecha_inicio"] == "2025-01-06T09:00:00"
+    assert "Diseño".encode("utf-8") in flask.data
@@ -0,0 +1,61 @@
+import threading
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from src.models import engine, engine_lectura, session, usar_solo_lectura
+
+
+def test_los_get_no_esperan_al_escritor(cliente, crear_tablero):
+    crear_tablero("Visible")
+    respuestas = []
+    # El escritor tiene una sola conexión: con ella tomada y una escritura a
+    # medio confirmar, un GET que la necesitara quedaría esperando en el pool
+    with engine.connect() as escritor:
+        escritor.exec_driver_sql("BEGIN IMMEDIATE")
+        escritor.execute(text("UPDATE tablero SET nombre = 'Sin confirmar'"))
+        hilo = threading.Thread(target=lambda: respuestas.append(cliente.get("/api/v1/tableros/")))
+        hilo.start()
+        hilo.join(5)
+        escritor.rollback()
+
+    assert not hilo.is_alive()
+    assert respuestas[0].status_code == 200
+    assert [tablero["nombre"] for tablero in respuestas[0].get_json()] == ["Visible"]
+
+
+@pytest.fixture
+def pools_usados():
+    """Pool ("escritura" o "lectura") de cada conexión que toma el hilo de la prueba."""
+    usados = []
+    hilo = threading.current_thread()
+    oyentes = [(motor, lambda *args, nombre=nombre: threading.current_thread() is hilo and usados.append(nombre))
+               for motor, nombre in ((engine, "escritura"), (engine_lectura, "lectura"))]
+    for motor, oyente in oyentes:
+        event.listen(motor, "checkout", oyente)
+    yield usados
+    for motor, oyente in oyentes:
+        event.remove(motor, "checkout", oyente)
+
+
+def test_cada_peticion_usa_su_pool(cliente, pools_usados, crear_tablero):
+    tablero = crear_tablero()
+
+    pools_usados.clear()
+    assert cliente.post("/api/v1/tableros/", json={"nombre": "Nuevo", "descripcion": "", "fecha_entrega": None,
+                                                   "estado": "activo"}).status_code == 201
+    assert set(pools_usados) == {"escritura"}
+
+    pools_usados.clear()
+    assert cliente.get(f"/api/v1/tableros/{tablero['id']}/board").status_code == 200
+    assert set(pools_usados) == {"lectura"}
+
+
+def test_la_sesion_de_solo_lectura_no_puede_escribir(crear_tablero):
+    crear_tablero()
+    usar_solo_lectura()
+    try:
+        assert session.execute(text("SELECT count(*) FROM tablero")).scalar() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            session.execute(text("UPDATE tablero SET nombre = 'x'"))
+    finally:
+        session.remove()
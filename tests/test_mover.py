@@ -0,0 +1,67 @@
+import pytest
+from src.models import session
+from src.models.tarea_m import Tarea
+
+
+def estado_de(tablero):
+    """{id: (fase_id, persona_id)} de las tareas del tablero."""
+    tareas = Tarea.listar_tareas(tablero_id=tablero["id"], limit=1000)[0]
+    session.remove()
+    return {tarea["id"]: (tarea["fase_id"], tarea["persona_id"]) for tarea in tareas}
+
+
+@pytest.fixture
+def tablero(crear_tablero, fases, crear_persona, crear_tarea):
+    tablero = crear_tablero()
+    ana = crear_persona("Ana")
+    tablero["tareas"] = [crear_tarea(tablero["id"], fases[0]["id"], f"Tarea {i}", persona_id=ana["id"])
+                         for i in range(6)]
+    tablero["ana"] = ana
+    return tablero
+
+
+def test_un_update_por_destino(cliente, consultas, tablero, fases, crear_persona):
+    beto = crear_persona("Beto")
+    ids = [tarea["id"] for tarea in tablero["tareas"]]
+    movimientos = ([{"id": id, "fase_id": fases[1]["id"]} for id in ids[:3]]
+                   + [{"id": ids[3], "fase_id": fases[2]["id"], "persona_id": beto["id"]},
+                      {"id": ids[4], "fase_id": fases[2]["id"], "persona_id": None}])
+
+    consultas.clear()
+    respuesta = cliente.patch("/api/v1/tareas/mover", json=movimientos)
+
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()["ids"] == ids[:5]
+    assert len([sentencia for sentencia in consultas if sentencia.startswith("UPDATE tarea ")]) == 3
+    ana = tablero["ana"]["id"]
+    # Sin persona_id se conserva la persona; con null se desasigna
+    assert estado_de(tablero) == {
+        ids[0]: (fases[1]["id"], ana), ids[1]: (fases[1]["id"], ana), ids[2]: (fases[1]["id"], ana),
+        ids[3]: (fases[2]["id"], beto["id"]), ids[4]: (fases[2]["id"], None), ids[5]: (fases[0]["id"], ana)}
+
+
+@pytest.mark.parametrize("movimiento", [
+    {"id": 999999},
+    {"fase_id": 999999},
+    {"persona_id": 999999},
+    {"fase_id": "dos"},
+    {"id": None},
+])
+def test_un_movimiento_invalido_no_aplica_ninguno(cliente, tablero, fases, movimiento):
+    antes = estado_de(tablero)
+    movimientos = [{"id": tarea["id"], "fase_id": fases[1]["id"]} for tarea in tablero["tareas"]]
+    movimientos[-1] = {**movimientos[-1], **movimiento}
+
+    assert cliente.patch("/api/v1/tareas/mover", json=movimientos).status_code == 400
+    assert estado_de(tablero) == antes
+
+
+def test_tarea_repetida_o_cuerpo_invalido(cliente, tablero, fases):
+    id = tablero["tareas"][0]["id"]
+
+    respuesta = cliente.patch("/api/v1/tareas/mover", json=[{"id": id, "fase_id": fases[1]["id"]},
+                                                            {"id": id, "fase_id": fases[2]["id"]}])
+    assert respuesta.status_code == 400
+    assert cliente.patch("/api/v1/tareas/mover", json=[]).status_code == 400
+    assert cliente.patch("/api/v1/tareas/mover", json={"id": id, "fase_id": fases[1]["id"]}).status_code == 400
+    assert cliente.patch("/api/v1/tareas/mover", json=[id]).status_code == 400
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+import msgpack
+import pytest
+from flask import request
+from werkzeug.exceptions import BadRequest
+from app import app as aplicacion
+from src.controller.formato_msgpack import MIMETYPES_MSGPACK, desempaquetar, empaquetar
+
+MSGPACK = {"Accept": "application/msgpack"}
+
+
+def test_responde_msgpack_si_se_pide(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero(fecha_entrega=datetime(2025, 1, 31, 18, 0))
+    crear_tarea(tablero["id"], fases[0]["id"], "Diseño", fecha_inicio=datetime(2025, 1, 6, 9, 30, 15, 120000))
+
+    respuesta = cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}", headers=MSGPACK)
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers["Content-Type"] == "application/msgpack"
+    tareas = msgpack.unpackb(respuesta.data, timestamp=3)
+    # Las fechas viajan como timestamp de MessagePack, en UTC
+    assert tareas[0]["fecha_inicio"] == datetime(2025, 1, 6, 9, 30, 15, 120000, tzinfo=timezone.utc)
+    json = cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}").get_json()
+    assert {clave: valor for clave, valor in tareas[0].items() if not clave.startswith("fecha")} == {
+        clave: valor for clave, valor in json[0].items() if not clave.startswith("fecha")}
+    assert len(respuesta.data) < len(cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}").data)
+
+
+def test_json_sigue_siendo_el_formato_por_defecto(cliente, crear_tablero):
+    crear_tablero()
+
+    assert cliente.get("/api/v1/tableros/").mimetype == "application/json"
+    assert cliente.get("/api/v1/tableros/", headers={"Accept": "*/*"}).mimetype == "application/json"
+    assert cliente.get("/api/v1/tableros/", headers={
+        "Accept": "application/json;q=0.5, application/x-msgpack"}).mimetype in MIMETYPES_MSGPACK
+
+
+def test_acepta_cuerpos_msgpack(cliente, crear_tablero, fases):
+    tablero = crear_tablero()
+    cuerpo = empaquetar({"nombre": "Desde msgpack", "descripcion": "", "fase_id": fases[0]["id"],
+                         "tablero_id": tablero["id"], "fecha_inicio": datetime(2025, 1, 6, 9, 0)})
+
+    respuesta = cliente.post("/api/v1/tareas/", data=cuerpo,
+                             headers={**MSGPACK, "Content-Type": "application/msgpack"})
+
+    assert respuesta.status_code == 201
+    tarea = desempaquetar(respuesta.data)["tarea"]
+    assert tarea["nombre"] == "Desde msgpack"
+    assert tarea["fecha_inicio"] == "2025-01-06T09:00:00"
+
+
+def test_cuerpo_msgpack_invalido():
+    with aplicacion.test_request_context("/", method="POST", data=b"\xc1",
+                                         headers={"Content-Type": "application/msgpack"}):
+        assert request.get_json(silent=True) is None
+        with pytest.raises(BadRequest):
+            request.get_json()
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from src.models.paginacion import codificar_cursor, decodificar_cursor, CursorInvalido
+from src.models.tarea_m import Tarea
+import pytest
+
+
+def recorrer(cliente, url):
+    """Sigue X-Next-Cursor desde `url` y retorna (elementos, cantidad de páginas)."""
+    elementos, paginas = [], 0
+    while url:
+        respuesta = cliente.get(url)
+        assert respuesta.status_code == 200
+        elementos += respuesta.get_json()
+        paginas += 1
+        siguiente = respuesta.headers.get("X-Next-Cursor")
+        if siguiente:
+            assert f"after={siguiente}" in respuesta.headers["Link"]
+            url = respuesta.headers["Link"][1:respuesta.headers["Link"].index(">")]
+        else:
+            url = None
+    return elementos, paginas
+
+
+def test_cursor_ida_y_vuelta():
+    fecha = datetime(2025, 1, 6, 9, 30)
+    columnas = [Tarea.fecha_inicio, Tarea.id]
+    assert decodificar_cursor(codificar_cursor([fecha, 12]), columnas) == [fecha, 12]
+    assert decodificar_cursor(codificar_cursor([None, 12]), columnas) == [None, 12]
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", codificar_cursor([1, 2, 3]), codificar_cursor(["ayer", 1])])
+def test_cursor_invalido(cursor):
+    with pytest.raises(CursorInvalido):
+        decodificar_cursor(cursor, [Tarea.fecha_inicio, Tarea.id])
+
+
+def test_listado_de_tareas_recorre_todas_las_paginas(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    ids = [crear_tarea(tablero["id"], fases[0]["id"], f"Tarea {i}")["id"] for i in range(7)]
+
+    tareas, paginas = recorrer(cliente, f"/api/v1/tareas/?tablero_id={tablero['id']}&limit=3")
+
+    assert [tarea["id"] for tarea in tareas] == ids
+    assert paginas == 3
+
+
+def test_orden_con_empates_y_nulos_no_repite_ni_pierde_filas(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    inicio = datetime(2025, 1, 6, 9, 0)
+    ids = []
+    for i in range(8):
+        # Fechas repetidas y tareas sin fecha_fin: el cursor desempata por id
+        fecha_fin = inicio + timedelta(days=i % 3) if i % 4 else None
+        ids.append(crear_tarea(tablero["id"], fases[i % 3]["id"], f"Tarea {i}", fecha_fin=fecha_fin)["id"])
+
+    tareas, _ = recorrer(cliente, f"/api/v1/tareas/?tablero_id={tablero['id']}&sort=-fecha_fin&limit=3")
+
+    assert sorted(tarea["id"] for tarea in tareas) == ids
+    completo = cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}&sort=-fecha_fin&limit=100").get_json()
+    assert [tarea["id"] for tarea in tareas] == [tarea["id"] for tarea in completo]
+
+
+def test_listados_de_tableros_fases_y_personas(cliente, crear_tablero, crear_fase, crear_persona):
+    tableros = [crear_tablero(f"Sprint {i}")["id"] for i in range(5)]
+    fases = [crear_fase(f"Fase {i}")["id"] for i in range(5)]
+    personas = [crear_persona(f"Persona{i}")["id"] for i in range(5)]
+
+    for url, ids in (("/api/v1/tableros/", tableros), ("/api/v1/fases/", fases), ("/api/v1/personas/", personas)):
+        elementos, paginas = recorrer(cliente, f"{url}?limit=2")
+        assert [elemento["id"] for elemento in elementos] == ids
+        assert paginas == 3
+
+
+def test_ruta_flask_devuelve_el_cursor_en_next(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    for i in range(3):
+        crear_tarea(tablero["id"], fases[0]["id"], f"Tarea {i}")
+
+    respuesta = cliente.get("/tareas?limit=2")
+
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()["next"] == respuesta.headers["X-Next-Cursor"]
+
+
+@pytest.mark.parametrize("consulta", ["limit=0", "limit=abc", "after=no-es-un-cursor"])
+def test_parametros_invalidos_responden_400(cliente, consulta):
+    assert cliente.get(f"/api/v1/tareas/?{consulta}").status_code == 400
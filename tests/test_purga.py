@@ -0,0 +1,78 @@
+import pytest
+from src.models import engine, session
+from src.models.estadisticas import verificar_estadisticas
+from src.models.persona_m import Persona
+from src.models.purga import purgar_tareas
+from src.models.tablero_m import Tablero
+from src.models.tarea_m import Tarea
+
+
+def cantidad_de_tareas(**filtros):
+    cantidad = session.query(Tarea).filter_by(**filtros).count()
+    session.remove()
+    return cantidad
+
+
+def deletes(consultas, tabla):
+    return [sentencia for sentencia in consultas if sentencia.startswith(f"DELETE FROM {tabla} ")]
+
+
+@pytest.fixture
+def tableros(crear_tablero, fases, crear_persona, crear_tarea):
+    """Un tablero con 7 tareas y otro con 2, repartidas entre Ana y Beto."""
+    grande, chico = crear_tablero("Grande"), crear_tablero("Chico")
+    ana, beto = crear_persona("Ana"), crear_persona("Beto")
+    for i in range(7):
+        crear_tarea(grande["id"], fases[i % 3]["id"], persona_id=(ana, beto)[i % 2]["id"])
+    for i in range(2):
+        crear_tarea(chico["id"], fases[0]["id"], persona_id=ana["id"])
+    return {"grande": grande, "chico": chico, "ana": ana, "beto": beto}
+
+
+@pytest.mark.parametrize("url, tabla", [("/api/v1/tableros/{grande}", "tablero"),
+                                        ("/api/v1/personas/{ana}", "persona")])
+def test_el_borrado_en_cascada_lo_hace_la_base(cliente, consultas, tableros, url, tabla):
+    consultas.clear()
+    respuesta = cliente.delete(url.format(grande=tableros["grande"]["id"], ana=tableros["ana"]["id"]))
+
+    assert respuesta.status_code == 200
+    # Un solo DELETE del padre: ON DELETE CASCADE se lleva las tareas sin cargarlas
+    assert len(deletes(consultas, tabla)) == 1
+    assert deletes(consultas, "tarea") == []
+    assert not [sentencia for sentencia in consultas if sentencia.startswith("SELECT") and "FROM tarea" in sentencia]
+    restantes = {"tablero": 2, "persona": 3}[tabla]
+    assert cantidad_de_tareas() == restantes
+    assert verificar_estadisticas(engine) == {"resumen_tablero": [], "resumen_persona": []}
+
+
+def test_purgar_por_lotes(consultas, tableros):
+    avances = []
+
+    consultas.clear()
+    eliminadas = purgar_tareas(Tarea.tablero_id, tableros["grande"]["id"], tamano_lote=3, pausa_ms=0,
+                               al_avanzar=avances.append)
+
+    assert eliminadas == 7
+    assert avances == [3, 6, 7]
+    assert len(deletes(consultas, "tarea")) == 3
+    assert cantidad_de_tareas(tablero_id=tableros["grande"]["id"]) == 0
+    assert cantidad_de_tareas(tablero_id=tableros["chico"]["id"]) == 2
+
+
+@pytest.mark.parametrize("url, modelo, eliminadas", [("/api/v1/tableros/{grande}", Tablero, 7),
+                                                     ("/api/v1/personas/{beto}", Persona, 3)])
+def test_purga_en_segundo_plano(cliente, esperar_trabajo, tableros, url, modelo, eliminadas):
+    url = url.format(grande=tableros["grande"]["id"], beto=tableros["beto"]["id"])
+
+    respuesta = cliente.delete(f"{url}?en_segundo_plano=true")
+
+    assert respuesta.status_code == 202
+    trabajo = esperar_trabajo(respuesta.get_json()["trabajo"]["id"])
+    assert trabajo["estado"] == "completado"
+    assert trabajo["resultado"]["tareas_eliminadas"] == eliminadas
+    assert trabajo["resultado"]["eliminado"] is True
+    assert (trabajo["progreso"], trabajo["total"]) == (eliminadas, eliminadas)
+    assert session.query(modelo).count() == 1
+    session.remove()
+    assert cantidad_de_tareas() == 9 - eliminadas
+    assert verificar_estadisticas(engine) == {"resumen_tablero": [], "resumen_persona": []}
@@ -0,0 +1,56 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import select
+from src.models import session
+from src.models.persona_m import Persona, serializar_persona
+from src.models.serializacion import elegir_campos
+from src.models.tarea_m import Tarea, serializar_tarea
+
+
+def test_serializa_instancias_y_filas_de_core_igual(crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    tarea = crear_tarea(tablero["id"], fases[0]["id"], "Diseño", fecha_fin=datetime(2025, 1, 10, 18, 0))
+
+    instancia = serializar_tarea(session.get(Tarea, tarea["id"]))
+    fila = serializar_tarea(session.execute(select(*serializar_tarea.columnas)
+                                            .where(Tarea.id == tarea["id"])).one())
+    session.remove()
+
+    assert instancia == fila
+    assert list(instancia) == [columna.key for columna in Tarea.__table__.columns]
+    # Las fechas quedan como datetime: cada formato las codifica a su manera
+    assert instancia["fecha_fin"] == datetime(2025, 1, 10, 18, 0)
+
+
+def test_la_contrasena_nunca_se_serializa(cliente, crear_persona):
+    persona = crear_persona("Ana")
+
+    assert "password" not in serializar_persona.campos
+    assert "password" not in persona
+    assert "password" not in cliente.get(f"/api/v1/personas/{persona['id']}").get_json()
+    assert serializar_persona(session.get(Persona, persona["id"])) == persona
+    session.remove()
+
+
+def test_los_subconjuntos_se_compilan_una_vez():
+    parcial = elegir_campos(serializar_tarea, ["nombre", "id"])
+
+    assert parcial is elegir_campos(serializar_tarea, ["id", "nombre"])
+    # En el orden de las columnas, no en el pedido
+    assert parcial.campos == ("id", "nombre")
+    assert [columna.key for columna in parcial.columnas] == ["id", "nombre"]
+    assert elegir_campos(serializar_tarea, None) is serializar_tarea
+    with pytest.raises(ValueError, match="password"):
+        elegir_campos(serializar_persona, ["nombre", "password"])
+
+
+def test_respuestas_de_la_api(cliente, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero(fecha_entrega=datetime(2025, 1, 31, 18, 0))
+    tarea = crear_tarea(tablero["id"], fases[0]["id"], "Diseño")
+
+    assert cliente.get(f"/api/v1/tableros/{tablero['id']}").get_json()["fecha_entrega"] == "2025-01-31T18:00:00"
+    assert cliente.get(f"/api/v1/tareas/?tablero_id={tablero['id']}").get_json() == [{
+        "id": tarea["id"], "nombre": "Diseño", "descripcion": "",
+        "fecha_creacion": tarea["fecha_creacion"].isoformat(), "fecha_inicio": "2025-01-06T09:00:00",
+        "fecha_fin": None, "estado": "pendiente", "fase_id": fases[0]["id"], "persona_id": None,
+        "tablero_id": tablero["id"]}]
@@ -0,0 +1,95 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert, select
+from src.models import engine, session
+from src.models import trabajos
+from src.models.trabajos import TRABAJOS_VENCIMIENTO_S, Trabajo, iniciar_trabajos
+
+
+def item(tablero, fase, nombre):
+    return {"nombre": nombre, "fecha_inicio": "2025-01-06T09:00:00", "fase_id": fase["id"],
+            "tablero_id": tablero["id"]}
+
+
+def registrar(tipo, estado, latido=None, fecha_fin=None, **parametros):
+    """Inserta un trabajo tal como lo dejaría otro proceso y retorna su id."""
+    with engine.begin() as conn:
+        return conn.execute(insert(Trabajo).values(
+            tipo=tipo, estado=estado, parametros=json.dumps(parametros), latido=latido, fecha_fin=fecha_fin,
+            fecha_creacion=datetime.now(), progreso=0).returning(Trabajo.id)).scalar()
+
+
+def estados():
+    with engine.connect() as conn:
+        return dict(conn.execute(select(Trabajo.id, Trabajo.estado)).all())
+
+
+def test_carga_masiva_en_segundo_plano(cliente, esperar_trabajo, crear_tablero, fases, monkeypatch):
+    monkeypatch.setattr(trabajos, "TRABAJOS_TAMANO_LOTE", 2)
+    tablero = crear_tablero()
+    items = [item(tablero, fases[0], f"Tarea {i}") for i in range(5)] + [item(tablero, fases[0], "")]
+
+    respuesta = cliente.post("/api/v1/tareas/bulk?en_segundo_plano=true", json=items)
+
+    assert respuesta.status_code == 202
+    id = respuesta.get_json()["trabajo"]["id"]
+    assert respuesta.headers["Location"].endswith(f"/api/v1/jobs/{id}")
+    trabajo = esperar_trabajo(id)
+    assert trabajo["estado"] == "completado"
+    assert (trabajo["progreso"], trabajo["total"]) == (6, 6)
+    assert (trabajo["resultado"]["creadas"], trabajo["resultado"]["errores"]) == (5, 1)
+    assert [resultado["indice"] for resultado in trabajo["resultado"]["resultados"]] == list(range(6))
+
+
+def test_un_trabajo_que_falla_guarda_el_motivo(cliente, esperar_trabajo, crear_tablero, fases, crear_tarea):
+    tablero = crear_tablero()
+    tarea = crear_tarea(tablero["id"], fases[0]["id"])
+
+    respuesta = cliente.patch("/api/v1/tareas/mover?en_segundo_plano=true",
+                              json=[{"id": tarea["id"], "fase_id": 999999}])
+
+    trabajo = esperar_trabajo(respuesta.get_json()["trabajo"]["id"])
+    assert trabajo["estado"] == "fallido"
+    assert trabajo["error"] == "No existen las fases: [999999]"
+
+
+def test_trabajo_inexistente_o_tipo_desconocido(cliente):
+    assert cliente.get("/api/v1/jobs/999999").status_code == 404
+    with pytest.raises(ValueError, match="desconocido"):
+        Trabajo.crear_trabajo("no_existe")
+    session.remove()
+
+
+def test_al_arrancar_se_retoman_los_pendientes_y_los_huerfanos(crear_tablero, esperar_trabajo):
+    vencido = datetime.now() - timedelta(seconds=TRABAJOS_VENCIMIENTO_S + 1)
+    huerfano = crear_tablero("Huérfano")
+    pendiente = crear_tablero("Pendiente")
+    ids = {
+        "pendiente": registrar("purgar_tablero", "pendiente", tablero_id=pendiente["id"]),
+        "reanudable": registrar("purgar_tablero", "en_curso", latido=vencido, tablero_id=huerfano["id"]),
+        "no_reanudable": registrar("crear_tareas_bulk", "en_curso", latido=vencido, items=[]),
+        # Con latido reciente lo está ejecutando otro proceso vivo
+        "de_otro_proceso": registrar("purgar_tablero", "en_curso", latido=datetime.now(), tablero_id=0),
+        "viejo": registrar("purgar_tablero", "completado", fecha_fin=datetime.now() - timedelta(days=30)),
+    }
+
+    assert iniciar_trabajos(engine) == 2
+
+    assert esperar_trabajo(ids["pendiente"])["estado"] == "completado"
+    assert esperar_trabajo(ids["reanudable"])["resultado"]["tablero_id"] == huerfano["id"]
+    assert esperar_trabajo(ids["no_reanudable"])["error"] == "Interrumpido por un reinicio"
+    assert estados()[ids["de_otro_proceso"]] == "en_curso"
+    assert ids["viejo"] not in estados()
+    # El hilo de latidos corre aunque no queden trabajos de este proceso
+    assert trabajos._latidos is not None and trabajos._latidos.is_alive()
+
+
+def test_los_latidos_retoman_los_que_vencen_despues(crear_tablero, monkeypatch):
+    tablero = crear_tablero()
+    id = registrar("purgar_tablero", "en_curso", latido=datetime.now(), tablero_id=tablero["id"])
+    assert trabajos._recuperar(engine) == []
+
+    monkeypatch.setattr(trabajos, "TRABAJOS_VENCIMIENTO_S", 0)
+    assert trabajos._recuperar(engine) == [id]
+    assert estados()[id] == "pendiente"